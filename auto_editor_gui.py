@@ -17,29 +17,33 @@ import json
 from typing import Optional, List, Dict, Tuple
 import psutil
 
-# Importações para Whisper (opcional)
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    whisper = None
+# Backends pesados (whisper/torch, openai, google.generativeai) são importados
+# sob demanda pelo módulo providers; aqui só verificamos se estão instalados.
+import process_runner
+import providers
+import whisper_worker
+from cancellation import Cancelled
+from pipeline import EditingPipeline, build_job, describe_transcription, load_api_keys
+from progress import format_progress, parse_auto_editor_progress, with_auto_editor_progress
+from session_log import SessionLog
+from transcript_view import TranscriptView
+from ui_bus import UIBus
+from word_timeline import WordTimeline
 
-# Importações para OpenAI (opcional)
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    openai = None
+WHISPER_AVAILABLE = providers.is_available("whisper")
+OPENAI_AVAILABLE = providers.is_available("openai")
+GEMINI_AVAILABLE = providers.is_available("gemini")
 
-# Importações para Google Generative AI (opcional)
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    genai = None
+# Linhas mantidas no console (o log completo fica no arquivo da sessão)
+CONSOLE_MAX_LINES = 2000
+
+# Cores por nível de log no console
+LOG_COLORS = {
+    "INFO": "black",
+    "SUCCESS": "green",
+    "WARNING": "orange",
+    "ERROR": "red"
+}
 
 class AutoEditorGUI:
     def __init__(self, root):
@@ -49,8 +53,19 @@ class AutoEditorGUI:
         self.root.minsize(900, 600)
         self.root.configure(bg="#e5e3de")
         
+        # Barramento de atualizações da interface (logs e status vindos de threads)
+        self.ui_bus = UIBus(root)
+        self.ui_bus.on("log", self.write_log_entries)
+        try:
+            self.session_log = SessionLog()
+        except OSError as e:
+            print(f"Log em arquivo desativado: {e}")
+            self.session_log = None
+        
         # Configurações de API
         self.api_keys = self.load_api_keys()
+        self.pipeline = EditingPipeline(api_keys=self.api_keys, log=self.log_message, status=self.set_config_status,
+                                        progress=self.on_pipeline_progress)
         self.selected_llm_provider = tk.StringVar(value="openai")
         self.selected_llm_model = tk.StringVar(value="gpt-4o")
         self.available_models = {}
@@ -75,6 +90,7 @@ class AutoEditorGUI:
         
         # Variáveis para Whisper
         self.whisper_result = None
+        self.word_timeline = None  # WordTimeline da transcrição exibida
         self.error_segments = []
         self.marked_segments = []
         
@@ -99,6 +115,7 @@ class AutoEditorGUI:
         
         # Iniciar monitoramento de saída
         self.monitor_output()
+        self.ui_bus.start()
         
         # Configurar fechamento
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -190,6 +207,12 @@ class AutoEditorGUI:
         # Botão de ação
         self.magic_start_button = ttk.Button(self.magic_controls, text="✨ Iniciar Edição Automágica ✨", command=self.start_auto_magic_edit, style='Accent.TButton')
         self.magic_start_button.grid(row=6, column=0, columnspan=2, pady=(20, 0))
+        # Prévia em baixa resolução e versão final com os mesmos cortes
+        magic_preview_frame = ttk.Frame(self.magic_controls)
+        magic_preview_frame.grid(row=7, column=0, columnspan=2, pady=(10, 0))
+        ttk.Button(magic_preview_frame, text="👁️ Prévia", command=lambda: self.start_preview("auto_magic")).grid(row=0, column=0, padx=(0, 10))
+        self.magic_final_button = ttk.Button(magic_preview_frame, text="🎬 Renderizar Final", command=self.start_final_render, state='disabled')
+        self.magic_final_button.grid(row=0, column=1)
 
         # 3. Controles do modo Simples
         self.simple_controls = ttk.LabelFrame(config_frame, text="✂️ Edição Simples (Apenas Cortes de Silêncio)", padding="15")
@@ -214,6 +237,12 @@ class AutoEditorGUI:
         # Botão de ação
         self.simple_start_button = ttk.Button(self.simple_controls, text="🎬 Iniciar Edição Simples", command=self.start_simple_edit, style='Accent.TButton')
         self.simple_start_button.grid(row=4, column=0, columnspan=2, pady=(20, 0))
+        # Prévia em baixa resolução e versão final com os mesmos cortes
+        simple_preview_frame = ttk.Frame(self.simple_controls)
+        simple_preview_frame.grid(row=5, column=0, columnspan=2, pady=(10, 0))
+        ttk.Button(simple_preview_frame, text="👁️ Prévia", command=lambda: self.start_preview("simple")).grid(row=0, column=0, padx=(0, 10))
+        self.simple_final_button = ttk.Button(simple_preview_frame, text="🎬 Renderizar Final", command=self.start_final_render, state='disabled')
+        self.simple_final_button.grid(row=0, column=1)
 
         # 4. Componentes Compartilhados
         file_frame = ttk.LabelFrame(config_frame, text="📁 Arquivos", padding="15")
@@ -236,6 +265,17 @@ class AutoEditorGUI:
         self.config_status_label = ttk.Label(config_frame, text="Pronto para editar", style='Info.TLabel', foreground='blue')
         self.config_status_label.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
 
+        # 6. Progresso do pipeline (porcentagem, velocidade e ETA)
+        self.pipeline_progress_var = tk.DoubleVar()
+        self.pipeline_progress_bar = ttk.Progressbar(config_frame, variable=self.pipeline_progress_var,
+                                                     mode='determinate', maximum=100)
+        self.pipeline_progress_bar.grid(row=6, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        self.pipeline_progress_label = ttk.Label(config_frame, text="", style='Info.TLabel', foreground='gray')
+        self.pipeline_progress_label.grid(row=7, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+
+        # 7. Cancelamento (processos, chamadas às APIs e Whisper)
+        ttk.Button(config_frame, text="⏹️ Cancelar", command=self.cancel_pipeline).grid(row=8, column=0, sticky=tk.W, pady=(10, 0))
+
         # Widget oculto para comando (evita erro de atributo)
         if not hasattr(self, 'command_text'):
             self.command_text = tk.Text(config_frame, height=1, width=1)
@@ -340,6 +380,9 @@ class AutoEditorGUI:
         self.transcription_text.tag_configure("marked", background="red", foreground="white")
         self.transcription_text.tag_configure("llm_suggestion", background="orange", foreground="black")
         
+        # Só a região visível (mais uma margem) fica no widget; o resto vem da timeline ao rolar
+        self.transcript_view = TranscriptView(self.transcription_text)
+        
         # Seção 4: Sugestões do LLM
         suggestions_frame = ttk.LabelFrame(speech_frame, text="💡 Sugestões do LLM", padding="15")
         suggestions_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 20))
@@ -401,6 +444,8 @@ class AutoEditorGUI:
         # Console de texto (ocupando todo o espaço restante)
         self.console_text = scrolledtext.ScrolledText(console_frame, wrap=tk.WORD, font=('Courier', 10), bg='black', fg='white')
         self.console_text.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        for level, color in LOG_COLORS.items():
+            self.console_text.tag_config(level, foreground=color)
 
         # Mensagem inicial
         self.log_message("Console inicializado - Pronto para uso", "INFO")
@@ -564,8 +609,8 @@ class AutoEditorGUI:
         self.log_message("Console limpo", "INFO")
     
     def save_log(self):
-        """Salva o log do console em um arquivo"""
-        if not self.console_text.get(1.0, tk.END).strip():
+        """Salva o log da sessão (completo, se houver arquivo de log) em um arquivo"""
+        if not self.session_log and not self.console_text.get(1.0, tk.END).strip():
             messagebox.showwarning("Aviso", "Console vazio. Nada para salvar.")
             return
         
@@ -577,8 +622,12 @@ class AutoEditorGUI:
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.console_text.get(1.0, tk.END))
+                if self.session_log:
+                    self.session_log.flush()
+                    shutil.copyfile(self.session_log.path, filename)
+                else:
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        f.write(self.console_text.get(1.0, tk.END))
                 self.log_message(f"Log salvo em: {filename}", "SUCCESS")
             except Exception as e:
                 self.log_message(f"Erro ao salvar log: {str(e)}", "ERROR")
@@ -747,77 +796,6 @@ class AutoEditorGUI:
         monitor_thread.daemon = True
         monitor_thread.start()
     
-    def stitch_clips_sequence(self):
-        """Junta os clipes exportados em um vídeo final"""
-        try:
-            output_dir = os.path.dirname(self.output_file.get())
-            clips_dir = os.path.join(output_dir, "temp_clips")
-            
-            # Verificar se os clipes foram exportados
-            if not os.path.exists(clips_dir):
-                raise RuntimeError("Diretório de clipes não encontrado")
-            
-            # Listar clipes em ordem
-            clip_files = []
-            for i in range(len(self.final_clip_order)):
-                clip_file = os.path.join(clips_dir, f"{i:04d}.mp4")
-                if os.path.exists(clip_file):
-                    clip_files.append(clip_file)
-                else:
-                    self.log_message(f"Aviso: Clipe {i:04d}.mp4 não encontrado", "WARNING")
-            
-            if not clip_files:
-                raise RuntimeError("Nenhum clipe encontrado para juntar")
-            
-            # Criar arquivo de lista para ffmpeg
-            filelist_path = os.path.join(output_dir, "filelist.txt")
-            with open(filelist_path, 'w', encoding='utf-8') as f:
-                for clip_file in clip_files:
-                    f.write(f"file '{clip_file}'\n")
-            
-            # Comando ffmpeg para juntar clipes
-            ffmpeg_cmd = [
-                'ffmpeg', '-f', 'concat', '-safe', '0',
-                '-i', filelist_path,
-                '-c', 'copy',
-                self.output_file.get()
-            ]
-            
-            self.log_message("Etapa 2: Juntando clipes com ffmpeg...", "INFO")
-            self.log_message(f"Comando ffmpeg: {' '.join(ffmpeg_cmd)}", "INFO")
-            
-            # Executar ffmpeg
-            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.log_message("🎉 Reorganização semântica concluída com sucesso!", "SUCCESS")
-                self.cleanup_semantic_temp_files(clips_dir, filelist_path)
-            else:
-                self.log_message(f"Erro no ffmpeg: {result.stderr}", "ERROR")
-            
-            self.stop_editing()
-            
-        except Exception as e:
-            self.log_message(f"Erro ao juntar clipes: {str(e)}", "ERROR")
-            self.stop_editing()
-    
-    def cleanup_semantic_temp_files(self, clips_dir, filelist_path):
-        """Limpa arquivos temporários da reorganização semântica"""
-        try:
-            # Remover arquivo de lista
-            if os.path.exists(filelist_path):
-                os.remove(filelist_path)
-                self.log_message("Arquivo de lista removido", "INFO")
-            
-            # Remover diretório de clipes
-            if os.path.exists(clips_dir):
-                import shutil
-                shutil.rmtree(clips_dir)
-                self.log_message("Diretório de clipes temporários removido", "INFO")
-                
-        except Exception as e:
-            self.log_message(f"Erro ao limpar arquivos temporários: {str(e)}", "WARNING")
-    
     def run_normal_editing(self, command):
         """Executa edição normal (sem reorganização semântica)"""
         self.process = subprocess.Popen(
@@ -982,70 +960,6 @@ class AutoEditorGUI:
         thread.daemon = True
         thread.start()
     
-    def run_speech_analysis(self):
-        """Executa a análise de fala em thread separada"""
-        try:
-            self.log_message("Iniciando análise de fala com Whisper...", "INFO")
-            self.log_memory_usage("início da análise")
-            self.analysis_status.config(text="Extraindo áudio...", foreground='blue')
-            audio_file = self.extract_audio()
-            if not audio_file:
-                return
-            self.log_memory_usage("após extração de áudio")
-            if self.whisper_mode.get() == "api":
-                self.analysis_status.config(text="Transcrevendo via API OpenAI...", foreground='blue')
-                self.log_message("Transcrevendo via API OpenAI...", "INFO")
-                result = self.transcribe_with_openai_api(audio_file)
-                self.log_message(f"Resposta da API OpenAI: {result}", "INFO")
-                self.whisper_result = result
-                self.log_memory_usage("após receber resposta da API")
-            else:
-                self.analysis_status.config(text="Carregando modelo Whisper...", foreground='blue')
-                self.log_message("Carregando modelo Whisper...", "INFO")
-                device = "cuda" if self.use_gpu.get() else "cpu"
-                model = whisper.load_model(self.whisper_model.get(), device=device)
-                self.log_message(f"Modelo {self.whisper_model.get()} carregado em {device}", "INFO")
-                self.log_memory_usage("após carregar modelo")
-                self.analysis_status.config(text="Transcrevendo com Whisper local...", foreground='blue')
-                self.log_message("Iniciando transcrição...", "INFO")
-                result = model.transcribe(audio_file, word_timestamps=True)
-                self.whisper_result = result
-                del model
-                import gc
-                gc.collect()
-                self.log_memory_usage("após transcrição local")
-            # Etapa C: Analisar transcrição
-            self.analysis_status.config(text="Analisando texto...", foreground='blue')
-            self.log_message("Analisando transcrição para detectar erros...", "INFO")
-            self.analyze_transcription_for_errors()
-            self.log_memory_usage("após análise de erros")
-            # Etapa D: Popular GUI
-            self.populate_transcription_gui()
-            self.log_memory_usage("após popular GUI")
-            self.clear_whisper_result()
-            self.log_memory_usage("após otimizar resultado")
-            try:
-                os.remove(audio_file)
-                self.log_message("Arquivo temporário removido", "INFO")
-            except Exception as e:
-                self.log_message(f"Erro ao remover arquivo temporário: {str(e)}", "WARNING")
-            # --- NOVO: Pipeline automático LLM ---
-            self.analysis_status.config(text="Enviando para LLM...", foreground='blue')
-            self.log_message("Iniciando análise automática por LLM...", "INFO")
-            # Chamar LLM e aplicar sugestões automaticamente
-            self.run_llm_analysis_auto()
-            self.analysis_status.config(text="Correção automática concluída!", foreground='green')
-            self.log_message("Correção automática concluída!", "SUCCESS")
-            self.log_memory_usage("final da análise")
-        except Exception as e:
-            import traceback
-            err_msg = f"Erro na análise de fala: {str(e)}\n{traceback.format_exc()}"
-            self.log_message(err_msg, "ERROR")
-            self.analysis_status.config(text="Erro na análise", foreground='red')
-            self.last_whisper_error.set(str(e))
-        finally:
-            self.analyze_button.config(state='normal')
-
     def run_llm_analysis_auto(self):
         """Executa a análise por LLM e aplica todas as sugestões automaticamente"""
         try:
@@ -1057,8 +971,7 @@ class AutoEditorGUI:
             response = self.call_llm_api(provider, model, prompt)
             self.process_llm_suggestions(response)
             # Aplicar todas as sugestões automaticamente
-            for suggestion in self.llm_suggestions[:]:
-                self.mark_llm_suggestion(suggestion)
+            self.mark_llm_suggestions(self.llm_suggestions)
             self.llm_suggestions.clear()
             self.populate_suggestions_list()
             self.update_suggestions_count()
@@ -1072,35 +985,6 @@ class AutoEditorGUI:
         except Exception as e:
             self.log_message(f"Erro na análise automática por LLM: {e}", "ERROR")
     
-    def extract_audio(self):
-        """Extrai áudio do vídeo usando ffmpeg"""
-        try:
-            # Criar arquivo temporário
-            temp_dir = tempfile.gettempdir()
-            audio_file = os.path.join(temp_dir, f"temp_audio_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3")
-            
-            # Comando ffmpeg para extrair áudio
-            cmd = [
-                'ffmpeg', '-i', self.input_file.get(),
-                '-vn', '-c:a', 'libmp3lame', '-q:a', '2',
-                '-y', audio_file
-            ]
-            
-            self.log_message(f"Extraindo áudio: {' '.join(cmd)}", "INFO")
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.log_message(f"Áudio extraído: {audio_file}", "INFO")
-                return audio_file
-            else:
-                self.log_message(f"Erro ao extrair áudio: {result.stderr}", "ERROR")
-                return None
-                
-        except Exception as e:
-            self.log_message(f"Erro ao extrair áudio: {str(e)}", "ERROR")
-            return None
-    
     def analyze_transcription_for_errors(self):
         """Analisa a transcrição para detectar erros - OTIMIZADO PARA MEMÓRIA"""
         self.error_segments = []
@@ -1369,40 +1253,6 @@ class AutoEditorGUI:
                 end_pos = f"{start_pos}+{len(text_to_find)}c"
                 self.transcription_text.tag_add("error", start_pos, end_pos)
     
-    def mark_selection_for_removal(self):
-        """Marca a seleção atual para remoção"""
-        try:
-            selection = self.transcription_text.tag_ranges(tk.SEL)
-            if selection:
-                start, end = selection
-                
-                # Obter o texto selecionado
-                selected_text = self.transcription_text.get(start, end)
-                
-                # Encontrar timestamps para a seleção
-                timestamps = self.find_timestamps_for_selection(start, end)
-                
-                if timestamps:
-                    segment = {
-                        'type': 'manual',
-                        'text': selected_text,
-                        'start': timestamps['start'],
-                        'end': timestamps['end'],
-                        'segment_text': selected_text
-                    }
-                    
-                    self.marked_segments.append(segment)
-                    self.transcription_text.tag_add("marked", start, end)
-                    
-                    self.log_message(f"Marcado para remoção: {selected_text[:50]}... ({timestamps['start']:.1f}s - {timestamps['end']:.1f}s)", "INFO")
-                    self.update_cuts_count()
-                else:
-                    messagebox.showwarning("Aviso", "Não foi possível determinar os timestamps para a seleção.")
-            else:
-                messagebox.showwarning("Aviso", "Selecione um texto primeiro.")
-        except Exception as e:
-            self.log_message(f"Erro ao marcar seleção: {str(e)}", "ERROR")
-    
     def unmark_selection(self):
         """Remove a marcação da seleção atual"""
         try:
@@ -1424,34 +1274,6 @@ class AutoEditorGUI:
         except Exception as e:
             self.log_message(f"Erro ao desmarcar seleção: {str(e)}", "ERROR")
     
-    def find_timestamps_for_selection(self, start, end):
-        """Encontra os timestamps para uma seleção de texto"""
-        try:
-            # Obter a linha onde está a seleção
-            start_line = self.transcription_text.index(start).split('.')[0]
-            end_line = self.transcription_text.index(end).split('.')[0]
-            
-            # Procurar por timestamps nas linhas
-            for line_num in range(int(start_line), int(end_line) + 1):
-                line_start = f"{line_num}.0"
-                line_end = f"{line_num}.end"
-                line_text = self.transcription_text.get(line_start, line_end)
-                
-                # Extrair timestamp da linha
-                if '[' in line_text and ']' in line_text:
-                    timestamp_part = line_text[line_text.find('['):line_text.find(']')+1]
-                    times = timestamp_part.strip('[]').split(' - ')
-                    if len(times) == 2:
-                        return {
-                            'start': float(times[0].replace('s', '')),
-                            'end': float(times[1].replace('s', ''))
-                        }
-            
-            return None
-        except Exception as e:
-            self.log_message(f"Erro ao encontrar timestamps: {str(e)}", "ERROR")
-            return None
-    
     def update_cuts_count(self):
         """Atualiza o contador de cortes"""
         total_cuts = len(self.error_segments) + len(self.marked_segments)
@@ -1491,27 +1313,6 @@ class AutoEditorGUI:
             self.command_text.insert(tk.END, cmd)
             self.command_text.config(state='disabled')
     
-    def transcribe_with_openai_api(self, audio_file):
-        """Transcreve usando API da OpenAI"""
-        if not OPENAI_AVAILABLE:
-            raise RuntimeError("Biblioteca openai não instalada")
-        
-        api_key = self.api_keys.get("openai")
-        if not api_key:
-            raise RuntimeError("API Key da OpenAI não configurada")
-        
-        client = openai.OpenAI(api_key=api_key)
-        
-        with open(audio_file, "rb") as audio:
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio,
-                response_format="verbose_json",
-                timestamp_granularities=["word"]
-            )
-        
-        return transcript.model_dump()
-    
     def create_whisper_config_section(self, parent):
         config_frame = ttk.LabelFrame(parent, text="Configurações do Whisper", padding="15")
         config_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 20))
@@ -1702,6 +1503,9 @@ class AutoEditorGUI:
             # Limpar arquivos temporários
             self.cleanup_temp_files()
             
+            # Encerrar o worker do Whisper (libera os modelos carregados)
+            whisper_worker.shutdown()
+            
             # Otimizar memória
             self.optimize_memory_usage()
             
@@ -1712,13 +1516,16 @@ class AutoEditorGUI:
         
         finally:
             # Fechar a janela
+            self.ui_bus.close()
+            if self.session_log:
+                self.session_log.close()
             self.root.destroy()
 
     def cleanup_temp_files(self):
         """Limpa arquivos temporários criados durante a execução"""
         try:
             temp_dir = tempfile.gettempdir()
-            pattern = "temp_audio_*.mp3"
+            pattern = "temp_audio_*"
             
             import glob
             temp_files = glob.glob(os.path.join(temp_dir, pattern))
@@ -1798,6 +1605,7 @@ class AutoEditorGUI:
         self.cleanup_temp_files()
         self.optimize_memory_usage()
         self.clear_whisper_result()
+        whisper_worker.shutdown()
         
         self.log_memory_usage("após limpeza")
         self.log_message("Recursos limpos com sucesso!", "SUCCESS")
@@ -1822,10 +1630,10 @@ class AutoEditorGUI:
         """Executa a análise semântica em thread separada"""
         try:
             self.log_message("Iniciando análise semântica com GPT-4o...", "INFO")
-            self.semantic_status.config(text="Enviando para IA...", foreground='blue')
+            self.set_widget(self.semantic_status, text="Enviando para IA...", foreground='blue')
             
             # Obter objetivo do vídeo
-            objective = self.get_video_objective()
+            objective = self.ui_bus.invoke(self.get_video_objective)
             
             # Preparar dados para o LLM
             clips_data = self.prepare_clips_for_llm()
@@ -1839,23 +1647,23 @@ class AutoEditorGUI:
             
             # Processar resposta
             self.log_message("Processando sugestões da IA...", "INFO")
-            self.process_semantic_response(response)
+            self.ui_bus.invoke(self.process_semantic_response, response)
             
             # Atualizar interface
-            self.semantic_status.config(text="Sugestões recebidas!", foreground='green')
+            self.set_widget(self.semantic_status, text="Sugestões recebidas!", foreground='green')
             self.log_message("Análise semântica concluída com sucesso!", "SUCCESS")
             
             # Habilitar botões de ação
-            self.accept_button.config(state='normal')
-            self.discard_button.config(state='normal')
+            self.set_widget(self.accept_button, state='normal')
+            self.set_widget(self.discard_button, state='normal')
             
         except Exception as e:
             import traceback
             err_msg = f"Erro na análise semântica: {str(e)}\n{traceback.format_exc()}"
             self.log_message(err_msg, "ERROR")
-            self.semantic_status.config(text="Erro na análise", foreground='red')
+            self.set_widget(self.semantic_status, text="Erro na análise", foreground='red')
         finally:
-            self.semantic_analyze_button.config(state='normal')
+            self.set_widget(self.semantic_analyze_button, state='normal')
     
     def get_video_objective(self):
         """Obtém o objetivo do vídeo da interface"""
@@ -1922,31 +1730,11 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
     
     def call_gpt4o_api(self, prompt):
         """Chama a API do GPT-4o"""
-        if not OPENAI_AVAILABLE:
-            raise RuntimeError("Biblioteca openai não instalada")
-        
-        if not self.api_key.get():
-            raise RuntimeError("API Key da OpenAI não informada")
-        
-        client = openai.OpenAI(api_key=self.api_key.get())
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Você é um especialista em edição de vídeo e narrativa. Responda apenas com JSON válido, sem texto adicional."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=4000
+        return self.pipeline.call_llm(
+            "openai", "gpt-4o", prompt,
+            system_prompt="Você é um especialista em edição de vídeo e narrativa. Responda apenas com JSON válido, sem texto adicional.",
+            stage="llm_narrative"
         )
-        
-        return response.choices[0].message.content
     
     def process_semantic_response(self, response):
         """Processa a resposta do LLM e atualiza a interface"""
@@ -2098,23 +1886,9 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         self.log_message("🎬 Reorganização semântica concluída! Agora você pode executar a edição final.", "SUCCESS")
     
     def build_semantic_reorganization_command(self, base_cmd):
-        """Constrói comando para reorganização semântica"""
-        # Etapa 1: Exportar clipes individuais
-        output_dir = os.path.dirname(self.output_file.get())
-        clips_dir = os.path.join(output_dir, "temp_clips")
-        
-        # Criar diretório temporário
-        os.makedirs(clips_dir, exist_ok=True)
-        
-        # Gerar argumentos --add-in para cada clipe na nova ordem
-        add_in_args = []
-        for clip in self.final_clip_order:
-            add_in_args.append(f"--add-in {clip['start']},{clip['end']}")
-        
-        # Comando para exportar clipes
-        export_cmd = f"{base_cmd} {' '.join(add_in_args)} --export clip-sequence --output {clips_dir}"
-        
-        return export_cmd
+        """Descreve a renderização da reorganização semântica (feita pelo pipeline, sem auto-editor)"""
+        return (f"{base_cmd} # reorganização semântica: {len(self.final_clip_order)} clipes "
+                f"renderizados direto da fonte --output {self.output_file.get()}")
     
     def run_auto_editor(self, command):
         """Executa o auto-editor com suporte à reorganização semântica"""
@@ -2122,8 +1896,8 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
             self.log_message(f"Executando comando: {command}", "INFO")
             
             # Verificar se é reorganização semântica
-            if "--export clip-sequence" in command:
-                self.run_semantic_reorganization(command)
+            if self.semantic_analysis_completed and self.final_clip_order:
+                self.run_semantic_reorganization()
             else:
                 # Execução normal
                 self.run_normal_editing(command)
@@ -2132,144 +1906,51 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
             self.log_message(f"Erro ao executar auto-editor: {str(e)}", "ERROR")
             self.stop_editing()
     
-    def run_semantic_reorganization(self, command):
-        """Executa reorganização semântica em duas etapas"""
+    def run_semantic_reorganization(self):
+        """Renderiza a nova ordem dos clipes direto do vídeo de origem, sem clipes intermediários"""
         try:
-            # Etapa 1: Exportar clipes individuais
-            self.log_message("Etapa 1: Exportando clipes individuais...", "INFO")
-            
-            self.process = subprocess.Popen(
-                command.split(),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # Monitorar saída
-            self.monitor_semantic_output()
-            
+            self.log_message("Renderizando a reorganização semântica...", "INFO")
+            self.pipeline.render_reorganized(self.input_file.get(), self.output_file.get(), self.final_clip_order)
+        except Cancelled:
+            self.log_message("Reorganização semântica cancelada", "WARNING")
         except Exception as e:
             self.log_message(f"Erro na reorganização semântica: {str(e)}", "ERROR")
-            self.stop_editing()
-    
-    def monitor_semantic_output(self):
-        """Monitora a saída da reorganização semântica"""
-        def monitor():
-            try:
-                while self.process and self.process.poll() is None:
-                    output = self.process.stdout.readline()
-                    if output:
-                        self.output_queue.put(output.strip())
-                        self.log_message(output.strip(), "INFO")
-                
-                # Verificar se processo terminou com sucesso
-                if self.process and self.process.returncode == 0:
-                    self.log_message("Etapa 1 concluída! Iniciando junção dos clipes...", "SUCCESS")
-                    self.stitch_clips_sequence()
-                else:
-                    self.log_message("Erro na exportação dos clipes", "ERROR")
-                    self.stop_editing()
-                    
-            except Exception as e:
-                self.log_message(f"Erro no monitoramento: {str(e)}", "ERROR")
-                self.stop_editing()
-        
-        # Executar monitoramento em thread separada
-        import threading
-        monitor_thread = threading.Thread(target=monitor)
-        monitor_thread.daemon = True
-        monitor_thread.start()
-    
-    def stitch_clips_sequence(self):
-        """Junta os clipes exportados em um vídeo final"""
-        try:
-            output_dir = os.path.dirname(self.output_file.get())
-            clips_dir = os.path.join(output_dir, "temp_clips")
-            
-            # Verificar se os clipes foram exportados
-            if not os.path.exists(clips_dir):
-                raise RuntimeError("Diretório de clipes não encontrado")
-            
-            # Listar clipes em ordem
-            clip_files = []
-            for i in range(len(self.final_clip_order)):
-                clip_file = os.path.join(clips_dir, f"{i:04d}.mp4")
-                if os.path.exists(clip_file):
-                    clip_files.append(clip_file)
-                else:
-                    self.log_message(f"Aviso: Clipe {i:04d}.mp4 não encontrado", "WARNING")
-            
-            if not clip_files:
-                raise RuntimeError("Nenhum clipe encontrado para juntar")
-            
-            # Criar arquivo de lista para ffmpeg
-            filelist_path = os.path.join(output_dir, "filelist.txt")
-            with open(filelist_path, 'w', encoding='utf-8') as f:
-                for clip_file in clip_files:
-                    f.write(f"file '{clip_file}'\n")
-            
-            # Comando ffmpeg para juntar clipes
-            ffmpeg_cmd = [
-                'ffmpeg', '-f', 'concat', '-safe', '0',
-                '-i', filelist_path,
-                '-c', 'copy',
-                self.output_file.get()
-            ]
-            
-            self.log_message("Etapa 2: Juntando clipes com ffmpeg...", "INFO")
-            self.log_message(f"Comando ffmpeg: {' '.join(ffmpeg_cmd)}", "INFO")
-            
-            # Executar ffmpeg
-            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.log_message("🎉 Reorganização semântica concluída com sucesso!", "SUCCESS")
-                self.cleanup_semantic_temp_files(clips_dir, filelist_path)
-            else:
-                self.log_message(f"Erro no ffmpeg: {result.stderr}", "ERROR")
-            
-            self.stop_editing()
-            
-        except Exception as e:
-            self.log_message(f"Erro ao juntar clipes: {str(e)}", "ERROR")
-            self.stop_editing()
-    
-    def cleanup_semantic_temp_files(self, clips_dir, filelist_path):
-        """Limpa arquivos temporários da reorganização semântica"""
-        try:
-            # Remover arquivo de lista
-            if os.path.exists(filelist_path):
-                os.remove(filelist_path)
-                self.log_message("Arquivo de lista removido", "INFO")
-            
-            # Remover diretório de clipes
-            if os.path.exists(clips_dir):
-                import shutil
-                shutil.rmtree(clips_dir)
-                self.log_message("Diretório de clipes temporários removido", "INFO")
-                
-        except Exception as e:
-            self.log_message(f"Erro ao limpar arquivos temporários: {str(e)}", "WARNING")
+        finally:
+            self.output_queue.put("DONE")
     
     def run_normal_editing(self, command):
         """Executa edição normal (sem reorganização semântica)"""
-        self.process = subprocess.Popen(
-            command.split(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+        self.process = process = self.start_tool(command.split())
         
         self.is_running = True
-        self.start_button.config(state='disabled')
-        self.stop_button.config(state='normal')
-        self.progress_bar.start()
+        self.set_widget(self.start_button, state='disabled')
+        self.set_widget(self.stop_button, state='normal')
         
         self.log_message("Iniciando edição...", "INFO")
+        try:
+            if process.wait() == 0:
+                self.log_message("Edição concluída com sucesso!", "SUCCESS")
+            elif self.is_running:
+                self.log_message(f"auto-editor terminou com erro:\n{process.stderr}", "ERROR")
+        finally:
+            self.output_queue.put("DONE")
+    
+    def start_tool(self, cmd):
+        """Inicia o auto-editor drenando stdout e stderr em paralelo (sem travar com o pipe cheio)
+
+        Linhas de progresso alimentam a barra; as demais vão para o console.
+        """
+        self.pipeline.progress.plan(["render"])
+        self.pipeline.progress.start_stage("render")
+        
+        def on_line(line):
+            update = parse_auto_editor_progress(line)
+            if update and "title" in update:
+                self.pipeline.progress.update(percent=update["percent"])
+            else:
+                self.log_message(line, "INFO")
+        
+        return process_runner.start(with_auto_editor_progress(cmd), on_stdout=on_line, on_stderr=on_line)
     
     def check_dependencies(self):
         """Verifica se auto-editor e ffmpeg estão instalados"""
@@ -2366,11 +2047,16 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
     
     def stop_editing(self):
         """Para o processo de edição"""
+        self.pipeline.cancel()
         if self.process:
             self.log_message("Interrompendo processo...", "WARNING")
-            self.process.terminate()
             self.is_running = False
+            self.process.terminate()
             self.log_message("Processo interrompido pelo usuário", "WARNING")
+
+    def cancel_pipeline(self):
+        """Cancela a edição em andamento em qualquer etapa"""
+        self.pipeline.cancel()
     
     def monitor_output(self):
         """Monitora a fila de saída e atualiza o console"""
@@ -2422,84 +2108,59 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         try:
             self.log_message("Iniciando análise de fala com Whisper...", "INFO")
             self.log_memory_usage("início da análise")
-            self.analysis_status.config(text="Extraindo áudio...", foreground='blue')
-            audio_file = self.extract_audio()
-            if not audio_file:
-                return
-            self.log_memory_usage("após extração de áudio")
+            self.pipeline.progress.plan(["proxy", "audio", "transcription"])
             if self.whisper_mode.get() == "api":
-                self.analysis_status.config(text="Transcrevendo via API OpenAI...", foreground='blue')
-                self.log_message("Transcrevendo via API OpenAI...", "INFO")
-                result = self.transcribe_with_openai_api(audio_file)
-                self.log_message(f"Resposta da API OpenAI: {result}", "INFO")
-                self.whisper_result = result
-                self.log_memory_usage("após receber resposta da API")
+                self.set_widget(self.analysis_status, text="Transcrevendo via API OpenAI...", foreground='blue')
             else:
-                self.analysis_status.config(text="Carregando modelo Whisper...", foreground='blue')
-                self.log_message("Carregando modelo Whisper...", "INFO")
-                device = "cuda" if self.use_gpu.get() else "cpu"
-                model = whisper.load_model(self.whisper_model.get(), device=device)
-                self.log_message(f"Modelo {self.whisper_model.get()} carregado em {device}", "INFO")
-                self.log_memory_usage("após carregar modelo")
-                self.analysis_status.config(text="Transcrevendo com Whisper local...", foreground='blue')
-                self.log_message("Iniciando transcrição...", "INFO")
-                result = model.transcribe(audio_file, word_timestamps=True)
-                self.whisper_result = result
-                del model
-                import gc
-                gc.collect()
-                self.log_memory_usage("após transcrição local")
+                self.set_widget(self.analysis_status, text="Transcrevendo com Whisper local...", foreground='blue')
+            # Cache de transcrições, proxy de análise, extração do áudio e Whisper ficam no pipeline
+            result = self.pipeline.transcribe_video(self.input_file.get(), self.whisper_mode.get(),
+                                                    self.whisper_model.get(), self.use_gpu.get(), use_proxy=True)
+            self.log_message(f"Transcrição: {describe_transcription(result)}", "INFO")
+            self.whisper_result = result
+            self.log_memory_usage("após transcrição")
             # Etapa C: Analisar transcrição
-            self.analysis_status.config(text="Analisando texto...", foreground='blue')
+            self.set_widget(self.analysis_status, text="Analisando texto...", foreground='blue')
             self.log_message("Analisando transcrição para detectar erros...", "INFO")
             self.analyze_transcription_for_errors()
             self.log_memory_usage("após análise de erros")
             # Etapa D: Popular GUI
-            self.populate_transcription_gui()
+            self.ui_bus.invoke(self.populate_transcription_gui)
             self.log_memory_usage("após popular GUI")
             self.clear_whisper_result()
             self.log_memory_usage("após otimizar resultado")
-            try:
-                os.remove(audio_file)
-                self.log_message("Arquivo temporário removido", "INFO")
-            except Exception as e:
-                self.log_message(f"Erro ao remover arquivo temporário: {str(e)}", "WARNING")
             # --- NOVO: Pipeline automático LLM ---
-            self.analysis_status.config(text="Enviando para LLM...", foreground='blue')
+            self.set_widget(self.analysis_status, text="Enviando para LLM...", foreground='blue')
             self.log_message("Iniciando análise automática por LLM...", "INFO")
             # Chamar LLM e aplicar sugestões automaticamente
             self.run_llm_analysis_auto()
-            self.analysis_status.config(text="Correção automática concluída!", foreground='green')
+            self.set_widget(self.analysis_status, text="Correção automática concluída!", foreground='green')
             self.log_message("Correção automática concluída!", "SUCCESS")
             self.log_memory_usage("final da análise")
+        except Cancelled:
+            self.set_widget(self.analysis_status, text="Análise cancelada", foreground='orange')
         except Exception as e:
             import traceback
             err_msg = f"Erro na análise de fala: {str(e)}\n{traceback.format_exc()}"
             self.log_message(err_msg, "ERROR")
-            self.analysis_status.config(text="Erro na análise", foreground='red')
+            self.set_widget(self.analysis_status, text="Erro na análise", foreground='red')
             self.last_whisper_error.set(str(e))
         finally:
-            self.analyze_button.config(state='normal')
+            self.set_widget(self.analyze_button, state='normal')
 
     def run_llm_analysis_auto(self):
         """Executa a análise por LLM e aplica todas as sugestões automaticamente"""
         try:
             # Obter transcrição completa
-            full_transcription = self.get_full_transcription()
+            full_transcription = self.ui_bus.invoke(self.get_full_transcription)
             prompt = self.build_speech_analysis_prompt(full_transcription)
             provider = self.selected_llm_provider.get()
             model = self.selected_llm_model.get()
             response = self.call_llm_api(provider, model, prompt)
-            self.process_llm_suggestions(response)
-            # Aplicar todas as sugestões automaticamente
-            for suggestion in self.llm_suggestions[:]:
-                self.mark_llm_suggestion(suggestion)
-            self.llm_suggestions.clear()
-            self.populate_suggestions_list()
-            self.update_suggestions_count()
+            self.ui_bus.invoke(self.apply_llm_suggestions_auto, response)
             # Desabilitar botões de análise LLM e sugestões
             if hasattr(self, 'llm_analyze_button'):
-                self.llm_analyze_button.config(state='disabled')
+                self.set_widget(self.llm_analyze_button, state='disabled')
             if hasattr(self, 'apply_all_suggestions'):
                 self.apply_all_suggestions = lambda: None
             if hasattr(self, 'apply_selected_suggestion'):
@@ -2507,50 +2168,28 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         except Exception as e:
             self.log_message(f"Erro na análise automática por LLM: {e}", "ERROR")
     
-    def extract_audio(self):
-        """Extrai áudio do vídeo usando ffmpeg"""
-        try:
-            # Criar arquivo temporário
-            temp_dir = tempfile.gettempdir()
-            audio_file = os.path.join(temp_dir, f"temp_audio_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3")
-            
-            # Comando ffmpeg para extrair áudio
-            cmd = [
-                'ffmpeg', '-i', self.input_file.get(),
-                '-vn', '-c:a', 'libmp3lame', '-q:a', '2',
-                '-y', audio_file
-            ]
-            
-            self.log_message(f"Extraindo áudio: {' '.join(cmd)}", "INFO")
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                self.log_message(f"Áudio extraído: {audio_file}", "INFO")
-                return audio_file
-            else:
-                self.log_message(f"Erro ao extrair áudio: {result.stderr}", "ERROR")
-                return None
-                
-        except Exception as e:
-            self.log_message(f"Erro ao extrair áudio: {str(e)}", "ERROR")
-            return None
+    def apply_llm_suggestions_auto(self, response):
+        """Processa a resposta do LLM e aplica todas as sugestões (no loop principal)"""
+        self.process_llm_suggestions(response)
+        self.mark_llm_suggestions(self.llm_suggestions)
+        self.llm_suggestions.clear()
+        self.populate_suggestions_list()
+        self.update_suggestions_count()
     
     def analyze_transcription_for_errors(self):
-        """Analisa a transcrição para detectar erros - OTIMIZADO PARA MEMÓRIA"""
+        """Analisa a transcrição para detectar erros (uma passada sobre a WordTimeline)"""
         self.error_segments = []
         if not self.whisper_result:
             return
         
-        # Verificar se temos words (nova API) ou segments (API antiga)
-        words = self.whisper_result.get('words')
-        if not words:
+        timeline = self.word_timeline = WordTimeline.from_result(self.whisper_result)
+        if not len(timeline):
             self.log_message("A resposta da API não contém 'words' com timestamps. Verifique se sua conta OpenAI tem acesso a timestamps por palavra.", "ERROR")
-            self.analysis_status.config(text="API não retornou timestamps. Verifique seu plano OpenAI.", foreground='red')
+            self.set_widget(self.analysis_status, text="API não retornou timestamps. Verifique seu plano OpenAI.", foreground='red')
             self.last_whisper_error.set("API não retornou timestamps. Verifique seu plano OpenAI.")
             return
         
-        self.log_message(f"Analisando {len(words)} palavras para detectar erros...", "INFO")
+        self.log_message(f"Analisando {len(timeline)} palavras para detectar erros...", "INFO")
         
         # Palavras de preenchimento padrão
         default_fillers = {'uh', 'um', 'ah', 'hmm', 'er', 'um', 'uhm'}
@@ -2559,147 +2198,59 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         custom_fillers = set(word.strip().lower() for word in self.custom_fillers.get().split(','))
         all_fillers = default_fillers.union(custom_fillers)
         
-        # Processar em lotes menores para economizar memória
-        batch_size = 200
-        errors_found = 0
+        detect_fillers = self.detect_fillers.get()
+        detect_repetitions = self.detect_repetitions.get()
+        texts = timeline.texts
+        normalized = [text.strip().lower() for text in texts]
+        
+        for i, word in enumerate(normalized):
+            # Detectar palavras de preenchimento
+            if detect_fillers and word in all_fillers:
+                self.error_segments.append({
+                    'type': 'filler',
+                    'text': texts[i],  # Usar palavra original
+                    'start': timeline.starts[i],
+                    'end': timeline.ends[i],
+                    'segment_text': texts[i],
+                    'first_word': i,
+                    'last_word': i
+                })
+            
+            # Detectar repetições (palavras consecutivas iguais)
+            if detect_repetitions and i + 1 < len(normalized):
+                if word == normalized[i + 1] and len(word) > 2:
+                    # Marcar ambas as palavras como repetição
+                    self.error_segments.append({
+                        'type': 'repetition',
+                        'text': f"{texts[i]} {texts[i + 1]}",
+                        'start': timeline.starts[i],
+                        'end': timeline.ends[i + 1],
+                        'segment_text': f"{texts[i]} {texts[i + 1]}",
+                        'first_word': i,
+                        'last_word': i + 1
+                    })
+        
+        self.log_message(f"Análise concluída: {len(self.error_segments)} erros detectados", "SUCCESS")
+    
+    def populate_transcription_gui(self):
+        """Popula a GUI com a transcrição e marca os erros"""
+        if not self.whisper_result:
+            return
         
-        for i in range(0, len(words), batch_size):
-            batch = words[i:i + batch_size]
-            
-            # Analisar cada palavra no lote
-            for j, word_info in enumerate(batch):
-                word = word_info['word'].strip().lower()
-                start_time = word_info['start']
-                end_time = word_info['end']
-                
-                # Detectar palavras de preenchimento
-                if self.detect_fillers.get():
-                    if word in all_fillers:
-                        self.error_segments.append({
-                            'type': 'filler',
-                            'text': word_info['word'],  # Usar palavra original
-                            'start': start_time,
-                            'end': end_time,
-                            'segment_text': word_info['word']
-                        })
-                        errors_found += 1
-                
-                # Detectar repetições (palavras consecutivas iguais)
-                if self.detect_repetitions.get():
-                    # Verificar se não é a última palavra do lote
-                    if j < len(batch) - 1:
-                        next_word = batch[j + 1]['word'].strip().lower()
-                        if word == next_word and len(word) > 2:
-                            # Marcar ambas as palavras como repetição
-                            self.error_segments.append({
-                                'type': 'repetition',
-                                'text': f"{word_info['word']} {batch[j + 1]['word']}",
-                                'start': start_time,
-                                'end': batch[j + 1]['end'],
-                                'segment_text': f"{word_info['word']} {batch[j + 1]['word']}"
-                            })
-                            errors_found += 1
-                    # Verificar se não é a última palavra geral
-                    elif i + j < len(words) - 1:
-                        next_word = words[i + j + 1]['word'].strip().lower()
-                        if word == next_word and len(word) > 2:
-                            self.error_segments.append({
-                                'type': 'repetition',
-                                'text': f"{word_info['word']} {words[i + j + 1]['word']}",
-                                'start': start_time,
-                                'end': words[i + j + 1]['end'],
-                                'segment_text': f"{word_info['word']} {words[i + j + 1]['word']}"
-                            })
-                            errors_found += 1
-            
-            # Forçar garbage collection a cada lote
-            if i % (batch_size * 3) == 0:
-                import gc
-                gc.collect()
-                self.log_message(f"Analisadas {i + len(batch)} palavras, {errors_found} erros encontrados...", "INFO")
-        
-        self.log_message(f"Análise concluída: {errors_found} erros detectados", "SUCCESS")
-    
-    def populate_transcription_gui(self):
-        """Popula a GUI com a transcrição e marca os erros - OTIMIZADO PARA MEMÓRIA"""
-        if not self.whisper_result:
-            return
-        
-        # Limpar área de transcrição
-        self.transcription_text.delete(1.0, tk.END)
-        
-        # Verificar se temos words (nova API) ou segments (API antiga)
-        words = self.whisper_result.get('words')
-        if not words:
+        if self.word_timeline is None:
+            self.word_timeline = WordTimeline.from_result(self.whisper_result)
+        timeline = self.word_timeline
+        if not len(timeline):
+            self.transcript_view.clear()
             self.log_message("A resposta da API não contém 'words' com timestamps.", "ERROR")
             return
         
-        self.log_message(f"Processando {len(words)} palavras...", "INFO")
-        
-        # Processar e inserir diretamente, sem construir string gigante
-        sentence_words = []
-        sentence_start = None
-        sentences_processed = 0
-        
-        # Processar em lotes muito menores para economizar memória
-        batch_size = 100  # Reduzido de 1000 para 100
-        for i in range(0, len(words), batch_size):
-            batch = words[i:i + batch_size]
-            
-            for word_info in batch:
-                word = word_info['word']
-                
-                # Iniciar nova frase se não temos uma
-                if sentence_start is None:
-                    sentence_start = word_info['start']
-                
-                sentence_words.append(word)
-                
-                # Finalizar frase se encontrou pontuação de fim
-                if word.strip() in ['.', '!', '?']:
-                    # Construir e inserir frase imediatamente
-                    sentence_text = ''.join(sentence_words).strip()
-                    sentence_end = word_info['end']
-                    
-                    timestamp = f"[{sentence_start:.1f}s - {sentence_end:.1f}s] "
-                    line_text = timestamp + sentence_text + "\n\n"
-                    
-                    # Inserir diretamente no widget
-                    self.transcription_text.insert(tk.END, line_text)
-                    
-                    # Limpar lista de palavras da frase imediatamente
-                    sentence_words.clear()
-                    sentence_start = None
-                    sentences_processed += 1
-                    
-                    # Atualizar GUI a cada 10 frases
-                    if sentences_processed % 10 == 0:
-                        self.transcription_text.see(tk.END)
-                        self.transcription_text.update_idletasks()
-                        self.log_message(f"Processadas {sentences_processed} frases...", "INFO")
-            
-            # Forçar garbage collection a cada lote
-            if i % (batch_size * 5) == 0:
-                import gc
-                gc.collect()
-        
-        # Adicionar última frase se não terminou com pontuação
-        if sentence_words:
-            sentence_text = ''.join(sentence_words).strip()
-            sentence_end = words[-1]['end']
-            
-            timestamp = f"[{sentence_start:.1f}s - {sentence_end:.1f}s] "
-            line_text = timestamp + sentence_text + "\n\n"
-            
-            self.transcription_text.insert(tk.END, line_text)
-            sentences_processed += 1
+        self.log_message(f"Processando {len(timeline)} palavras...", "INFO")
         
-        # Limpar variáveis para liberar memória
-        del sentence_words, sentence_start
-        import gc
-        gc.collect()
+        # Uma frase por parágrafo; só a janela visível é inserida no widget
+        self.transcript_view.set_timeline(timeline)
         
-        self.log_message(f"Transcrição concluída: {sentences_processed} frases processadas", "SUCCESS")
+        self.log_message(f"Transcrição concluída: {len(self.transcript_view.lines)} frases processadas", "SUCCESS")
         
         # Extrair clipes de fala para reorganização semântica
         self.extract_speech_clips()
@@ -2712,70 +2263,19 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
     
     def extract_speech_clips(self):
         """Extrai clipes de fala da transcrição para reorganização semântica"""
-        if not self.whisper_result or not self.whisper_result.get('words'):
+        if self.word_timeline is None or not len(self.word_timeline):
             return
         
         self.log_message("Extraindo clipes de fala para análise semântica...", "INFO")
         
-        words = self.whisper_result['words']
-        self.speech_clips = []
-        clip_id = 1
-        
-        # Agrupar palavras em clipes baseados em pausas e pontuação
-        current_clip_words = []
-        current_start = None
-        
-        for word_info in words:
-            word = word_info['word']
-            
-            # Iniciar novo clipe se não temos um
-            if current_start is None:
-                current_start = word_info['start']
-            
-            current_clip_words.append(word)
-            
-            # Finalizar clipe se encontrou pontuação de fim ou pausa longa
-            if word.strip() in ['.', '!', '?']:
-                # Verificar se há pausa significativa após pontuação
-                if len(words) > words.index(word_info) + 1:
-                    next_word = words[words.index(word_info) + 1]
-                    pause_duration = next_word['start'] - word_info['end']
-                    
-                    # Se pausa > 1 segundo, finalizar clipe
-                    if pause_duration > 1.0:
-                        clip_text = ''.join(current_clip_words).strip()
-                        clip_end = word_info['end']
-                        
-                        self.speech_clips.append({
-                            'id': clip_id,
-                            'start': current_start,
-                            'end': clip_end,
-                            'text': clip_text,
-                            'duration': clip_end - current_start
-                        })
-                        
-                        clip_id += 1
-                        current_clip_words = []
-                        current_start = None
-        
-        # Adicionar último clipe se não terminou com pontuação
-        if current_clip_words:
-            clip_text = ''.join(current_clip_words).strip()
-            clip_end = words[-1]['end']
-            
-            self.speech_clips.append({
-                'id': clip_id,
-                'start': current_start,
-                'end': clip_end,
-                'text': clip_text,
-                'duration': clip_end - current_start
-            })
+        # Clipes terminam em fim de frase seguido de pausa > 1 segundo
+        self.speech_clips = self.word_timeline.speech_clips()
         
         self.log_message(f"Extraídos {len(self.speech_clips)} clipes de fala", "SUCCESS")
         
         # Habilitar botão de análise semântica
-        self.semantic_analyze_button.config(state='normal')
-        self.semantic_status.config(text="Pronto para análise semântica", foreground='green')
+        self.set_widget(self.semantic_analyze_button, state='normal')
+        self.set_widget(self.semantic_status, text="Pronto para análise semântica", foreground='green')
         
         # Popular lista de ordem original
         self.populate_original_clips_list()
@@ -2794,15 +2294,14 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
             self.original_listbox.insert(tk.END, display_text)
     
     def mark_detected_errors(self):
-        """Marca os erros detectados automaticamente no texto"""
-        for error in self.error_segments:
-            # Encontrar o texto do erro na transcrição
-            text_to_find = error['text']
-            start_pos = self.transcription_text.search(text_to_find, 1.0, tk.END)
-            
-            if start_pos:
-                end_pos = f"{start_pos}+{len(text_to_find)}c"
-                self.transcription_text.tag_add("error", start_pos, end_pos)
+        """Marca os erros detectados automaticamente no texto (pelo índice das palavras)"""
+        self.tag_word_spans("error", [(error['first_word'], error['last_word']) for error in self.error_segments])
+    
+    def tag_word_spans(self, tag, spans):
+        """Marca vários intervalos de palavras (primeira, última); fora da janela visível, ao rolar"""
+        if self.word_timeline is None or not len(self.word_timeline.doc_starts):
+            return
+        self.transcript_view.add_marks(tag, spans)
     
     def mark_selection_for_removal(self):
         """Marca a seleção atual para remoção"""
@@ -2814,22 +2313,25 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
                 # Obter o texto selecionado
                 selected_text = self.transcription_text.get(start, end)
                 
-                # Encontrar timestamps para a seleção
-                timestamps = self.find_timestamps_for_selection(start, end)
+                # Palavras cobertas pela seleção (posição no documento inteiro, não só na janela)
+                word_range = self.transcript_view.word_range(start, end)
                 
-                if timestamps:
+                if word_range:
+                    first, last = word_range
                     segment = {
                         'type': 'manual',
                         'text': selected_text,
-                        'start': timestamps['start'],
-                        'end': timestamps['end'],
-                        'segment_text': selected_text
+                        'start': self.word_timeline.starts[first],
+                        'end': self.word_timeline.ends[last],
+                        'segment_text': selected_text,
+                        'first_word': first,
+                        'last_word': last
                     }
                     
                     self.marked_segments.append(segment)
-                    self.transcription_text.tag_add("marked", start, end)
+                    self.transcript_view.add_marks("marked", [word_range])
                     
-                    self.log_message(f"Marcado para remoção: {selected_text[:50]}... ({timestamps['start']:.1f}s - {timestamps['end']:.1f}s)", "INFO")
+                    self.log_message(f"Marcado para remoção: {selected_text[:50]}... ({segment['start']:.1f}s - {segment['end']:.1f}s)", "INFO")
                     self.update_cuts_count()
                 else:
                     messagebox.showwarning("Aviso", "Não foi possível determinar os timestamps para a seleção.")
@@ -2845,12 +2347,20 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
             if selection:
                 start, end = selection
                 selected_text = self.transcription_text.get(start, end)
+                word_range = self.transcript_view.word_range(start, end)
                 
-                # Remover da lista de segmentos marcados
-                self.marked_segments = [s for s in self.marked_segments if s['text'] != selected_text]
-                
-                # Remover tag
-                self.transcription_text.tag_remove("marked", start, end)
+                if word_range:
+                    # Remover os segmentos marcados que tocam as palavras selecionadas
+                    first, last = word_range
+                    self.marked_segments = [
+                        s for s in self.marked_segments
+                        if s.get('first_word') is None or s['last_word'] < first or s['first_word'] > last
+                    ]
+                    self.transcript_view.remove_marks("marked", first, last)
+                    self.transcript_view.remove_marks("llm_suggestion", first, last)
+                else:
+                    self.marked_segments = [s for s in self.marked_segments if s['text'] != selected_text]
+                    self.transcription_text.tag_remove("marked", start, end)
                 
                 self.log_message(f"Desmarcado: {selected_text[:50]}...", "INFO")
                 self.update_cuts_count()
@@ -2859,34 +2369,6 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         except Exception as e:
             self.log_message(f"Erro ao desmarcar seleção: {str(e)}", "ERROR")
     
-    def find_timestamps_for_selection(self, start, end):
-        """Encontra os timestamps para uma seleção de texto"""
-        try:
-            # Obter a linha onde está a seleção
-            start_line = self.transcription_text.index(start).split('.')[0]
-            end_line = self.transcription_text.index(end).split('.')[0]
-            
-            # Procurar por timestamps nas linhas
-            for line_num in range(int(start_line), int(end_line) + 1):
-                line_start = f"{line_num}.0"
-                line_end = f"{line_num}.end"
-                line_text = self.transcription_text.get(line_start, line_end)
-                
-                # Extrair timestamp da linha
-                if '[' in line_text and ']' in line_text:
-                    timestamp_part = line_text[line_text.find('['):line_text.find(']')+1]
-                    times = timestamp_part.strip('[]').split(' - ')
-                    if len(times) == 2:
-                        return {
-                            'start': float(times[0].replace('s', '')),
-                            'end': float(times[1].replace('s', ''))
-                        }
-            
-            return None
-        except Exception as e:
-            self.log_message(f"Erro ao encontrar timestamps: {str(e)}", "ERROR")
-            return None
-    
     def update_cuts_count(self):
         """Atualiza o contador de cortes"""
         total_cuts = len(self.error_segments) + len(self.marked_segments)
@@ -2943,10 +2425,10 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
         """Executa a análise por LLM em thread separada"""
         try:
             self.log_message("Iniciando análise de erros por LLM...", "INFO")
-            self.llm_analysis_status.config(text="Analisando transcrição...", foreground='blue')
+            self.set_widget(self.llm_analysis_status, text="Analisando transcrição...", foreground='blue')
             
             # Obter transcrição completa
-            full_transcription = self.get_full_transcription()
+            full_transcription = self.ui_bus.invoke(self.get_full_transcription)
             
             # Construir prompt para análise
             prompt = self.build_speech_analysis_prompt(full_transcription)
@@ -2960,22 +2442,25 @@ Analise cuidadosamente cada clipe e forneça uma estrutura que maximize o impact
             
             # Processar resposta
             self.log_message("Processando sugestões do LLM...", "INFO")
-            self.process_llm_suggestions(response)
+            self.ui_bus.invoke(self.process_llm_suggestions, response)
             
             # Atualizar interface
-            self.llm_analysis_status.config(text="Análise concluída! Revise as sugestões.", foreground='green')
+            self.set_widget(self.llm_analysis_status, text="Análise concluída! Revise as sugestões.", foreground='green')
             self.log_message("Análise por LLM concluída com sucesso!", "SUCCESS")
             
         except Exception as e:
             import traceback
             err_msg = f"Erro na análise por LLM: {str(e)}\n{traceback.format_exc()}"
             self.log_message(err_msg, "ERROR")
-            self.llm_analysis_status.config(text="Erro na análise", foreground='red')
+            self.set_widget(self.llm_analysis_status, text="Erro na análise", foreground='red')
         finally:
-            self.llm_analyze_button.config(state='normal')
+            self.set_widget(self.llm_analyze_button, state='normal')
     
     def get_full_transcription(self):
         """Obtém a transcrição completa do texto"""
+        if self.word_timeline is not None:
+            # O widget só contém a janela visível
+            return self.transcript_view.full_text().strip()
         return self.transcription_text.get(1.0, tk.END).strip()
     
     def build_speech_analysis_prompt(self, transcription):
@@ -3026,57 +2511,8 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
         return prompt
     
     def call_llm_api(self, provider, model, prompt):
-        """Chama a API do LLM selecionado"""
-        if provider == "openai":
-            return self.call_openai_api(model, prompt)
-        elif provider == "gemini":
-            return self.call_gemini_api(model, prompt)
-        else:
-            raise ValueError(f"Provedor não suportado: {provider}")
-    
-    def call_openai_api(self, model, prompt):
-        """Chama a API da OpenAI"""
-        if not OPENAI_AVAILABLE:
-            raise RuntimeError("Biblioteca openai não instalada")
-        
-        api_key = self.api_keys.get("openai")
-        if not api_key:
-            raise RuntimeError("API Key da OpenAI não configurada")
-        
-        client = openai.OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Você é um especialista em edição de vídeo e análise de fala. Responda apenas com JSON válido."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=4000
-        )
-        
-        return response.choices[0].message.content
-    
-    def call_gemini_api(self, model, prompt):
-        """Chama a API do Google Gemini"""
-        if not GEMINI_AVAILABLE:
-            raise RuntimeError("Biblioteca google.generativeai não instalada")
-        
-        api_key = self.api_keys.get("gemini")
-        if not api_key:
-            raise RuntimeError("API Key do Google Gemini não configurada")
-        
-        genai.configure(api_key=api_key)
-        model_instance = genai.GenerativeModel(model)
-        
-        response = model_instance.generate_content(prompt)
-        return response.text
+        """Chama a API do LLM selecionado (com tempo limite, pelo orquestrador do pipeline)"""
+        return self.pipeline.call_llm(provider, model, prompt)
     
     def process_llm_suggestions(self, response):
         """Processa as sugestões do LLM"""
@@ -3139,8 +2575,7 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
             return
         
         count = len(self.llm_suggestions)
-        for suggestion in self.llm_suggestions[:]:  # Cópia da lista
-            self.mark_llm_suggestion(suggestion)
+        self.mark_llm_suggestions(self.llm_suggestions)
         
         self.llm_suggestions.clear()
         self.populate_suggestions_list()
@@ -3177,29 +2612,44 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
     
     def mark_llm_suggestion(self, suggestion):
         """Marca uma sugestão do LLM na transcrição"""
-        text_to_find = suggestion['text']
-        start_pos = self.transcription_text.search(text_to_find, 1.0, tk.END)
-        
-        if start_pos:
-            end_pos = f"{start_pos}+{len(text_to_find)}c"
-            self.transcription_text.tag_add("llm_suggestion", start_pos, end_pos)
+        self.mark_llm_suggestions([suggestion])
+    
+    def mark_llm_suggestions(self, suggestions):
+        """Marca as sugestões do LLM na transcrição, localizando as palavras pelo tempo"""
+        if self.word_timeline is None:
+            return
+        spans = []
+        for suggestion in suggestions:
+            text_to_find = suggestion['text']
+            try:
+                start_time = float(suggestion['start_time']) if suggestion.get('start_time') not in (None, '') else None
+                end_time = float(suggestion['end_time']) if suggestion.get('end_time') not in (None, '') else None
+            except (TypeError, ValueError):
+                start_time = end_time = None
+            word_range = self.word_timeline.find_text(text_to_find, start_time, end_time)
+            if word_range is None:
+                continue
+            first, last = word_range
+            spans.append(word_range)
             
             # Adicionar à lista de segmentos marcados
             segment = {
                 'type': 'llm_suggestion',
                 'text': text_to_find,
-                'start': float(suggestion.get('start_time', 0)),
-                'end': float(suggestion.get('end_time', 0)),
-                'reason': suggestion.get('reason', 'Sugestão do LLM')
+                'start': start_time if start_time is not None else self.word_timeline.starts[first],
+                'end': end_time if end_time is not None else self.word_timeline.ends[last],
+                'reason': suggestion.get('reason', 'Sugestão do LLM'),
+                'first_word': first,
+                'last_word': last
             }
             self.marked_segments.append(segment)
-            self.update_cuts_count()
+        
+        self.tag_word_spans("llm_suggestion", spans)
+        self.update_cuts_count()
     
     def clear_all_marks(self):
         """Limpa todas as marcações"""
-        self.transcription_text.tag_remove("error", 1.0, tk.END)
-        self.transcription_text.tag_remove("marked", 1.0, tk.END)
-        self.transcription_text.tag_remove("llm_suggestion", 1.0, tk.END)
+        self.transcript_view.clear_marks("error", "marked", "llm_suggestion")
         
         self.error_segments.clear()
         self.marked_segments.clear()
@@ -3266,7 +2716,7 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
                     messagebox.showerror("Erro", "API Key da OpenAI não configurada")
                     return False
                 
-                client = openai.OpenAI(api_key=self.api_keys["openai"])
+                client = providers.load("openai").OpenAI(api_key=self.api_keys["openai"])
                 response = client.models.list()
                 self.available_models["openai"] = [model.id for model in response.data if "gpt" in model.id]
                 self.log_message(f"OpenAI conectada! Modelos disponíveis: {len(self.available_models['openai'])}", "SUCCESS")
@@ -3278,6 +2728,7 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
                     messagebox.showerror("Erro", "API Key do Google Gemini não configurada")
                     return False
                 
+                genai = providers.load("gemini")
                 genai.configure(api_key=self.api_keys["gemini"])
                 models = genai.list_models()
                 self.available_models["gemini"] = [model.name for model in models if "gemini" in model.name]
@@ -3347,32 +2798,25 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
             self.update_command()
     
     def log_message(self, message, level="INFO"):
-        """Adiciona mensagem ao console com timestamp"""
+        """Adiciona mensagem ao console com timestamp (de qualquer thread, via barramento de UI)"""
+        if self.session_log:
+            # Registro completo no arquivo; mensagens grandes viram artefato e só a referência vai ao console
+            message = self.session_log.record(message, level)
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        
-        # Cores por nível
-        colors = {
-            "INFO": "black",
-            "SUCCESS": "green",
-            "WARNING": "orange",
-            "ERROR": "red"
-        }
-        
-        color = colors.get(level, "black")
-        formatted_message = f"[{timestamp}] {message}\n"
-        
-        # Adicionar ao console
-        self.console_text.insert(tk.END, formatted_message)
+        self.ui_bus.emit("log", (f"[{timestamp}] {message}\n", level))
+    
+    def write_log_entries(self, entries):
+        """Insere um lote de mensagens no console com uma única chamada ao Tk"""
+        args = []
+        for text, level in entries:
+            args.extend((text, level))
+        self.console_text.insert(tk.END, *args)
+        
+        # Buffer circular: manter só as últimas CONSOLE_MAX_LINES linhas
+        line_count = int(self.console_text.index("end-1c").split('.')[0])
+        if line_count > CONSOLE_MAX_LINES:
+            self.console_text.delete("1.0", f"{line_count - CONSOLE_MAX_LINES + 1}.0")
         self.console_text.see(tk.END)
-        
-        # Configurar cor
-        start_pos = f"{self.console_text.index(tk.END).split('.')[0]}.0"
-        end_pos = self.console_text.index(tk.END)
-        self.console_text.tag_add(level, start_pos, end_pos)
-        self.console_text.tag_config(level, foreground=color)
-        
-        # Forçar atualização
-        self.console_text.update_idletasks()
     
     def log_memory_usage(self, stage=""):
         """Registra uso de memória"""
@@ -3401,310 +2845,137 @@ Analise cuidadosamente e forneça apenas sugestões relevantes que realmente mel
     
     def load_api_keys(self):
         """Carrega as chaves de API salvas"""
-        config_file = "api_config.json"
-        default_config = {
-            "openai": "",
-            "gemini": "",
-            "last_provider": "openai",
-            "last_model": "gpt-4o"
-        }
-        
-        try:
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    # Garantir que todas as chaves existam
-                    for key in default_config:
-                        if key not in config:
-                            config[key] = default_config[key]
-                    return config
-            else:
-                return default_config
-        except Exception as e:
-            print(f"Erro ao carregar configurações: {e}")
-            return default_config
+        return load_api_keys("api_config.json")
 
     def start_simple_edit(self):
         """Executa o pipeline do modo Edição Simples"""
-        import threading
+        job = self.job_from_gui("simple")
+        if job is None:
+            return
         def worker():
             try:
-                self.config_status_label.config(text="Analisando clipes de fala...", foreground='blue')
-                self.log_message("Executando auto-editor para análise de silêncio...", "INFO")
-                video = self.input_file.get()
-                output = self.output_file.get()
-                cut_style = self.simple_cut_style.get()
-                # Mapear cut_style para parâmetros
-                margin = round(0.1 + (cut_style-1)*0.1, 2)  # 0.1 a 0.5
-                threshold = round(0.04 + (cut_style-1)*0.01, 2)  # 0.04 a 0.08
-                # 1. Análise dos clipes
-                json_path = tempfile.mktemp(suffix="_ae.json")
-                cmd = ["auto-editor", video, "-m", str(margin), "--edit", "audio", "--silent-threshold", str(threshold), "--export", "json", "-o", json_path]
-                self.log_message(f"Comando: {' '.join(map(str,cmd))}", "INFO")
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    self.config_status_label.config(text="Erro ao analisar clipes de fala.", foreground='red')
-                    self.log_message(result.stderr, "ERROR")
-                    return
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                playlist = []
-                for clip in data.get('chunks', []):
-                    playlist.append({'start': clip['start'], 'end': clip['end']})
-                self.log_message(f"Playlist com {len(playlist)} clipes gerada.", "SUCCESS")
-                # 2. Renderização
-                if self.simple_jcut_enabled.get():
-                    self.config_status_label.config(text="Renderizando com J-Cut...", foreground='blue')
-                    self.engine_jcut(playlist, self.simple_jcut_duration.get(), video, output)
-                else:
-                    self.config_status_label.config(text="Renderizando vídeo final...", foreground='blue')
-                    # Montar comando auto-editor para renderização direta
-                    addins = []
-                    for clip in playlist:
-                        addins.extend(["--add-in", f"{clip['start']}-{clip['end']}"])
-                    cmd2 = ["auto-editor", video, "--edit", "all/e"] + addins + ["-o", output]
-                    self.log_message(f"Comando: {' '.join(map(str,cmd2))}", "INFO")
-                    result2 = subprocess.run(cmd2, capture_output=True, text=True)
-                    if result2.returncode != 0:
-                        self.config_status_label.config(text="Erro na renderização.", foreground='red')
-                        self.log_message(result2.stderr, "ERROR")
-                        return
-                self.config_status_label.config(text="Edição Simples concluída!", foreground='green')
-                self.log_message("Edição Simples finalizada com sucesso!", "SUCCESS")
+                self.pipeline.run_simple(job)
+            except Cancelled:
+                self.set_config_status("Edição cancelada", 'orange')
             except Exception as e:
-                self.config_status_label.config(text=f"Erro: {e}", foreground='red')
+                self.set_config_status(f"Erro: {e}", 'red')
                 self.log_message(str(e), "ERROR")
         threading.Thread(target=worker, daemon=True).start()
 
-    def engine_jcut(self, playlist, jcut_duration, input_video, output_video):
-        """Engine modular de J-Cut: sobrepõe áudio entre clipes usando ffmpeg avançado"""
-        import tempfile, shutil
-        import os
-        import subprocess
-        temp_dir = tempfile.mkdtemp(prefix="jcut_")
-        temp_clips = []
-        try:
-            self.log_message(f"Iniciando engine J-Cut com {len(playlist)} clipes...", "INFO")
-            jd = float(jcut_duration)
-            # 4.1. Loop principal de geração de clipes com transição
-            for i in range(len(playlist)-1):
-                start_i = playlist[i]['start']
-                end_i = playlist[i]['end']
-                start_next = playlist[i+1]['start']
-                # Calcula limites para trims
-                end_i_menos_jd = max(start_i, end_i - jd)
-                start_next_mais_jd = start_next + jd
-                out_path = os.path.join(temp_dir, f"temp_clip_{i:03d}.mp4")
-                filter_complex = (
-                    f"[0:v]trim=start={start_i}:end={end_i},setpts=PTS-STARTPTS[v_out]; "
-                    f"[0:a]atrim=start={start_i}:end={end_i_menos_jd},asetpts=PTS-STARTPTS[a_part1]; "
-                    f"[0:a]atrim=start={start_next}:end={start_next_mais_jd},asetpts=PTS-STARTPTS[a_part2]; "
-                    f"[a_part1][a_part2]concat=n=2:v=0:a=1[a_out]"
-                )
-                cmd = [
-                    "ffmpeg", "-y", "-i", input_video,
-                    "-filter_complex", filter_complex,
-                    "-map", "[v_out]", "-map", "[a_out]",
-                    "-c:v", "libx264", "-c:a", "aac", out_path
-                ]
-                self.log_message(f"J-Cut ffmpeg: {' '.join(map(str,cmd))}", "INFO")
-                subprocess.run(cmd, capture_output=True)
-                temp_clips.append(out_path)
-            # 4.2. Último clipe (sem transição)
-            last = playlist[-1]
-            last_path = os.path.join(temp_dir, f"temp_clip_{len(playlist)-1:03d}.mp4")
-            cmd_last = [
-                "ffmpeg", "-y", "-i", input_video,
-                "-ss", str(last['start']), "-to", str(last['end']),
-                "-c:v", "libx264", "-c:a", "aac", last_path
-            ]
-            self.log_message(f"Último clipe ffmpeg: {' '.join(map(str,cmd_last))}", "INFO")
-            subprocess.run(cmd_last, capture_output=True)
-            temp_clips.append(last_path)
-            # 4.3. Consolidação
-            concat_list = os.path.join(temp_dir, "filelist.txt")
-            with open(concat_list, 'w') as f:
-                for c in temp_clips:
-                    f.write(f"file '{c}'\n")
-            cmd_concat = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_list, "-c", "copy", output_video]
-            self.log_message(f"Concat ffmpeg: {' '.join(map(str,cmd_concat))}", "INFO")
-            subprocess.run(cmd_concat, capture_output=True)
-            self.config_status_label.config(text="J-Cut concluído!", foreground='green')
-            self.log_message("J-Cut finalizado com sucesso!", "SUCCESS")
-        except Exception as e:
-            self.config_status_label.config(text=f"Erro no J-Cut: {e}", foreground='red')
-            self.log_message(str(e), "ERROR")
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
     def start_auto_magic_edit(self):
         """Executa o pipeline do modo Edição Automágica (com IA Completa)"""
-        import threading
+        if not WHISPER_AVAILABLE and self.whisper_mode.get() == "local":
+            self.set_config_status("Whisper não disponível.", 'red')
+            self.log_message("Whisper não instalado.", "ERROR")
+            return
+        job = self.job_from_gui("auto_magic")
+        if job is None:
+            return
+        whisper_result = self.whisper_result
         def worker():
             try:
-                self.config_status_label.config(text="Iniciando pipeline IA...", foreground='blue')
-                self.log_message("Iniciando pipeline Automágico...", "INFO")
-                video = self.input_file.get()
-                output = self.output_file.get()
-                cut_style = self.magic_cut_style.get()
-                conciseness = self.magic_conciseness.get()
-                # Mapear sliders para parâmetros concretos
-                margin = round(0.1 + (cut_style-1)*0.1, 2)  # 0.1 a 0.5
-                threshold = round(0.04 + (cut_style-1)*0.01, 2)  # 0.04 a 0.08
-                # 1. Análise de Silêncio
-                self.config_status_label.config(text="Analisando silêncio...", foreground='blue')
-                json_path = tempfile.mktemp(suffix="_ae.json")
-                cmd = ["auto-editor", video, "-m", str(margin), "--edit", "audio", "--silent-threshold", str(threshold), "--export", "json", "-o", json_path]
-                self.log_message(f"Comando: {' '.join(map(str,cmd))}", "INFO")
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    self.config_status_label.config(text="Erro na análise de silêncio.", foreground='red')
-                    self.log_message(result.stderr, "ERROR")
-                    return
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                speech_chunks = data.get('chunks', [])
-                self.log_message(f"{len(speech_chunks)} clipes de fala detectados.", "SUCCESS")
-                # 2. Transcrição com Whisper
-                self.config_status_label.config(text="Transcrevendo áudio...", foreground='blue')
-                if not WHISPER_AVAILABLE:
-                    self.config_status_label.config(text="Whisper não disponível.", foreground='red')
-                    self.log_message("Whisper não instalado.", "ERROR")
-                    return
-                if not hasattr(self, 'whisper_result') or self.whisper_result is None:
-                    # Extrair áudio temporário
-                    audio_path = tempfile.mktemp(suffix="_audio.mp3")
-                    cmd_audio = ["ffmpeg", "-y", "-i", video, "-vn", "-acodec", "mp3", audio_path]
-                    subprocess.run(cmd_audio, capture_output=True)
-                    model = whisper.load_model(self.whisper_model.get())
-                    self.whisper_result = model.transcribe(audio_path, fp16=self.use_gpu.get())
-                transcription = self.whisper_result.get('text', '')
-                segments = self.whisper_result.get('segments', [])
-                # 3. Análise de Erros (LLM Pass 1)
-                self.config_status_label.config(text="Analisando erros de fala (LLM Pass 1)...", foreground='blue')
-                rigor_prompt = f"Remova erros de fala, hesitações e repetições. Seja rigoroso nível {conciseness}/5. Retorne apenas os timestamps dos erros."  # Exemplo
-                error_timestamps = self.llm_analyze_errors(transcription, segments, rigor_prompt)
-                # 4. Análise de Narrativa (LLM Pass 2)
-                self.config_status_label.config(text="Analisando narrativa (LLM Pass 2)...", foreground='blue')
-                conciseness_prompt = f"Reorganize e resuma o texto para um vídeo mais enxuto (nível {conciseness}/5). Retorne a playlist final (start/end) e clipes a excluir."  # Exemplo
-                playlist, to_exclude = self.llm_analyze_narrative(transcription, segments, conciseness_prompt)
-                # 5. Renderização
-                if self.magic_jcut_enabled.get():
-                    self.config_status_label.config(text="Renderizando com J-Cut...", foreground='blue')
-                    self.engine_jcut(playlist, self.magic_jcut_duration.get(), video, output)
-                else:
-                    self.config_status_label.config(text="Renderizando vídeo final...", foreground='blue')
-                    # Exportar clipes na ordem da playlist
-                    addins = []
-                    for clip in playlist:
-                        addins.extend(["--add-in", f"{clip['start']}-{clip['end']}"])
-                    cmd2 = ["auto-editor", video, "--edit", "all/e"] + addins + ["-o", output]
-                    self.log_message(f"Comando: {' '.join(map(str,cmd2))}", "INFO")
-                    result2 = subprocess.run(cmd2, capture_output=True, text=True)
-                    if result2.returncode != 0:
-                        self.config_status_label.config(text="Erro na renderização.", foreground='red')
-                        self.log_message(result2.stderr, "ERROR")
-                        return
-                self.config_status_label.config(text="Edição Automágica concluída!", foreground='green')
-                self.log_message("Edição Automágica finalizada com sucesso!", "SUCCESS")
+                self.whisper_result = self.pipeline.run_magic(job, whisper_result=whisper_result)
+            except Cancelled:
+                self.set_config_status("Edição cancelada", 'orange')
             except Exception as e:
-                self.config_status_label.config(text=f"Erro: {e}", foreground='red')
+                self.set_config_status(f"Erro: {e}", 'red')
                 self.log_message(str(e), "ERROR")
         threading.Thread(target=worker, daemon=True).start()
 
-    def llm_analyze_errors(self, transcription, segments, prompt):
-        """Chama o LLM para análise de erros de fala. Retorna lista de timestamps."""
-        try:
-            self.log_message("Chamando LLM para análise de erros de fala...", "INFO")
-            if OPENAI_AVAILABLE and self.selected_llm_provider.get() == "openai":
-                response = openai.ChatCompletion.create(
-                    model=self.selected_llm_model.get(),
-                    messages=[{"role": "system", "content": prompt}, {"role": "user", "content": transcription}]
-                )
-                content = response['choices'][0]['message']['content']
-                self.log_message(f"Resposta LLM: {content}", "INFO")
-                try:
-                    # Espera-se que o LLM retorne JSON: {"errors": [{"start":..., "end":...}, ...]}
-                    import json as _json
-                    parsed = _json.loads(content)
-                    return parsed.get('errors', [])
-                except Exception:
-                    self.log_message("Resposta do LLM não é JSON. Retornando vazio.", "WARNING")
-                    return []
-            elif GEMINI_AVAILABLE and self.selected_llm_provider.get() == "gemini":
-                response = genai.generate_content(prompt + "\n" + transcription)
-                content = response.text
-                self.log_message(f"Resposta Gemini: {content}", "INFO")
-                try:
-                    import json as _json
-                    parsed = _json.loads(content)
-                    return parsed.get('errors', [])
-                except Exception:
-                    self.log_message("Resposta do Gemini não é JSON. Retornando vazio.", "WARNING")
-                    return []
-            else:
-                self.log_message("Nenhum LLM disponível. Retornando lista vazia.", "WARNING")
-                return []
-        except Exception as e:
-            self.log_message(f"Erro ao chamar LLM: {e}", "ERROR")
-            return []
+    def start_preview(self, mode):
+        """Renderiza a prévia em baixa resolução do modo; libera o botão da versão final"""
+        if mode == "auto_magic" and not WHISPER_AVAILABLE and self.whisper_mode.get() == "local":
+            self.set_config_status("Whisper não disponível.", 'red')
+            self.log_message("Whisper não instalado.", "ERROR")
+            return
+        job = self.job_from_gui(mode)
+        if job is None:
+            return
+        whisper_result = self.whisper_result if mode == "auto_magic" else None
+        final_button = self.magic_final_button if mode == "auto_magic" else self.simple_final_button
+        self.set_widget(self.magic_final_button, state='disabled')
+        self.set_widget(self.simple_final_button, state='disabled')
+        def worker():
+            try:
+                edl = self.pipeline.preview(job, whisper_result=whisper_result)
+                self.set_config_status(f"Prévia pronta: {edl['preview']}", 'green')
+                self.set_widget(final_button, state='normal')
+            except Cancelled:
+                self.set_config_status("Prévia cancelada", 'orange')
+            except Exception as e:
+                self.set_config_status(f"Erro: {e}", 'red')
+                self.log_message(str(e), "ERROR")
+        threading.Thread(target=worker, daemon=True).start()
 
-    def llm_analyze_narrative(self, transcription, segments, prompt):
-        """Chama o LLM para análise de narrativa. Retorna playlist e clipes a excluir."""
+    def start_final_render(self):
+        """Renderiza a versão final reaproveitando a EDL da última prévia (sem nova análise)"""
+        edl = self.pipeline.last_edl
+        if edl is None:
+            self.set_config_status("Gere a prévia antes da versão final.", 'red')
+            return
+        def worker():
+            try:
+                output = self.pipeline.render_final(edl)
+                self.set_config_status(f"Versão final pronta: {output}", 'green')
+            except Cancelled:
+                self.set_config_status("Renderização cancelada", 'orange')
+            except Exception as e:
+                self.set_config_status(f"Erro: {e}", 'red')
+                self.log_message(str(e), "ERROR")
+        threading.Thread(target=worker, daemon=True).start()
+
+    def job_from_gui(self, mode):
+        """Job dos controles da GUI, ou None com o erro no status se a entrada for inválida"""
         try:
-            self.log_message("Chamando LLM para análise de narrativa...", "INFO")
-            if OPENAI_AVAILABLE and self.selected_llm_provider.get() == "openai":
-                response = openai.ChatCompletion.create(
-                    model=self.selected_llm_model.get(),
-                    messages=[{"role": "system", "content": prompt}, {"role": "user", "content": transcription}]
-                )
-                content = response['choices'][0]['message']['content']
-                self.log_message(f"Resposta LLM: {content}", "INFO")
-                try:
-                    import json as _json
-                    parsed = _json.loads(content)
-                    playlist = parsed.get('playlist', [])
-                    to_exclude = parsed.get('to_exclude', [])
-                    return playlist, to_exclude
-                except Exception:
-                    self.log_message("Resposta do LLM não é JSON. Usando playlist padrão.", "WARNING")
-                    playlist = []
-                    for seg in segments:
-                        playlist.append({'start': seg['start'], 'end': seg['end']})
-                    to_exclude = []
-                    return playlist, to_exclude
-            elif GEMINI_AVAILABLE and self.selected_llm_provider.get() == "gemini":
-                response = genai.generate_content(prompt + "\n" + transcription)
-                content = response.text
-                self.log_message(f"Resposta Gemini: {content}", "INFO")
-                try:
-                    import json as _json
-                    parsed = _json.loads(content)
-                    playlist = parsed.get('playlist', [])
-                    to_exclude = parsed.get('to_exclude', [])
-                    return playlist, to_exclude
-                except Exception:
-                    self.log_message("Resposta do Gemini não é JSON. Usando playlist padrão.", "WARNING")
-                    playlist = []
-                    for seg in segments:
-                        playlist.append({'start': seg['start'], 'end': seg['end']})
-                    to_exclude = []
-                    return playlist, to_exclude
-            else:
-                self.log_message("Nenhum LLM disponível. Retornando playlist padrão.", "WARNING")
-                playlist = []
-                for seg in segments:
-                    playlist.append({'start': seg['start'], 'end': seg['end']})
-                to_exclude = []
-                return playlist, to_exclude
-        except Exception as e:
-            self.log_message(f"Erro ao chamar LLM: {e}", "ERROR")
-            playlist = []
-            for seg in segments:
-                playlist.append({'start': seg['start'], 'end': seg['end']})
-            to_exclude = []
-            return playlist, to_exclude
+            return self.build_job_from_gui(mode)
+        except ValueError as e:
+            self.set_config_status(f"Erro: {e}", 'red')
+            return None
+
+    def build_job_from_gui(self, mode):
+        """Monta um job do pipeline headless a partir dos controles da GUI"""
+        if mode == "auto_magic":
+            job = {
+                "mode": "magic",
+                "cut_style": self.magic_cut_style.get(),
+                "conciseness": self.magic_conciseness.get(),
+                "jcut": self.magic_jcut_enabled.get(),
+                "jcut_duration": self.magic_jcut_duration.get(),
+            }
+        else:
+            job = {
+                "mode": "simple",
+                "cut_style": self.simple_cut_style.get(),
+                "jcut": self.simple_jcut_enabled.get(),
+                "jcut_duration": self.simple_jcut_duration.get(),
+            }
+        job.update({
+            "input": self.input_file.get(),
+            "output": self.output_file.get(),
+            "cut_type": self.cut_type.get(),
+            "whisper_mode": self.whisper_mode.get(),
+            "whisper_model": self.whisper_model.get(),
+            "use_gpu": self.use_gpu.get(),
+            "llm_provider": self.selected_llm_provider.get(),
+            "llm_model": self.selected_llm_model.get(),
+        })
+        return build_job(job)
+
+    def set_config_status(self, text, color='blue'):
+        """Atualiza o indicador de status da aba de configurações"""
+        self.set_widget(self.config_status_label, text=text, foreground=color)
+
+    def on_pipeline_progress(self, snapshot):
+        """Callback de progresso do pipeline (chamado de threads de trabalho)"""
+        self.ui_bus.call(self.show_pipeline_progress, snapshot, key="pipeline_progress")
+
+    def show_pipeline_progress(self, snapshot):
+        self.pipeline_progress_var.set(snapshot["percent"])
+        self.pipeline_progress_label.config(text=format_progress(snapshot))
 
+    def set_widget(self, widget, **options):
+        """Configura um widget pelo barramento de UI (seguro em threads; só o último valor do quadro vale)"""
+        self.ui_bus.call(widget.config, key=(str(widget), tuple(sorted(options))), **options)
 def main():
     """Função principal"""
     root = tk.Tk()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Fila de lote - edita vários vídeos em paralelo com um pool de processos
+
+Cada vídeo vira um job do pipeline headless (`pipeline.EditingPipeline`),
+executado em um processo próprio. A concorrência é dividida entre os núcleos:
+`workers` jobs simultâneos, cada um com `threads` threads para ffmpeg/x264 e
+torch, de forma que workers × threads ≈ núcleos da máquina. Dentro de um job,
+os ffmpeg em paralelo (clipes do J-Cut, partes da renderização inteligente)
+dividem essas mesmas threads: no máximo `threads // MIN_THREADS_PER_PROCESS`
+processos por vez. O Whisper local,
+que usa todos os núcleos e bastante RAM, tem um limite próprio de execuções
+simultâneas (`whisper_slots`).
+"""
+
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+from pipeline import EditingPipeline, build_job, default_log, load_api_keys
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".wmv", ".flv", ".webm")
+
+# Threads por job quando nada é informado: o x264 escala bem até ~4 threads por
+# vídeo 1080p; acima disso é mais eficiente rodar mais jobs em paralelo.
+DEFAULT_THREADS_PER_JOB = 4
+# Threads mínimas de cada ffmpeg paralelo dentro de um job
+MIN_THREADS_PER_PROCESS = 2
+
+STATUS_LABELS = {
+    "queued": "na fila",
+    "running": "executando",
+    "done": "concluído",
+    "failed": "falhou",
+}
+
+# Estado global dos processos do pool (definido por _init_worker)
+_WHISPER_SLOTS = None
+_EVENTS = None
+
+
+def collect_inputs(paths, recursive=False):
+    """Expande arquivos e diretórios em uma lista ordenada de vídeos"""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            if recursive:
+                for root, _dirs, files in os.walk(path):
+                    inputs.extend(os.path.join(root, name) for name in files)
+            else:
+                inputs.extend(os.path.join(path, name) for name in os.listdir(path))
+        else:
+            inputs.append(path)
+    return sorted(p for p in inputs if os.path.isfile(p) and p.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def plan_concurrency(workers=None, threads_per_job=None, cpu_count=None):
+    """Divide os núcleos entre jobs simultâneos e threads por job"""
+    cores = cpu_count or os.cpu_count() or 1
+    if workers and not threads_per_job:
+        threads_per_job = max(1, cores // workers)
+    threads_per_job = threads_per_job or min(DEFAULT_THREADS_PER_JOB, cores)
+    if not workers:
+        workers = max(1, cores // threads_per_job)
+    return workers, threads_per_job
+
+
+def processes_per_job(threads_per_job):
+    """ffmpeg simultâneos de um job, para que juntos usem só as threads do job"""
+    return max(1, threads_per_job // MIN_THREADS_PER_PROCESS)
+
+
+def output_path_for(input_path, output_dir=None):
+    """Nome de saída padrão de um vídeo do lote"""
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    directory = output_dir or os.path.dirname(input_path)
+    return os.path.join(directory, f"{base_name}_edited.mp4")
+
+
+def _init_worker(threads, whisper_slots, events):
+    """Inicializa um processo do pool: limita threads e guarda os objetos compartilhados"""
+    global _WHISPER_SLOTS, _EVENTS
+    # Vale para o torch do Whisper local, que é importado sob demanda depois daqui
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    _WHISPER_SLOTS = whisper_slots
+    _EVENTS = events
+
+
+def _run_job(index, job, api_keys, max_processes):
+    """Executa um job dentro de um processo do pool e devolve a duração"""
+    _EVENTS.put((index, "running", time.time()))
+    name = os.path.basename(job["input"])
+
+    def log(message, level="INFO"):
+        default_log(f"[{name}] {message}", level)
+
+    pipeline = EditingPipeline(api_keys=api_keys, log=log, whisper_slots=_WHISPER_SLOTS,
+                               max_processes=max_processes)
+    started = time.time()
+    pipeline.run_job(job)
+    return time.time() - started
+
+
+class BatchQueue:
+    """Fila de jobs processada por um pool de processos"""
+
+    def __init__(self, jobs, workers=None, threads_per_job=None, whisper_slots=1,
+                 api_keys=None, log=None, on_update=None):
+        self.workers, self.threads_per_job = plan_concurrency(workers, threads_per_job)
+        self.max_processes = processes_per_job(self.threads_per_job)
+        self.whisper_slots = max(1, whisper_slots)
+        self.api_keys = api_keys if api_keys is not None else load_api_keys()
+        self.log = log or default_log
+        self.on_update = on_update
+        self.jobs = []
+        for job in jobs:
+            job = build_job(job)
+            job["threads"] = self.threads_per_job
+            self.jobs.append({
+                "job": job,
+                "status": "queued",
+                "started": None,
+                "seconds": None,
+                "error": None,
+            })
+
+    def _set_status(self, index, status, **fields):
+        entry = self.jobs[index]
+        entry["status"] = status
+        entry.update(fields)
+        label = STATUS_LABELS[status]
+        level = {"done": "SUCCESS", "failed": "ERROR"}.get(status, "INFO")
+        self.log(f"[{index + 1}/{len(self.jobs)}] {os.path.basename(entry['job']['input'])}: {label}", level)
+        if self.on_update:
+            self.on_update(index, entry)
+
+    def _drain_events(self, events):
+        try:
+            while True:
+                index, status, timestamp = events.get_nowait()
+                # O evento pode chegar depois do resultado; não regredir um job já finalizado
+                if self.jobs[index]["status"] == "queued":
+                    self._set_status(index, status, started=timestamp)
+        except queue.Empty:
+            pass
+
+    def run(self):
+        """Processa todos os jobs e devolve o relatório resumido"""
+        self.log(f"Lote com {len(self.jobs)} vídeos: {self.workers} jobs simultâneos × "
+                 f"{self.threads_per_job} threads ({self.max_processes} ffmpeg por job), "
+                 f"Whisper local limitado a {self.whisper_slots}", "INFO")
+        started = time.time()
+        events = multiprocessing.Queue()
+        whisper_slots = multiprocessing.Semaphore(self.whisper_slots)
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.threads_per_job, whisper_slots, events),
+        ) as executor:
+            futures = {
+                executor.submit(_run_job, index, entry["job"], self.api_keys, self.max_processes): index
+                for index, entry in enumerate(self.jobs)
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=0.5)
+                self._drain_events(events)
+                for future in done:
+                    index = futures[future]
+                    try:
+                        self._set_status(index, "done", seconds=future.result())
+                    except Exception as e:
+                        self._set_status(index, "failed", error=str(e))
+
+        return self.report(time.time() - started)
+
+    def report(self, elapsed):
+        """Monta o relatório do lote"""
+        counts = {status: 0 for status in STATUS_LABELS}
+        for entry in self.jobs:
+            counts[entry["status"]] += 1
+        return {
+            "total": len(self.jobs),
+            "succeeded": counts["done"],
+            "failed": counts["failed"],
+            "elapsed_seconds": round(elapsed, 2),
+            "workers": self.workers,
+            "threads_per_job": self.threads_per_job,
+            "jobs": [
+                {
+                    "input": entry["job"]["input"],
+                    "output": entry["job"]["output"],
+                    "mode": entry["job"]["mode"],
+                    "status": entry["status"],
+                    "seconds": round(entry["seconds"], 2) if entry["seconds"] is not None else None,
+                    "error": entry["error"],
+                }
+                for entry in self.jobs
+            ],
+        }
+
+
+def format_report(report):
+    """Texto resumido do relatório para o terminal"""
+    lines = [f"{'Status':<12} {'Tempo (s)':>10}  Arquivo"]
+    for job in report["jobs"]:
+        seconds = f"{job['seconds']:.1f}" if job["seconds"] is not None else "-"
+        lines.append(f"{STATUS_LABELS[job['status']]:<12} {seconds:>10}  {job['input']}")
+        if job["error"]:
+            lines.append(f"{'':<12} {'':>10}  ↳ {job['error']}")
+    lines.append(f"\n{report['succeeded']}/{report['total']} concluídos, {report['failed']} falharam "
+                 f"em {report['elapsed_seconds']:.1f} s")
+    return "\n".join(lines)
+
+
+def write_report(report, path):
+    """Salva o relatório do lote em JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extração de áudio - tempo e tamanho por formato
+
+Compara a extração antiga (MP3 `libmp3lame -q:a 2`, estéreo na taxa original)
+com os formatos de fala de `pipeline.extract_audio`: WAV 16 kHz mono (Whisper
+local) e Ogg/Opus 16 kHz mono (envio para a API).
+
+Uso:
+    python3 benchmarks/audio_extraction.py gravacao_1h.mp4 [--runs 3] [--json resultado.json]
+    python3 benchmarks/audio_extraction.py --generate gravacao_1h.mp4   # cria 1 h sintética antes
+
+Requer ffmpeg no PATH.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import AUDIO_FORMATS, SPEECH_SAMPLE_RATE  # noqa: E402
+
+# Extração anterior, mantida aqui apenas como referência de comparação
+LEGACY_MP3 = {"suffix": ".mp3", "args": ["-vn", "-c:a", "libmp3lame", "-q:a", "2"]}
+
+
+def extraction_modes():
+    modes = {"mp3 (antigo)": LEGACY_MP3}
+    for name, settings in AUDIO_FORMATS.items():
+        modes[name] = {
+            "suffix": settings["suffix"],
+            "args": ["-map", "0:a:0", "-vn", "-sn", "-dn", "-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE),
+                     *settings["codec"]],
+        }
+    return modes
+
+
+def generate_recording(path, seconds=3600):
+    """Gera uma gravação sintética (vídeo 720p estático + áudio com ruído e tom)"""
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "lavfi", "-i", f"color=c=gray:size=1280x720:rate=30:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=48000:duration={seconds}",
+        "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.05:sample_rate=48000:duration={seconds}",
+        "-filter_complex", "[1:a][2:a]amix=inputs=2,aformat=channel_layouts=stereo[a]",
+        "-map", "0:v", "-map", "[a]",
+        "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-b:a", "192k",
+        path,
+    ]
+    print(f"Gerando gravação sintética de {seconds} s em {path}...", file=sys.stderr)
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+def measure(video, settings):
+    """Extrai o áudio uma vez e devolve (segundos, bytes)"""
+    fd, output = tempfile.mkstemp(suffix=settings["suffix"])
+    os.close(fd)
+    try:
+        cmd = ["ffmpeg", "-y", "-i", video, *settings["args"], output]
+        started = time.time()
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        elapsed = time.time() - started
+        if result.returncode != 0:
+            raise RuntimeError(f"Falha no ffmpeg: {result.stderr.strip()[-500:]}")
+        return elapsed, os.path.getsize(output)
+    finally:
+        os.remove(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara tempo e tamanho da extração de áudio")
+    parser.add_argument("video", help="Gravação de teste (idealmente com 1 hora)")
+    parser.add_argument("--generate", action="store_true", help="Gerar uma gravação sintética de 1 h neste caminho")
+    parser.add_argument("--runs", type=int, default=3, help="Execuções por formato (padrão: 3)")
+    parser.add_argument("--json", help="Salvar resultados neste arquivo JSON")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_recording(args.video)
+
+    report = {}
+    for name, settings in extraction_modes().items():
+        samples = [measure(args.video, settings) for _ in range(args.runs)]
+        report[name] = {
+            "seconds_median": statistics.median(seconds for seconds, _size in samples),
+            "size_mb": samples[-1][1] / 1024 / 1024,
+        }
+
+    print(f"{'Formato':<14} {'Tempo (s)':>10} {'Tamanho (MB)':>13}")
+    for name, row in report.items():
+        print(f"{name:<14} {row['seconds_median']:>10.2f} {row['size_mb']:>13.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos perfis de codificação - velocidade e tamanho por perfil
+
+Codifica o clipe de referência com cada perfil de `encode_profiles` como o
+J-Cut clipe a clipe faria (o "preview" com resolução e fps reduzidos): perfis com intermediários "direct" fazem uma
+única codificação; perfis "lossless" gravam o intermediário sem perdas e
+depois fazem a codificação final. Informa o tempo total, a velocidade (x
+tempo real) e o tamanho do arquivo final.
+
+Uso:
+    python3 benchmarks/encode_profiles.py referencia.mp4 [--runs 3] [--json resultado.json]
+    python3 benchmarks/encode_profiles.py --generate referencia.mp4   # cria 2 min sintéticos antes
+
+Requer ffmpeg e ffprobe no PATH.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encode_profiles  # noqa: E402
+
+
+def generate_reference(path, seconds=120):
+    """Gera um clipe sintético (720p com movimento leve + áudio com ruído e tom)"""
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=48000:duration={seconds}",
+        "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.05:sample_rate=48000:duration={seconds}",
+        "-filter_complex", "[1:a][2:a]amix=inputs=2,aformat=channel_layouts=stereo[a]",
+        "-map", "0:v", "-map", "[a]",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-c:a", "aac", "-b:a", "192k",
+        path,
+    ]
+    print(f"Gerando clipe sintético de {seconds} s em {path}...", file=sys.stderr)
+    subprocess.run(cmd, check=True, capture_output=True)
+
+
+def duration_of(path):
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def ffmpeg(args):
+    result = subprocess.run(["ffmpeg", "-y", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha no ffmpeg: {result.stderr.strip()[-500:]}")
+
+
+def measure(video, profile):
+    """Codifica o clipe uma vez com o perfil e devolve (segundos, bytes do arquivo final)"""
+    temp_dir = tempfile.mkdtemp(prefix="bench_encode_")
+    try:
+        output = os.path.join(temp_dir, "final.mp4")
+        # A prévia reduz resolução e fps já na primeira codificação
+        video_filter = encode_profiles.frame_filter(profile)
+        vf = ["-vf", video_filter] if video_filter else []
+        started = time.time()
+        if encode_profiles.needs_final_encode(profile):
+            args, suffix = encode_profiles.intermediate_args(profile)
+            intermediate = os.path.join(temp_dir, "intermediate" + suffix)
+            ffmpeg(["-i", video, *vf, *args, intermediate])
+            ffmpeg(["-i", intermediate, *encode_profiles.encode_args(profile), output])
+        else:
+            ffmpeg(["-i", video, *vf, *encode_profiles.encode_args(profile), output])
+        elapsed = time.time() - started
+        return elapsed, os.path.getsize(output)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara velocidade e tamanho dos perfis de codificação")
+    parser.add_argument("video", help="Clipe de referência")
+    parser.add_argument("--generate", action="store_true", help="Gerar um clipe sintético de 2 min neste caminho")
+    parser.add_argument("--runs", type=int, default=3, help="Execuções por perfil (padrão: 3)")
+    parser.add_argument("--profiles", nargs="+", choices=list(encode_profiles.PROFILES),
+                        default=list(encode_profiles.PROFILES), help="Perfis medidos (padrão: todos)")
+    parser.add_argument("--json", help="Salvar resultados neste arquivo JSON")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_reference(args.video)
+    media_seconds = duration_of(args.video)
+
+    report = {}
+    for profile in args.profiles:
+        samples = [measure(args.video, profile) for _ in range(args.runs)]
+        seconds = statistics.median(elapsed for elapsed, _size in samples)
+        report[profile] = {
+            "seconds_median": seconds,
+            "speed": media_seconds / seconds if seconds else None,
+            "size_mb": samples[-1][1] / 1024 / 1024,
+            "settings": encode_profiles.get_profile(profile),
+        }
+
+    print(f"{'Perfil':<10} {'Tempo (s)':>10} {'Velocidade':>11} {'Tamanho (MB)':>13}")
+    for profile, row in report.items():
+        print(f"{profile:<10} {row['seconds_median']:>10.2f} {row['speed']:>10.1f}x {row['size_mb']:>13.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
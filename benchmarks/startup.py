@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização - tempo até a primeira janela e RSS
+
+Compara o comportamento antigo (whisper, openai e google.generativeai importados
+no topo do módulo) com o carregamento preguiçoso via `providers`. Cada medição
+roda em um processo Python novo, para que o cache de imports não interfira.
+
+Uso:
+    python3 benchmarks/startup.py [--runs 5] [--json resultado.json]
+
+Requer um display (no Linux sem monitor, use `xvfb-run python3 ...`).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código executado no processo filho; imprime uma linha JSON com as medições
+CHILD_CODE = r"""
+import json, os, sys, time
+sys.path.insert(0, {repo_dir!r})
+mode = {mode!r}
+if mode == "eager":
+    # Reproduz o comportamento anterior: backends importados antes da janela
+    for name in ("whisper", "openai", "google.generativeai"):
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+import tkinter as tk
+import auto_editor_gui
+auto_editor_gui.messagebox.showerror = lambda *args, **kwargs: None
+root = tk.Tk()
+app = auto_editor_gui.AutoEditorGUI(root)
+root.update()
+while not root.winfo_viewable():
+    root.update()
+window_time = time.time()
+try:
+    import psutil
+    rss = psutil.Process().memory_info().rss
+except ImportError:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+loaded = [name for name in ("whisper", "openai", "google.generativeai") if name in sys.modules]
+root.destroy()
+print(json.dumps({{"window_time": window_time, "rss": rss, "loaded": loaded}}))
+"""
+
+
+def measure(mode):
+    """Inicia um processo novo e mede o tempo até a janela aparecer"""
+    code = CHILD_CODE.format(repo_dir=REPO_DIR, mode=mode)
+    started = time.time()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha no modo {mode}: {result.stderr.strip()}")
+
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "seconds": data["window_time"] - started,
+        "rss_mb": data["rss"] / 1024 / 1024,
+        "loaded": data["loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede tempo até a primeira janela e RSS")
+    parser.add_argument("--runs", type=int, default=5, help="Execuções por modo (padrão: 5)")
+    parser.add_argument("--json", help="Salvar resultados neste arquivo JSON")
+    args = parser.parse_args()
+
+    report = {}
+    for mode in ("eager", "lazy"):
+        samples = [measure(mode) for _ in range(args.runs)]
+        report[mode] = {
+            "seconds_median": statistics.median(s["seconds"] for s in samples),
+            "rss_mb_median": statistics.median(s["rss_mb"] for s in samples),
+            "loaded": samples[-1]["loaded"],
+        }
+
+    print(f"{'Modo':<8} {'Janela (s)':>12} {'RSS (MB)':>10}  Backends carregados")
+    for mode, row in report.items():
+        loaded = ", ".join(row["loaded"]) or "-"
+        print(f"{mode:<8} {row['seconds_median']:>12.2f} {row['rss_mb_median']:>10.1f}  {loaded}")
+
+    eager, lazy = report["eager"], report["lazy"]
+    print(f"\nGanho: {eager['seconds_median'] - lazy['seconds_median']:.2f} s e "
+          f"{eager['rss_mb_median'] - lazy['rss_mb_median']:.1f} MB a menos na inicialização")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Cancelamento cooperativo das etapas do pipeline
+
+Um `CancellationToken` é compartilhado por todas as etapas de uma execução.
+Ao cancelar, os callbacks registrados rodam na hora (encerrar grupos de
+processos, fechar clientes HTTP, derrubar workers do Whisper) e as etapas
+que verificam o token levantam `Cancelled`.
+"""
+
+import contextlib
+import itertools
+import threading
+
+
+class Cancelled(RuntimeError):
+    """A operação foi cancelada pelo usuário"""
+
+    def __init__(self, message="Operação cancelada pelo usuário"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """Sinal de cancelamento seguro em threads, com callbacks"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._ids = itertools.count()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancela e executa os callbacks registrados (uma única vez)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Um recurso que já acabou (processo encerrado, cliente fechado) não impede os demais
+                pass
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+    def register(self, callback):
+        """Registra `callback()` para o cancelamento; se já cancelado, executa na hora"""
+        with self._lock:
+            if not self._event.is_set():
+                handle = next(self._ids)
+                self._callbacks[handle] = callback
+                return handle
+        callback()
+        return None
+
+    def unregister(self, handle):
+        if handle is None:
+            return
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    @contextlib.contextmanager
+    def on_cancel(self, callback):
+        """`with token.on_cancel(fn):` — `fn` roda se o token for cancelado dentro do bloco"""
+        handle = self.register(callback)
+        try:
+            yield
+        finally:
+            self.unregister(handle)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Transcrição em blocos alinhados a silêncios
+
+Áudios longos são divididos nos silêncios detectados pelo ffmpeg
+(`silencedetect`) em blocos de duração limitada, transcritos em paralelo e
+depois costurados em um único resultado no formato do Whisper: `words` e
+`segments` com os timestamps deslocados pelo início de cada bloco.
+"""
+
+import concurrent.futures
+import os
+import re
+import tempfile
+
+import process_runner
+
+SILENCE_NOISE_DB = -35        # abaixo disso o áudio é considerado silêncio
+SILENCE_MIN_SECONDS = 0.4     # duração mínima de um silêncio usado como corte
+
+_SILENCE_START_RE = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end: (-?[\d.]+)")
+
+
+def audio_duration(audio_file):
+    """Duração do arquivo em segundos (ffprobe)"""
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", audio_file]
+    result = process_runner.run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"Erro no ffprobe: {result.stderr}")
+    return float(result.stdout.strip())
+
+
+def detect_silences(audio_file, noise_db=SILENCE_NOISE_DB, min_seconds=SILENCE_MIN_SECONDS, token=None):
+    """Lista de silêncios (início, fim) detectados pelo ffmpeg"""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats", "-i", audio_file,
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_seconds}",
+        "-f", "null", "-"
+    ]
+    silences = []
+    pending = {}
+
+    # Os silêncios são lidos do stderr enquanto o ffmpeg roda (áudios de horas geram muitas linhas)
+    def on_line(line):
+        match = _SILENCE_START_RE.search(line)
+        if match:
+            pending["start"] = max(0.0, float(match.group(1)))
+            return
+        match = _SILENCE_END_RE.search(line)
+        if match and "start" in pending:
+            silences.append((pending.pop("start"), float(match.group(1))))
+
+    result = process_runner.run(cmd, on_stderr=on_line, token=token)
+    if result.returncode != 0:
+        raise RuntimeError(f"Erro ao detectar silêncios: {result.stderr}")
+    return silences
+
+
+def plan_chunks(duration, silences, max_seconds):
+    """Divide [0, duração] em blocos de até `max_seconds`, cortando no meio dos silêncios
+
+    Cada corte usa o último silêncio da segunda metade do bloco; sem silêncio
+    ali, o bloco é cortado no limite.
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    chunks = []
+    start = 0.0
+    while duration - start > max_seconds:
+        limit = start + max_seconds
+        candidates = [m for m in midpoints if start + max_seconds / 2 <= m <= limit]
+        cut = candidates[-1] if candidates else limit
+        chunks.append({"index": len(chunks), "start": start, "end": cut})
+        start = cut
+    chunks.append({"index": len(chunks), "start": start, "end": duration})
+    return chunks
+
+
+def split_audio(audio_file, max_seconds, duration=None, token=None):
+    """Planeja os blocos de um arquivo de áudio (sem gravar nada em disco)"""
+    if duration is None:
+        duration = audio_duration(audio_file)
+    if duration <= max_seconds:
+        return [{"index": 0, "start": 0.0, "end": duration}]
+    return plan_chunks(duration, detect_silences(audio_file, token=token), max_seconds)
+
+
+def encode_chunk(audio_file, chunk, codec_args, suffix, token=None):
+    """Grava um bloco do áudio em um arquivo temporário e devolve o caminho"""
+    fd, path = tempfile.mkstemp(prefix=f"temp_chunk_{chunk['index']:04d}_", suffix=suffix)
+    os.close(fd)
+    cmd = [
+        "ffmpeg", "-y", "-ss", str(chunk["start"]), "-t", str(chunk["end"] - chunk["start"]),
+        "-i", audio_file, *codec_args, path
+    ]
+    try:
+        result = process_runner.run(cmd, token=token)
+    except Exception:
+        # Cancelado no meio da gravação: o bloco incompleto não fica no temp
+        os.remove(path)
+        raise
+    if result.returncode != 0:
+        os.remove(path)
+        raise RuntimeError(f"Erro ao gerar bloco {chunk['index']}: {result.stderr}")
+    return path
+
+
+def transcribe_chunks(chunks, transcribe_chunk, workers):
+    """Executa `transcribe_chunk(chunk)` em paralelo e devolve os resultados na ordem dos blocos"""
+    if len(chunks) == 1:
+        return [transcribe_chunk(chunks[0])]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as executor:
+        return list(executor.map(transcribe_chunk, chunks))
+
+
+def _shift(item, offset):
+    shifted = dict(item)
+    for key in ("start", "end"):
+        if shifted.get(key) is not None:
+            shifted[key] = shifted[key] + offset
+    return shifted
+
+
+def merge_transcriptions(chunks, results):
+    """Costura os resultados dos blocos em um único resultado com timestamps absolutos"""
+    words = []
+    segments = []
+    texts = []
+    for chunk, result in zip(chunks, results):
+        offset = chunk["start"]
+        words.extend(_shift(word, offset) for word in result.get("words") or [])
+        for segment in result.get("segments") or []:
+            segment = _shift(segment, offset)
+            segment["id"] = len(segments)
+            if segment.get("words"):
+                segment["words"] = [_shift(word, offset) for word in segment["words"]]
+                # Whisper local guarda as palavras só dentro dos segmentos
+                if not result.get("words"):
+                    words.extend(segment["words"])
+            segments.append(segment)
+        text = (result.get("text") or "").strip()
+        if text:
+            texts.append(text)
+
+    merged = {
+        "text": " ".join(texts),
+        "segments": segments,
+        "words": words,
+        "duration": chunks[-1]["end"] if chunks else 0,
+    }
+    languages = [result.get("language") for result in results if result.get("language")]
+    if languages:
+        merged["language"] = languages[0]
+    return merged
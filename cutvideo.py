@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+cutvideo - linha de comando para os pipelines de edição (sem interface gráfica)
+
+Executa os mesmos pipelines "Edição Simples" e "Edição Automágica" da GUI,
+sem iniciar um interpretador Tk. Útil em nós de renderização sem display.
+
+Uso:
+    python3 cutvideo.py simple video.mp4 -o video_editado.mp4 --cut-style 3
+    python3 cutvideo.py magic video.mp4 --conciseness 4 --jcut 0.5
+    python3 cutvideo.py simple video.mp4 --preview      # prévia 360p + video_edited.edl.json
+    python3 cutvideo.py final video_edited.edl.json     # versão final com os mesmos cortes
+    python3 cutvideo.py job job.json
+    python3 cutvideo.py batch pasta_de_videos/ --mode magic --workers 2 --report lote.json
+
+Arquivo de job: um objeto JSON (ou lista de objetos) com as chaves de
+`pipeline.DEFAULT_JOB`, por exemplo:
+    {"mode": "simple", "input": "aula.mp4", "output": "aula_editada.mp4", "cut_style": 2}
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import batch
+import edl
+import encode_profiles
+from pipeline import EditingPipeline, build_job, load_api_keys
+from progress import format_progress
+
+
+def add_common_arguments(parser):
+    """Argumentos compartilhados pelos modos simple e magic"""
+    parser.add_argument("input", help="Arquivo de vídeo de entrada")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (padrão: <entrada>_edited.mp4)")
+    add_cut_arguments(parser)
+
+
+def add_cut_arguments(parser):
+    """Argumentos de corte e J-Cut"""
+    parser.add_argument("--cut-style", type=int, choices=range(1, 6), metavar="1-5",
+                        help="Estilo de corte: 1 = mais seco, 5 = mais suave (padrão: 3)")
+    parser.add_argument("--cut-type", choices=["audio", "motion"], help="Tipo de análise de corte (padrão: audio)")
+    parser.add_argument("--jcut", type=float, metavar="SEGUNDOS",
+                        help="Habilita J-Cuts com a duração informada")
+    parser.add_argument("--jcut-strategy", choices=["auto", "single", "clips"],
+                        help="Renderização do J-Cut: single = um único ffmpeg, clips = clipes em "
+                             "paralelo com busca na entrada (padrão: auto)")
+    parser.add_argument("--encode-profile", choices=list(encode_profiles.PROFILES),
+                        help="Perfil de codificação: preview (360p/15 fps), draft (rápido), balanced ou archival "
+                             "(intermediários sem perdas + codificação final lenta) (padrão: balanced)")
+    parser.add_argument("--smart-render", action="store_true", default=None,
+                        help="Sem J-Cut: copia os GOPs inteiros e recodifica só as bordas dos cortes "
+                             "(fontes H.264)")
+    parser.add_argument("--no-proxy", dest="proxy", action="store_false", default=None,
+                        help="Analisar o vídeo original em vez do proxy de análise (240p + áudio 16 kHz, em cache)")
+    parser.add_argument("--preview", action="store_true", default=None,
+                        help="Renderiza só uma prévia em baixa resolução (<saída>_preview.mp4) e salva "
+                             "a EDL em <saída>.edl.json para o comando final")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cutvideo",
+        description="Edição automática de vídeos (Simples ou Automágica) sem interface gráfica"
+    )
+    parser.add_argument("--config", default="api_config.json",
+                        help="Arquivo com as chaves de API (padrão: api_config.json)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    simple = subparsers.add_parser("simple", help="Edição Simples (apenas cortes de silêncio)")
+    add_common_arguments(simple)
+
+    magic = subparsers.add_parser("magic", help="Edição Automágica (Whisper + LLM)")
+    add_common_arguments(magic)
+    add_magic_arguments(magic)
+
+    final = subparsers.add_parser("final", help="Renderiza a versão final de uma prévia (arquivo .edl.json)")
+    final.add_argument("edl_file", help="EDL salva pela prévia")
+    final.add_argument("-o", "--output", help="Arquivo de saída (padrão: a saída do job da prévia)")
+    final.add_argument("--encode-profile", choices=[name for name in encode_profiles.PROFILES
+                                                    if name != encode_profiles.PREVIEW_PROFILE],
+                       help="Perfil de codificação (padrão: o do job da prévia)")
+
+    job = subparsers.add_parser("job", help="Executa um arquivo de job JSON")
+    job.add_argument("job_file", help="Arquivo JSON com um job ou uma lista de jobs")
+    add_batch_arguments(job)
+
+    batch_parser = subparsers.add_parser("batch", help="Edita vários vídeos em paralelo")
+    batch_parser.add_argument("inputs", nargs="+", help="Arquivos de vídeo e/ou diretórios")
+    batch_parser.add_argument("--mode", choices=["simple", "magic"], default="simple",
+                              help="Modo de edição aplicado a todos os vídeos (padrão: simple)")
+    batch_parser.add_argument("-r", "--recursive", action="store_true", help="Procurar vídeos em subdiretórios")
+    batch_parser.add_argument("--output-dir", help="Diretório de saída (padrão: ao lado de cada entrada)")
+    add_cut_arguments(batch_parser)
+    add_magic_arguments(batch_parser)
+    add_batch_arguments(batch_parser)
+
+    return parser.parse_args(argv)
+
+
+def add_magic_arguments(parser):
+    """Argumentos do modo Automágico (transcrição e LLM)"""
+    parser.add_argument("--conciseness", type=int, choices=range(1, 6), metavar="1-5",
+                        help="Nível de concisão da IA: 1 = mais enxuto, 5 = mais encorpado (padrão: 3)")
+    parser.add_argument("--whisper-mode", choices=["api", "local"], help="Transcrição pela API OpenAI ou local")
+    parser.add_argument("--whisper-model", choices=["tiny", "base", "small", "medium", "large"],
+                        help="Modelo do Whisper local (padrão: base)")
+    parser.add_argument("--gpu", action="store_true", default=None, help="Processar o Whisper local em GPU")
+    parser.add_argument("--llm-provider", choices=["openai", "gemini"], help="Provedor do LLM")
+    parser.add_argument("--llm-model", help="Modelo do LLM (padrão: gpt-4o)")
+
+
+def add_batch_arguments(parser):
+    """Argumentos de concorrência da fila de lote"""
+    parser.add_argument("--workers", type=int, help="Vídeos processados ao mesmo tempo (padrão: núcleos / threads)")
+    parser.add_argument("--threads-per-job", type=int,
+                        help="Threads de ffmpeg/torch por vídeo (padrão: núcleos / workers, até 4)")
+    parser.add_argument("--whisper-slots", type=int, default=1,
+                        help="Transcrições com Whisper local simultâneas (padrão: 1)")
+    parser.add_argument("--report", help="Salvar o relatório do lote neste arquivo JSON")
+
+
+def jobs_from_args(args):
+    """Converte os argumentos da linha de comando em uma lista de jobs"""
+    if args.command == "job":
+        with open(args.job_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [build_job(job) for job in (data if isinstance(data, list) else [data])]
+
+    overrides = {
+        "cut_style": args.cut_style,
+        "cut_type": args.cut_type,
+        "jcut_strategy": args.jcut_strategy,
+        "smart_render": args.smart_render,
+        "encode_profile": args.encode_profile,
+        "preview": args.preview,
+        "proxy": args.proxy,
+    }
+    if args.jcut is not None:
+        overrides.update(jcut=True, jcut_duration=args.jcut)
+    if args.command in ("magic", "batch"):
+        overrides.update(
+            conciseness=args.conciseness,
+            whisper_mode=args.whisper_mode,
+            whisper_model=args.whisper_model,
+            use_gpu=args.gpu,
+            llm_provider=args.llm_provider,
+            llm_model=args.llm_model,
+        )
+
+    if args.command == "batch":
+        inputs = batch.collect_inputs(args.inputs, recursive=args.recursive)
+        if not inputs:
+            raise ValueError("Nenhum vídeo encontrado nas entradas informadas")
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        return [
+            build_job(mode=args.mode, input=path, output=batch.output_path_for(path, args.output_dir), **overrides)
+            for path in inputs
+        ]
+    return [build_job(mode=args.command, input=args.input, output=args.output, **overrides)]
+
+
+def run_batch(args, jobs):
+    """Processa os jobs na fila de lote e imprime o relatório"""
+    queue = batch.BatchQueue(
+        jobs,
+        workers=args.workers,
+        threads_per_job=args.threads_per_job,
+        whisper_slots=args.whisper_slots,
+        api_keys=load_api_keys(args.config),
+    )
+    report = queue.run()
+    print(batch.format_report(report))
+    if args.report:
+        batch.write_report(report, args.report)
+    return 1 if report["failed"] else 0
+
+
+def print_progress(snapshot):
+    """Linha de progresso reescrita no lugar (só em terminal)"""
+    print(f"\r\033[K{format_progress(snapshot)}", end="", file=sys.stderr, flush=True)
+
+
+def run_final(args):
+    """Renderiza a EDL de uma prévia com o perfil final"""
+    pipeline = EditingPipeline(api_keys=load_api_keys(args.config),
+                               progress=print_progress if sys.stderr.isatty() else None)
+    try:
+        print(pipeline.render_final(edl.load_edl(args.edl_file), output=args.output,
+                                    encode_profile=args.encode_profile))
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        pipeline.log(f"Falha na renderização final: {e}", "ERROR")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "final":
+        return run_final(args)
+    try:
+        jobs = jobs_from_args(args)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+
+    # Vários jobs (arquivo de job com lista ou comando batch) vão para a fila paralela
+    if args.command == "batch" or (args.command == "job" and len(jobs) > 1):
+        return run_batch(args, jobs)
+
+    pipeline = EditingPipeline(api_keys=load_api_keys(args.config),
+                               progress=print_progress if sys.stderr.isatty() else None)
+    failures = 0
+    for job in jobs:
+        try:
+            output = pipeline.run_job(job)
+            print(output)
+        except Exception as e:
+            pipeline.log(f"Falha em {job['input']}: {e}", "ERROR")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Lista de decisões de edição (EDL) da prévia
+
+A prévia roda a análise completa do job (silêncio, transcrição, LLM) e
+renderiza a playlist resultante em baixa resolução. A playlist e o job ficam
+guardados em um arquivo JSON ao lado da saída (`<saída>.edl.json`): a
+renderização final reaproveita exatamente os mesmos cortes, sem repetir a
+análise. A impressão digital da entrada vai junto para detectar um vídeo
+trocado ou modificado depois da prévia.
+"""
+
+import datetime
+import json
+import os
+
+from media_cache import file_fingerprint
+
+EDL_VERSION = 1
+
+
+def edl_path(output):
+    """Arquivo da EDL de uma saída: `video_edited.mp4` -> `video_edited.edl.json`"""
+    return os.path.splitext(output)[0] + ".edl.json"
+
+
+def preview_path(output):
+    """Arquivo da prévia de uma saída: `video_edited.mp4` -> `video_edited_preview.mp4`"""
+    base, ext = os.path.splitext(output)
+    return f"{base}_preview{ext or '.mp4'}"
+
+
+def make_edl(job, playlist):
+    """EDL com o job (já completo, ver `pipeline.build_job`) e a playlist a renderizar"""
+    return {
+        "version": EDL_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "source": file_fingerprint(job["input"]),
+        "job": dict(job),
+        "playlist": [{'start': clip['start'], 'end': clip['end']} for clip in playlist],
+    }
+
+
+def save_edl(edl, path):
+    """Grava a EDL (escrita atômica: um arquivo pela metade não substitui o anterior)"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(edl, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def load_edl(path):
+    """Lê uma EDL salva; ValueError se o arquivo não for uma EDL desta versão"""
+    with open(path, 'r', encoding='utf-8') as f:
+        edl = json.load(f)
+    if not isinstance(edl, dict) or edl.get("version") != EDL_VERSION:
+        raise ValueError(f"EDL inválida ou de outra versão: {path}")
+    if not edl.get("playlist") or not edl.get("job", {}).get("input"):
+        raise ValueError(f"EDL sem playlist ou sem arquivo de entrada: {path}")
+    return edl
+
+
+def check_source(edl):
+    """RuntimeError se o vídeo de entrada não for mais o mesmo da prévia"""
+    video = edl["job"]["input"]
+    if not os.path.exists(video):
+        raise RuntimeError(f"Vídeo de entrada da EDL não encontrado: {video}")
+    if edl.get("source") and file_fingerprint(video) != edl["source"]:
+        raise RuntimeError(f"O vídeo de entrada mudou desde a prévia: gere a prévia de novo ({video})")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Perfis de codificação de vídeo (preview, draft, balanced, archival)
+
+Cada perfil define preset, CRF, tune e bitrate de áudio usados em todas as
+chamadas do ffmpeg que codificam vídeo, e como tratar os clipes
+intermediários das renderizações clipe a clipe:
+
+- "direct": os clipes já saem com os parâmetros finais e são juntados sem
+  recodificar (uma única codificação, a mais rápida);
+- "lossless": os clipes saem sem perdas em `ultrafast` (rápido, arquivos
+  grandes) e o programa juntado passa por uma codificação final com o perfil.
+
+As threads não fazem parte do perfil: vêm do job (`threads`).
+
+O perfil "preview" também reduz a resolução (`height`) e a taxa de quadros
+(`fps`) com um filtro de vídeo (`frame_filter`): é o da prévia de revisão,
+renderizada pelo grafo do ffmpeg em uma fração do tempo real.
+
+Os tamanhos e velocidades de cada perfil podem ser medidos com
+`benchmarks/encode_profiles.py`.
+"""
+
+PROFILES = {
+    "preview": {
+        "preset": "ultrafast", "crf": 32, "tune": "fastdecode",
+        "audio_bitrate": "64k", "intermediates": "direct", "height": 360, "fps": 15,
+    },
+    "draft": {
+        "preset": "ultrafast", "crf": 28, "tune": None,
+        "audio_bitrate": "96k", "intermediates": "direct", "height": None, "fps": None,
+    },
+    "balanced": {
+        "preset": "medium", "crf": 21, "tune": None,
+        "audio_bitrate": "160k", "intermediates": "direct", "height": None, "fps": None,
+    },
+    "archival": {
+        "preset": "slow", "crf": 16, "tune": "film",
+        "audio_bitrate": "256k", "intermediates": "lossless", "height": None, "fps": None,
+    },
+}
+DEFAULT_PROFILE = "balanced"
+PREVIEW_PROFILE = "preview"
+
+# Intermediários sem perdas: x264 com qp 0 e áudio PCM (Matroska aceita os dois)
+LOSSLESS_VIDEO_ARGS = ["-c:v", "libx264", "-preset", "ultrafast", "-qp", "0"]
+LOSSLESS_AUDIO_ARGS = ["-c:a", "pcm_s16le"]
+LOSSLESS_SUFFIX = ".mkv"
+
+
+def get_profile(name):
+    """Perfil pelo nome; ValueError se não existir"""
+    try:
+        return PROFILES[name or DEFAULT_PROFILE]
+    except KeyError:
+        raise ValueError(f"Perfil de codificação desconhecido: {name} "
+                         f"(disponíveis: {', '.join(PROFILES)})") from None
+
+
+def video_args(name, threads=0):
+    """Argumentos do libx264 para o perfil; `threads` (se > 0) limita as threads do encoder"""
+    profile = get_profile(name)
+    args = ["-c:v", "libx264", "-preset", profile["preset"], "-crf", str(profile["crf"])]
+    if profile["tune"]:
+        args += ["-tune", profile["tune"]]
+    if threads:
+        args += ["-threads", str(threads)]
+    return args
+
+
+def audio_args(name):
+    return ["-c:a", "aac", "-b:a", get_profile(name)["audio_bitrate"]]
+
+
+def encode_args(name, threads=0):
+    """Vídeo e áudio no perfil, para uma codificação final"""
+    return video_args(name, threads) + audio_args(name)
+
+
+def intermediate_args(name, threads=0):
+    """(argumentos, sufixo do arquivo) dos clipes intermediários do perfil"""
+    if get_profile(name)["intermediates"] == "lossless":
+        thread_args = ["-threads", str(threads)] if threads else []
+        return LOSSLESS_VIDEO_ARGS + thread_args + LOSSLESS_AUDIO_ARGS, LOSSLESS_SUFFIX
+    return encode_args(name, threads), ".mp4"
+
+
+def needs_final_encode(name):
+    """True se os intermediários precisam de uma codificação final depois de juntados"""
+    return get_profile(name)["intermediates"] == "lossless"
+
+
+def frame_filter(name):
+    """Filtro de vídeo que reduz resolução e fps do perfil (ex.: "scale=-2:360,fps=15"), ou None"""
+    profile = get_profile(name)
+    filters = []
+    if profile["height"]:
+        # Largura par proporcional; fontes menores que a altura do perfil não são ampliadas
+        filters.append(f"scale=-2:'min({profile['height']},ih)'")
+    if profile["fps"]:
+        filters.append(f"fps={profile['fps']}")
+    return ",".join(filters) or None
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Grafos de filtro do J-Cut
+
+Em um J-Cut o áudio do próximo clipe começa `jcut_duration` segundos antes do
+corte de vídeo. Em vez de um ffmpeg por clipe (cada um decodificando a fonte
+desde o início até o seu trecho), a playlist inteira vira um único grafo:
+`split`/`asplit` distribuem a fonte, `trim`/`atrim` recortam cada trecho e
+`concat` monta o resultado. A fonte é decodificada uma vez e o vídeo
+codificado uma vez.
+
+O grafo só é barato se a playlist seguir a ordem da fonte: o `concat`
+consome os trechos em sequência e quadros de um trecho que ainda não chegou
+a vez ficam em memória. A alternativa (`clip_command`) renderiza cada clipe
+com busca na entrada (`-ss` antes de `-i`): o ffmpeg decodifica só a janela
+do clipe e a antecipação do áudio, e os clipes rodam em paralelo antes de
+serem concatenados. Ela é usada para playlists fora de ordem e para fontes
+longas em que a maior parte do vídeo é cortada.
+
+Com `jcut_duration` zero cada clipe usa só o próprio áudio: os mesmos
+comandos renderizam uma playlist sem J-Cut (é o caso da prévia). O
+`video_filter` opcional (ex.: redução de resolução e fps da prévia) é
+aplicado à fonte uma única vez, antes da distribuição pelos trechos.
+"""
+
+STRATEGIES = ("auto", "single", "clips")
+# Com menos que esta fração da fonte mantida, decodificar só as janelas compensa
+SEEK_KEEP_RATIO = 0.5
+
+
+def _ts(seconds):
+    return f"{max(0.0, float(seconds)):.6f}"
+
+
+def is_sequential(playlist):
+    """True se os clipes seguem a ordem da fonte sem se sobrepor"""
+    return all(prev['end'] <= clip['start'] for prev, clip in zip(playlist, playlist[1:]))
+
+
+def clip_audio_parts(playlist, index, jcut_duration):
+    """Trechos de áudio (início, fim) do clipe `index`, com a antecipação do J-Cut
+
+    O último clipe não tem transição e usa o próprio áudio, assim como todos
+    os clipes quando `jcut_duration` é zero.
+    """
+    clip = playlist[index]
+    if index == len(playlist) - 1 or float(jcut_duration) <= 0:
+        return [(clip['start'], clip['end'])]
+    jd = float(jcut_duration)
+    following = playlist[index + 1]
+    return [
+        (clip['start'], max(clip['start'], clip['end'] - jd)),
+        (following['start'], following['start'] + jd),
+    ]
+
+
+def audio_parts(playlist, jcut_duration):
+    """Trechos de áudio de todos os clipes (ver `clip_audio_parts`)"""
+    return [clip_audio_parts(playlist, i, jcut_duration) for i in range(len(playlist))]
+
+
+def filter_graph(playlist, jcut_duration, video_filter=None):
+    """Grafo (`-filter_complex`) que monta a playlist inteira com J-Cuts; saídas [v_out] e [a_out]"""
+    parts = audio_parts(playlist, jcut_duration)
+    audio_count = sum(len(clip_parts) for clip_parts in parts)
+    source_video = f"[0:v]{video_filter}," if video_filter else "[0:v]"
+    lines = [
+        f"{source_video}split={len(playlist)}" + "".join(f"[vs{i}]" for i in range(len(playlist))),
+        f"[0:a]asplit={audio_count}" + "".join(f"[as{i}]" for i in range(audio_count)),
+    ]
+    segments = []
+    source = 0
+    for i, (clip, clip_parts) in enumerate(zip(playlist, parts)):
+        lines.append(f"[vs{i}]trim=start={_ts(clip['start'])}:end={_ts(clip['end'])},setpts=PTS-STARTPTS[v{i}]")
+        labels = []
+        for j, (start, end) in enumerate(clip_parts):
+            label = f"a{i}_{j}"
+            lines.append(f"[as{source}]atrim=start={_ts(start)}:end={_ts(end)},asetpts=PTS-STARTPTS[{label}]")
+            labels.append(f"[{label}]")
+            source += 1
+        if len(labels) > 1:
+            lines.append("".join(labels) + f"concat=n={len(labels)}:v=0:a=1[a{i}]")
+        else:
+            lines.append(f"{labels[0]}anull[a{i}]")
+        segments.append(f"[v{i}][a{i}]")
+    lines.append("".join(segments) + f"concat=n={len(playlist)}:v=1:a=1[v_out][a_out]")
+    return ";\n".join(lines)
+
+
+def kept_ratio(playlist):
+    """Fração mantida do trecho que o grafo único decodifica (do início da fonte ao fim do último clipe)"""
+    span = max(clip['end'] for clip in playlist)
+    kept = sum(clip['end'] - clip['start'] for clip in playlist)
+    return kept / span if span > 0 else 1.0
+
+
+def choose_strategy(playlist, strategy="auto"):
+    """"single" (um grafo) ou "clips" (clipes com busca, em paralelo)"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia de J-Cut desconhecida: {strategy}")
+    if strategy == "single" and not is_sequential(playlist):
+        # O grafo precisaria guardar em memória quadros decodificados fora de ordem
+        return "clips"
+    if strategy != "auto":
+        return strategy
+    if not is_sequential(playlist) or kept_ratio(playlist) < SEEK_KEEP_RATIO:
+        return "clips"
+    return "single"
+
+
+def clip_command(playlist, index, jcut_duration, input_video, output, encode_args, video_filter=None):
+    """Comando do ffmpeg que renderiza só o clipe `index`, buscando direto na sua janela
+
+    A primeira entrada é o próprio clipe; nas transições, uma segunda entrada
+    traz os `jcut_duration` segundos iniciais do próximo clipe para o fim do áudio.
+    """
+    clip = playlist[index]
+    duration = clip['end'] - clip['start']
+    cmd = ["ffmpeg", "-y", "-ss", _ts(clip['start']), "-t", _ts(duration), "-i", input_video]
+    # O vídeo sai direto da entrada (fora do grafo do áudio): o filtro dele vai em -vf
+    vf = ["-vf", video_filter] if video_filter else []
+    parts = clip_audio_parts(playlist, index, jcut_duration)
+    if len(parts) == 1:
+        return cmd + ["-map", "0:v:0", "-map", "0:a:0", *vf, *encode_args, output]
+    (start, end), (lead_start, lead_end) = parts
+    cmd += ["-ss", _ts(lead_start), "-t", _ts(lead_end - lead_start), "-i", input_video]
+    filter_complex = (
+        f"[0:a]atrim=end={_ts(end - start)},asetpts=PTS-STARTPTS[a_part1]; "
+        f"[1:a]asetpts=PTS-STARTPTS[a_part2]; "
+        f"[a_part1][a_part2]concat=n=2:v=0:a=1[a_out]"
+    )
+    return cmd + ["-filter_complex", filter_complex, "-map", "0:v:0", "-map", "[a_out]", *vf, *encode_args, output]
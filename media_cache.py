@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Cache em disco endereçado pelo conteúdo da mídia
+
+A identidade de um arquivo é uma impressão digital rápida: tamanho, mtime e
+alguns blocos amostrados ao longo do arquivo (não um hash completo de um vídeo
+de vários GB). Sobre ela ficam o `DiskCache` genérico, com remoção por tamanho
+total (os menos usados saem primeiro), e o cache de transcrições.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Diretório base dos caches (pode ser trocado pela variável CUTVIDEO_CACHE_DIR)
+CACHE_ROOT = os.environ.get("CUTVIDEO_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "cutvideo")
+
+SAMPLE_BLOCKS = 8             # blocos lidos para a impressão digital
+SAMPLE_BLOCK_SIZE = 64 * 1024
+
+TRANSCRIPTION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_fingerprint(path):
+    """Impressão digital rápida de um arquivo: tamanho, mtime e blocos amostrados"""
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, 'rb') as f:
+        if stat.st_size <= SAMPLE_BLOCKS * SAMPLE_BLOCK_SIZE:
+            digest.update(f.read())
+        else:
+            # Início, fim e blocos igualmente espaçados entre eles
+            last_offset = stat.st_size - SAMPLE_BLOCK_SIZE
+            for i in range(SAMPLE_BLOCKS):
+                f.seek(last_offset * i // (SAMPLE_BLOCKS - 1))
+                digest.update(f.read(SAMPLE_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+def cache_key(*parts):
+    """Chave de cache a partir de partes textuais (impressão digital, motor, modelo...)"""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _json_default(value):
+    # Resultados do Whisper local podem trazer escalares/arrays do numpy
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class DiskCache:
+    """Cache de arquivos em um diretório, limitado pelo tamanho total
+
+    Cada entrada é um arquivo `<chave><sufixo>`. Leituras atualizam o mtime,
+    e a remoção apaga as entradas com mtime mais antigo até caber em `max_bytes`.
+    """
+
+    def __init__(self, namespace, max_bytes, root=None):
+        self.directory = os.path.join(root or CACHE_ROOT, namespace)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path_for(self, key, suffix=".json"):
+        return os.path.join(self.directory, key + suffix)
+
+    def touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def get_json(self, key):
+        """Devolve o valor salvo ou None se a chave não existir (ou estiver corrompida)"""
+        path = self.path_for(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self.touch(path)
+        return value
+
+    def put_json(self, key, value):
+        """Salva o valor de forma atômica e aplica o limite de tamanho"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False, default=_json_default)
+            os.replace(temp_path, self.path_for(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas até o total caber em `max_bytes`"""
+        with self._lock:
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return
+            entries = []
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _mtime, size, _path in entries)
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Apaga todas as entradas do cache"""
+        with self._lock:
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return
+            for name in names:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class TranscriptionCache:
+    """Transcrições indexadas por mídia + motor + modelo + idioma"""
+
+    def __init__(self, max_bytes=TRANSCRIPTION_CACHE_MAX_BYTES, root=None):
+        self.cache = DiskCache("transcriptions", max_bytes, root)
+
+    def key(self, media_path, engine, model, language=None):
+        return cache_key(file_fingerprint(media_path), engine, model, language or "auto")
+
+    def get(self, media_path, engine, model, language=None):
+        """Resultado salvo para a mídia, ou None"""
+        try:
+            return self.cache.get_json(self.key(media_path, engine, model, language))
+        except OSError:
+            return None
+
+    def put(self, media_path, engine, model, result, language=None):
+        self.cache.put_json(self.key(media_path, engine, model, language), result)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Sondagem da mídia de entrada com índice de keyframes em cache
+
+Cada arquivo é sondado uma vez: o ffprobe lê só o cabeçalho (streams,
+duração, taxa de quadros). O índice de keyframes exige varrer todos os
+pacotes do vídeo (sem decodificar) e por isso só é montado quando a
+renderização inteligente ou a reorganização precisam dele. O índice fica em
+um `array('d')` e é salvo compactado (bytes em base64) no `DiskCache` junto
+da sondagem, indexado pela impressão digital do arquivo: as próximas
+execuções, e todas as etapas da mesma execução, leem o resultado sem varrer
+de novo vídeos de vários GB.
+"""
+
+import array
+import base64
+import json
+import sys
+
+import process_runner
+from media_cache import DiskCache, cache_key, file_fingerprint
+
+PROBE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+PROBE_VERSION = 2  # muda quando o formato salvo muda
+
+STREAM_ENTRIES = ("index,codec_type,codec_name,profile,pix_fmt,width,height,time_base,"
+                  "avg_frame_rate,r_frame_rate,sample_rate,channels")
+
+
+def _rate(value):
+    """'30000/1001' -> 29.97; None se ausente ou inválida"""
+    num, _sep, den = (value or "").partition("/")
+    try:
+        num, den = float(num), float(den or 1)
+    except ValueError:
+        return None
+    return num / den if num > 0 and den > 0 else None
+
+
+def _pack(values):
+    data = array.array('d', values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def _unpack(text):
+    data = array.array('d')
+    data.frombytes(base64.b64decode(text))
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data
+
+
+def probe_layout(path):
+    """Formato e streams do arquivo (ffprobe, sem ler os pacotes)"""
+    cmd = [
+        "ffprobe", "-v", "error", "-show_entries", f"format=duration,format_name:stream={STREAM_ENTRIES}",
+        "-of", "json", path
+    ]
+    result = process_runner.run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"Erro no ffprobe: {result.stderr}")
+    return json.loads(result.stdout or "{}")
+
+
+def scan_keyframes(path, on_progress=None, token=None):
+    """Instantes dos keyframes do primeiro stream de vídeo, em ordem"""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path
+    ]
+    keyframes = array.array('d')
+
+    def on_line(line):
+        pts, _sep, flags = line.partition(",")
+        if "K" not in flags:
+            return
+        try:
+            seconds = float(pts)
+        except ValueError:
+            return  # pacote sem pts ("N/A")
+        keyframes.append(seconds)
+        if on_progress:
+            on_progress(seconds)
+
+    result = process_runner.run(cmd, on_stdout=on_line, token=token)
+    if result.returncode != 0:
+        raise RuntimeError(f"Erro ao ler keyframes: {result.stderr}")
+    return array.array('d', sorted(keyframes))
+
+
+def probe(path):
+    """Informações da mídia: duração, formato, streams e fps (sem o índice de keyframes)"""
+    layout = probe_layout(path)
+    streams = layout.get("streams") or []
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    try:
+        duration = float(layout.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    return {
+        "duration": duration,
+        "format": layout.get("format", {}).get("format_name"),
+        "streams": streams,
+        "video": video,
+        "audio": audio,
+        "fps": _rate(video.get("avg_frame_rate") or video.get("r_frame_rate")) if video else None,
+    }
+
+
+def with_keyframes(path, info, on_progress=None, token=None):
+    """Sondagem com o índice de keyframes (`info["keyframes"]`), varrendo os pacotes se ainda não tiver
+
+    `on_progress(segundos_lidos)` acompanha a leitura dos pacotes.
+    """
+    if "keyframes" in info:
+        return info
+    keyframes = scan_keyframes(path, on_progress, token) if info["video"] is not None else array.array('d')
+    return dict(info, keyframes=keyframes)
+
+
+class MediaProbeCache:
+    """Sondagens indexadas pela impressão digital do arquivo"""
+
+    def __init__(self, max_bytes=PROBE_CACHE_MAX_BYTES, root=None):
+        self.cache = DiskCache("probes", max_bytes, root)
+
+    def key(self, media_path):
+        return cache_key(file_fingerprint(media_path), "probe", PROBE_VERSION)
+
+    def get(self, media_path):
+        """Sondagem salva para a mídia, ou None"""
+        try:
+            stored = self.cache.get_json(self.key(media_path))
+        except OSError:
+            return None
+        if not stored:
+            return None
+        if "keyframes" in stored:
+            try:
+                stored["keyframes"] = _unpack(stored["keyframes"])
+            except (ValueError, TypeError):
+                return None
+        return stored
+
+    def put(self, media_path, info):
+        stored = dict(info)
+        if "keyframes" in info:
+            stored["keyframes"] = _pack(info["keyframes"])
+        self.cache.put_json(self.key(media_path), stored)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Orquestração assíncrona das etapas do pipeline
+
+Subprocessos (ffmpeg, auto-editor) e chamadas bloqueantes (SDKs de LLM,
+Whisper) viram tarefas `asyncio` com tempo limite por etapa e concorrência
+limitada por semáforos. Etapas independentes rodam juntas com `gather`: se uma
+falha, as demais são canceladas e aguardadas, e todo processo filho de uma
+tarefa cancelada é encerrado.
+
+Código síncrono (GUI, `cutvideo`) entra por `Orchestrator.run`, que executa
+uma corrotina em um loop próprio na thread que chamou. Com um
+`CancellationToken`, cancelar o token cancela a tarefa principal: grupos de
+processos recebem SIGTERM (SIGKILL meio segundo depois) e o chamador recebe
+`Cancelled` sem esperar chamadas HTTP que ainda estejam em andamento.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import weakref
+
+import process_runner
+from cancellation import Cancelled
+
+# Tempo limite (segundos) de cada etapa; None = sem limite
+STAGE_TIMEOUTS = {
+    "probe": 600,
+    "keyframes": 3600,
+    "proxy": 2 * 3600,
+    "silence": 2 * 3600,
+    "audio": 3600,
+    "transcription": 6 * 3600,
+    "llm_errors": 300,
+    "llm_narrative": 300,
+    "render": 12 * 3600,
+    "concat": 3600,
+}
+
+DEFAULT_MAX_PROCESSES = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_MAX_CALLS = 4          # chamadas bloqueantes simultâneas (HTTP, Whisper)
+
+
+class StageTimeout(RuntimeError):
+    """Uma etapa excedeu o tempo limite: a execução deve falhar, não seguir com um resultado padrão"""
+
+
+class Orchestrator:
+    """Executa subprocessos e chamadas bloqueantes como tarefas com limite de tempo e de concorrência"""
+
+    def __init__(self, max_processes=None, max_calls=DEFAULT_MAX_CALLS, timeouts=None):
+        # Subprocessos simultâneos deste pipeline (a fila de lote dá a cada job a sua cota)
+        self.max_processes = max_processes or DEFAULT_MAX_PROCESSES
+        self.max_calls = max_calls
+        self.timeouts = dict(STAGE_TIMEOUTS)
+        self.timeouts.update(timeouts or {})
+        # Semáforos pertencem a um loop; cada `run` (em qualquer thread) tem os seus
+        self._slots = weakref.WeakKeyDictionary()
+        # Executor próprio: `asyncio.run` espera o executor padrão ao terminar, e uma
+        # chamada HTTP abandonada por cancelamento não deve segurar o chamador
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2 * max_calls,
+                                                               thread_name_prefix="orchestrator")
+
+    def run(self, coro, token=None):
+        """Executa a corrotina até o fim em um loop novo (para chamadores síncronos)"""
+        return asyncio.run(self._run_cancellable(coro, token))
+
+    async def _run_cancellable(self, coro, token):
+        if token is None:
+            return await coro
+        if token.cancelled:
+            coro.close()
+            raise Cancelled()
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(coro)
+
+        def cancel_task():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop já encerrado
+
+        handle = token.register(cancel_task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if token.cancelled:
+                raise Cancelled() from None
+            raise
+        finally:
+            token.unregister(handle)
+
+    def _loop_slots(self):
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = (asyncio.Semaphore(self.max_processes), asyncio.Semaphore(self.max_calls))
+        return slots
+
+    async def stage(self, name, awaitable, timeout=None):
+        """Aguarda uma etapa com o tempo limite configurado para ela"""
+        timeout = timeout if timeout is not None else self.timeouts.get(name)
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise StageTimeout(f"Etapa '{name}' excedeu o tempo limite de {timeout:.0f} s") from None
+
+    async def gather(self, *awaitables):
+        """Roda tarefas juntas; se uma falhar, cancela as outras antes de propagar o erro"""
+        tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def call(self, fn, *args, **kwargs):
+        """Executa uma função bloqueante (SDK, Whisper) em uma thread, com concorrência limitada"""
+        _, call_slots = self._loop_slots()
+        async with call_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def run_process(self, cmd, on_stdout=None, on_stderr=None, tail_lines=process_runner.TAIL_LINES):
+        """Executa um subprocesso (`process_runner`); devolve (returncode, final do stderr)
+
+        Se a tarefa for cancelada (cancelamento, falha de outra etapa, tempo
+        limite), o grupo do processo recebe SIGTERM e, se não sair a tempo, SIGKILL.
+        """
+        process_slots, _ = self._loop_slots()
+        async with process_slots:
+            running = process_runner.start(cmd, on_stdout, on_stderr, tail_lines)
+            finished = running.wait_async()
+            try:
+                returncode = await asyncio.shield(finished)
+            except BaseException:
+                # `stop` manda SIGTERM ao grupo e SIGKILL depois da carência
+                running.stop()
+                await asyncio.gather(finished, return_exceptions=True)
+                raise
+            return returncode, running.stderr
@@ -0,0 +1,1177 @@
+#!/usr/bin/env python3
+"""
+Núcleo headless do pipeline de edição
+
+Contém as etapas de trabalho (análise de silêncio, transcrição, LLM, J-Cut e
+renderização) sem nenhuma dependência de Tk. A GUI e o comando `cutvideo`
+usam esta mesma classe; o progresso é informado por callbacks de log e status
+e, de forma determinada (porcentagem, velocidade, ETA), pelo callback `progress`.
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+
+import chunked_transcription
+import edl as edl_file
+import encode_profiles
+import jcut
+import media_probe
+import providers
+import proxy_media
+import smart_render
+import whisper_worker
+from cancellation import Cancelled, CancellationToken
+from media_cache import TranscriptionCache
+from orchestrator import Orchestrator, StageTimeout
+from progress import (FfmpegProgressParser, ProgressTracker, parse_auto_editor_progress,
+                      with_auto_editor_progress, with_ffmpeg_progress)
+
+# Parâmetros padrão de um job; as mesmas chaves são aceitas em arquivos de job
+DEFAULT_JOB = {
+    "mode": "simple",          # "simple" ou "magic"
+    "input": "",
+    "output": "",
+    "cut_style": 3,            # 1 = mais seco, 5 = mais suave
+    "cut_type": "audio",       # "audio" ou "motion"
+    "jcut": False,
+    "jcut_duration": 0.5,
+    "jcut_strategy": "auto",   # "single" (um grafo), "clips" (clipes em paralelo) ou "auto"
+    "smart_render": False,     # copiar GOPs inteiros e recodificar só as bordas (sem J-Cut)
+    "encode_profile": encode_profiles.DEFAULT_PROFILE,  # "draft", "balanced" ou "archival"
+    "preview": False,          # renderizar só a prévia em baixa resolução e salvar a EDL
+    "proxy": True,             # analisar um proxy pequeno (240p + áudio 16 kHz) em vez do original
+    "conciseness": 3,          # 1 = mais enxuto, 5 = mais encorpado
+    "whisper_mode": "local",   # "api" ou "local"
+    "whisper_model": "base",
+    "use_gpu": False,
+    "llm_provider": "openai",
+    "llm_model": "gpt-4o",
+    "threads": 0,              # threads do ffmpeg por job (0 = automático)
+    "transcription_workers": 0,  # blocos transcritos em paralelo (0 = automático)
+}
+
+DEFAULT_API_CONFIG = {
+    "openai": "",
+    "gemini": "",
+    "last_provider": "openai",
+    "last_model": "gpt-4o"
+}
+
+
+def load_api_keys(config_file="api_config.json"):
+    """Carrega as chaves de API salvas (mesmo arquivo usado pela GUI)"""
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            # Garantir que todas as chaves existam
+            for key in DEFAULT_API_CONFIG:
+                if key not in config:
+                    config[key] = DEFAULT_API_CONFIG[key]
+            return config
+        return dict(DEFAULT_API_CONFIG)
+    except Exception as e:
+        print(f"Erro ao carregar configurações: {e}", file=sys.stderr)
+        return dict(DEFAULT_API_CONFIG)
+
+
+def build_job(job=None, **overrides):
+    """Mescla um job parcial com os valores padrão e valida os arquivos"""
+    merged = dict(DEFAULT_JOB)
+    merged.update(job or {})
+    merged.update({k: v for k, v in overrides.items() if v is not None})
+
+    if not merged["input"]:
+        raise ValueError("Job sem arquivo de entrada ('input')")
+    if merged["mode"] not in ("simple", "magic"):
+        raise ValueError(f"Modo de edição desconhecido: {merged['mode']}")
+    encode_profiles.get_profile(merged["encode_profile"])
+    if not merged["output"]:
+        base_name = os.path.splitext(merged["input"])[0]
+        merged["output"] = f"{base_name}_edited.mp4"
+    return merged
+
+# Taxa de amostragem usada pelo Whisper (local e API)
+SPEECH_SAMPLE_RATE = 16000
+
+# Formatos de extração de áudio para transcrição
+AUDIO_FORMATS = {
+    "pcm": {"suffix": ".wav", "codec": ["-c:a", "pcm_s16le"]},
+    "opus": {"suffix": ".ogg", "codec": ["-c:a", "libopus", "-b:a", "24k", "-application", "voip"]},
+}
+
+# Transcrição pela API: blocos de até 10 min (~1,8 MB em Opus) enviados em paralelo
+API_CHUNK_SECONDS = 600
+API_PARALLELISM = 4
+
+# J-Cut clipe a clipe: tentativas por clipe antes de desistir da renderização
+JCUT_CLIP_ATTEMPTS = 2
+
+# Whisper local em paralelo: blocos de pelo menos 2 min (contexto suficiente por bloco)
+LOCAL_MIN_CHUNK_SECONDS = 120
+
+
+def cut_style_params(cut_style):
+    """Mapeia o slider de estilo de corte (1-5) para margem e limiar do auto-editor"""
+    cut_style = int(cut_style)
+    margin = round(0.1 + (cut_style-1)*0.1, 2)  # 0.1 a 0.5
+    threshold = round(0.04 + (cut_style-1)*0.01, 2)  # 0.04 a 0.08
+    return margin, threshold
+
+
+def describe_transcription(result):
+    """Resumo de uma transcrição para o log (contagens e duração, sem o texto)"""
+    segments = result.get('segments') or []
+    words = result.get('words')
+    if words is None:
+        words = [word for segment in segments for word in segment.get('words') or []]
+    duration = result.get('duration') or (segments[-1].get('end', 0) if segments else 0)
+    return f"{len(segments)} segmentos, {len(words)} palavras, {float(duration or 0):.1f} s"
+
+
+def default_log(message, level="INFO"):
+    """Log padrão para uso sem GUI: imprime no stderr com timestamp"""
+    timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}", file=sys.stderr, flush=True)
+
+
+class EditingPipeline:
+    """Executa os pipelines Simples e Automágico sem interface gráfica"""
+
+    def __init__(self, api_keys=None, log=None, status=None, whisper_slots=None, progress=None, max_processes=None):
+        self.api_keys = api_keys if api_keys is not None else load_api_keys()
+        self._log = log or default_log
+        self._status = status
+        # Semáforo opcional que limita Whisper locais simultâneos (usado pela fila de lote)
+        self.whisper_slots = whisper_slots
+        self.transcription_cache = TranscriptionCache()
+        self.probe_cache = media_probe.MediaProbeCache()
+        self.proxy_cache = proxy_media.ProxyCache()
+        # Sondagens já feitas nesta execução, por (caminho, tamanho, mtime)
+        self._media_info = {}
+        self._media_info_lock = threading.Lock()
+        # `progress(snapshot)` recebe porcentagem, velocidade, fps e ETA (ver progress.py)
+        self.progress = ProgressTracker(progress)
+        # Executa subprocessos e chamadas bloqueantes com tempo limite por etapa;
+        # `max_processes` limita os ffmpeg simultâneos do job (padrão: metade dos núcleos)
+        self.orchestrator = Orchestrator(max_processes=max_processes)
+        # Compartilhado por todas as etapas; `cancel()` interrompe a execução atual
+        self.cancel_token = CancellationToken()
+        # EDL da última prévia (ver `preview` e `render_final`)
+        self.last_edl = None
+
+    def log(self, message, level="INFO"):
+        self._log(message, level)
+
+    def status(self, text, color='blue'):
+        """Atualiza o status da etapa atual (na GUI, o label de status)"""
+        if self._status:
+            self._status(text, color)
+
+    # ------------------------------------------------------------------
+    # Cancelamento
+    # ------------------------------------------------------------------
+
+    def cancel(self):
+        """Cancela a execução em andamento: processos, chamadas HTTP e workers do Whisper"""
+        if not self.cancel_token.cancelled:
+            self.log("Cancelando execução...", "WARNING")
+            self.cancel_token.cancel()
+
+    def begin_run(self):
+        """Prepara um novo token se a execução anterior foi cancelada
+
+        Chamado por todo ponto de entrada síncrono que inicia trabalho: um
+        cancelamento só vale para a execução em andamento, não para as próximas.
+        """
+        if self.cancel_token.cancelled:
+            self.cancel_token = CancellationToken()
+        return self.cancel_token
+
+    def run_stage(self, coro):
+        """Executa uma corrotina do pipeline a partir de código síncrono, respeitando o cancelamento"""
+        return self.orchestrator.run(coro, self.cancel_token)
+
+    def remove_partial_output(self, path, started):
+        """Remove a saída gerada por uma execução cancelada (só se foi escrita por ela)"""
+        try:
+            if path and os.path.exists(path) and os.path.getmtime(path) >= started:
+                os.remove(path)
+                self.log(f"Saída parcial removida: {path}", "INFO")
+        except OSError as e:
+            self.log(f"Não foi possível remover a saída parcial: {e}", "WARNING")
+
+    # ------------------------------------------------------------------
+    # Pipelines completos
+    # ------------------------------------------------------------------
+    # As etapas são corrotinas executadas pelo orquestrador; os métodos
+    # síncronos de mesmo nome (sem `_async`) servem à GUI e ao `cutvideo`.
+
+    def run_simple(self, job):
+        """Pipeline Edição Simples: análise de silêncio + renderização"""
+        self.begin_run()
+        return self.run_stage(self.run_simple_async(job))
+
+    async def run_simple_async(self, job):
+        job = build_job(job)
+        self.progress.plan(["probe", "proxy", "silence", "render"])
+
+        # 1. Análise dos clipes (a sondagem da mídia roda junto)
+        playlist = await self.plan_simple_async(job)
+
+        # 2. Renderização
+        await self.render_async(job, playlist)
+
+        self.status("Edição Simples concluída!", 'green')
+        self.log("Edição Simples finalizada com sucesso!", "SUCCESS")
+        return job["output"]
+
+    async def plan_simple_async(self, job):
+        """Playlist da Edição Simples (análise de silêncio no proxy de análise)"""
+        source = await self.prepare_analysis_async(job)
+        self.status("Analisando clipes de fala...")
+        self.log("Executando auto-editor para análise de silêncio...", "INFO")
+        playlist = await self.analyze_silence_async(source, job["cut_style"], job["cut_type"])
+        self.log(f"Playlist com {len(playlist)} clipes gerada.", "SUCCESS")
+        return playlist
+
+    def run_magic(self, job, whisper_result=None):
+        """Pipeline Edição Automágica: silêncio + Whisper + dois passes de LLM + renderização
+
+        Retorna o resultado do Whisper para que a GUI possa reaproveitá-lo.
+        """
+        self.begin_run()
+        return self.run_stage(self.run_magic_async(job, whisper_result))
+
+    async def run_magic_async(self, job, whisper_result=None):
+        job = build_job(job)
+        self.progress.plan(["probe", "proxy", "silence", "audio", "transcription", "llm_errors", "llm_narrative",
+                                "render"])
+
+        # 1 a 4. Silêncio, transcrição e os dois passes de LLM
+        playlist, whisper_result = await self.plan_magic_async(job, whisper_result)
+
+        # 5. Renderização
+        await self.render_async(job, playlist)
+
+        self.status("Edição Automágica concluída!", 'green')
+        self.log("Edição Automágica finalizada com sucesso!", "SUCCESS")
+        return whisper_result
+
+    async def plan_magic_async(self, job, whisper_result=None):
+        """(playlist, resultado do Whisper) da Edição Automágica"""
+        video = job["input"]
+        conciseness = job["conciseness"]
+        self.status("Iniciando pipeline IA...")
+        self.log("Iniciando pipeline Automágico...", "INFO")
+
+        source = await self.prepare_analysis_async(job)
+
+        # 1 e 2. Análise de silêncio e transcrição são independentes: rodam juntas
+        self.status("Analisando silêncio e transcrevendo áudio...")
+
+        async def transcription():
+            if whisper_result is not None:
+                return whisper_result
+            return await self.transcribe_video_async(video, job["whisper_mode"], job["whisper_model"],
+                                                     job["use_gpu"], job["transcription_workers"], source=source,
+                                                     threads=job["threads"])
+
+        speech_chunks, whisper_result = await self.orchestrator.gather(
+            self.analyze_silence_async(source, job["cut_style"], job["cut_type"]),
+            transcription(),
+        )
+        self.log(f"{len(speech_chunks)} clipes de fala detectados.", "SUCCESS")
+        transcription_text = whisper_result.get('text', '')
+        segments = whisper_result.get('segments', [])
+
+        # 3 e 4. Análise de erros (LLM Pass 1) e de narrativa (LLM Pass 2), em paralelo
+        self.status("Analisando erros de fala e narrativa (LLM)...")
+        rigor_prompt = f"Remova erros de fala, hesitações e repetições. Seja rigoroso nível {conciseness}/5. Retorne apenas os timestamps dos erros."  # Exemplo
+        conciseness_prompt = f"Reorganize e resuma o texto para um vídeo mais enxuto (nível {conciseness}/5). Retorne a playlist final (start/end) e clipes a excluir."  # Exemplo
+        _, (playlist, to_exclude) = await self.orchestrator.gather(
+            self.llm_analyze_errors_async(job, transcription_text, segments, rigor_prompt),
+            self.llm_analyze_narrative_async(job, transcription_text, segments, conciseness_prompt),
+        )
+        return playlist, whisper_result
+
+    # ------------------------------------------------------------------
+    # Prévia e renderização final
+    # ------------------------------------------------------------------
+    # A prévia faz a análise completa do job e renderiza a playlist com o
+    # perfil "preview" (360p, 15 fps, ultrafast). A EDL (job + playlist) fica
+    # salva ao lado da saída; a renderização final usa a mesma playlist com o
+    # perfil do job, sem repetir a análise.
+
+    def preview(self, job, whisper_result=None):
+        """Renderiza a prévia em baixa resolução e devolve a EDL para a renderização final"""
+        self.begin_run()
+        return self.run_stage(self.preview_async(job, whisper_result))
+
+    async def preview_async(self, job, whisper_result=None):
+        job = build_job(job)
+        if job["mode"] == "magic":
+            self.progress.plan(["probe", "proxy", "silence", "audio", "transcription", "llm_errors", "llm_narrative",
+                                "render"])
+            playlist, _ = await self.plan_magic_async(job, whisper_result)
+        else:
+            self.progress.plan(["probe", "proxy", "silence", "render"])
+            playlist = await self.plan_simple_async(job)
+
+        edl = edl_file.make_edl(job, playlist)
+        preview_output = edl_file.preview_path(job["output"])
+        self.status("Renderizando prévia em baixa resolução...")
+        await self.render_async(dict(job, output=preview_output, encode_profile=encode_profiles.PREVIEW_PROFILE,
+                                     smart_render=False), playlist)
+        edl["preview"] = preview_output
+        path = edl_file.edl_path(job["output"])
+        edl_file.save_edl(edl, path)
+        self.last_edl = edl
+        self.status("Prévia pronta!", 'green')
+        self.log(f"Prévia: {preview_output} (EDL salva em {path})", "SUCCESS")
+        return edl
+
+    def render_final(self, edl=None, **overrides):
+        """Renderiza a EDL de uma prévia (padrão: a última) com o perfil do job, sem nova análise
+
+        `edl` pode ser o dicionário devolvido por `preview` ou o caminho do arquivo
+        salvo; `overrides` (ex.: `output`, `encode_profile`) substituem chaves do job.
+        """
+        self.begin_run()
+        return self.run_stage(self.render_final_async(edl, **overrides))
+
+    async def render_final_async(self, edl=None, **overrides):
+        edl = edl if edl is not None else self.last_edl
+        if edl is None:
+            raise RuntimeError("Nenhuma prévia renderizada: gere a prévia antes da versão final")
+        if isinstance(edl, str):
+            edl = edl_file.load_edl(edl)
+        edl_file.check_source(edl)
+        job = build_job(edl["job"], preview=False, **overrides)
+        if job["encode_profile"] == encode_profiles.PREVIEW_PROFILE:
+            job["encode_profile"] = encode_profiles.DEFAULT_PROFILE
+        self.progress.plan(["probe", "render"])
+        self.log(f"Renderização final da EDL ({len(edl['playlist'])} clipes, perfil {job['encode_profile']})", "INFO")
+        await self.probe_media_async(job["input"])
+        await self.render_async(job, edl["playlist"])
+        self.status("Renderização final concluída!", 'green')
+        self.log(f"Renderização final: {job['output']}", "SUCCESS")
+        return job["output"]
+
+    def run_job(self, job):
+        """Executa um job conforme seu modo ('simple' ou 'magic'); com `preview`, só a prévia"""
+        job = build_job(job)
+        if job["preview"]:
+            return self.preview(job)["preview"]
+        if job["mode"] == "magic":
+            self.run_magic(job)
+        else:
+            self.run_simple(job)
+        return job["output"]
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+
+    async def prepare_analysis_async(self, job):
+        """Sondagem do original (só o cabeçalho) e proxy de análise; devolve o arquivo a analisar
+
+        O índice de keyframes não é montado aqui: a renderização que precisa
+        dele o pede (`probe_media_async(..., keyframes=True)`).
+        """
+        await self.probe_media_async(job["input"])
+        if not job["proxy"]:
+            self.progress.start_stage("proxy")
+            self.progress.finish_stage("proxy")
+            return job["input"]
+        return await self.analysis_proxy_async(job["input"], job["threads"])
+
+    async def analysis_proxy_async(self, video, threads=0):
+        """Proxy de análise do vídeo (240p + áudio 16 kHz mono), gerado uma vez e mantido em cache
+
+        Se o proxy não puder ser gerado, devolve o próprio vídeo.
+        """
+        duration = (await self.probe_media_async(video))["duration"]
+        self.progress.start_stage("proxy")
+        proxy = self.proxy_cache.get(video)
+        if proxy is not None:
+            self.progress.finish_stage("proxy")
+            self.log(f"Proxy de análise em cache: {proxy}", "INFO")
+            return proxy
+        path = self.proxy_cache.path_for(video)
+        temp_path = self.proxy_cache.temp_path(path)
+        self.progress.set_total(duration, "proxy")
+        cmd = proxy_media.proxy_command(video, temp_path, threads)
+        self.log(f"Gerando proxy de análise: {' '.join(cmd)}", "INFO")
+        try:
+            await self.orchestrator.stage("proxy", self.run_ffmpeg(cmd, "proxy", error="Erro ao gerar o proxy"))
+            self.proxy_cache.commit(temp_path, path)
+        except Cancelled:
+            self.remove_temp_file(temp_path)
+            raise
+        except (RuntimeError, OSError) as e:
+            # Sem proxy a análise continua possível, só mais lenta
+            self.remove_temp_file(temp_path)
+            self.log(f"{e}; analisando o original", "WARNING")
+            self.progress.finish_stage("proxy")
+            return video
+        except BaseException:
+            self.remove_temp_file(temp_path)
+            raise
+        self.progress.finish_stage("proxy")
+        return path
+
+    async def analyze_silence_async(self, video, cut_style, cut_type="audio"):
+        """Roda o auto-editor em modo análise e devolve a playlist de trechos falados"""
+        margin, threshold = cut_style_params(cut_style)
+        json_path = tempfile.mktemp(suffix="_ae.json")
+        cmd = ["auto-editor", video, "-m", str(margin), "--edit", cut_type, "--silent-threshold", str(threshold), "--export", "json", "-o", json_path]
+        self.log(f"Comando: {' '.join(map(str,cmd))}", "INFO")
+        self.progress.start_stage("silence")
+        try:
+            returncode, stderr = await self.orchestrator.stage("silence", self.run_auto_editor(cmd, "silence"))
+            if returncode != 0:
+                self.status("Erro ao analisar clipes de fala.", 'red')
+                self.log(stderr, "ERROR")
+                raise RuntimeError("Erro ao analisar clipes de fala.")
+            self.progress.finish_stage("silence")
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        finally:
+            self.remove_temp_file(json_path)
+        return [{'start': clip['start'], 'end': clip['end']} for clip in data.get('chunks', [])]
+
+    async def render_async(self, job, playlist):
+        """Renderiza a playlist com J-Cut, renderização inteligente ou pelo auto-editor"""
+        started = time.time()
+        try:
+            profile = job["encode_profile"]
+            if job["jcut"]:
+                self.status("Renderizando com J-Cut...")
+                await self.engine_jcut_async(playlist, job["jcut_duration"], job["input"], job["output"],
+                                             threads=job["threads"], strategy=job["jcut_strategy"], profile=profile)
+            elif encode_profiles.frame_filter(profile):
+                # Resolução/fps reduzidos só pelo ffmpeg: mesmos comandos do J-Cut, sem antecipação do áudio
+                await self.engine_jcut_async(playlist, 0, job["input"], job["output"],
+                                             threads=job["threads"], strategy=job["jcut_strategy"], profile=profile)
+            elif not (job["smart_render"] and await self.smart_render_async(job["input"], job["output"], playlist,
+                                                                            profile, job["threads"])):
+                self.status("Renderizando vídeo final...")
+                await self.render_playlist_async(job["input"], job["output"], playlist, profile)
+        except (asyncio.CancelledError, Cancelled):
+            # Um vídeo pela metade não deve parecer um resultado válido
+            self.remove_partial_output(job["output"], started)
+            self.status("Renderização cancelada.", 'orange')
+            raise
+
+    async def render_playlist_async(self, video, output, playlist, profile=encode_profiles.DEFAULT_PROFILE):
+        """Renderiza os clipes da playlist na ordem com o auto-editor"""
+        addins = []
+        for clip in playlist:
+            addins.extend(["--add-in", f"{clip['start']}-{clip['end']}"])
+        # O auto-editor não expõe preset/CRF; do perfil vale o bitrate de áudio
+        audio_bitrate = encode_profiles.get_profile(profile)["audio_bitrate"]
+        cmd = ["auto-editor", video, "--edit", "all/e"] + addins + ["-b:a", audio_bitrate, "-o", output]
+        self.log(f"Comando: {' '.join(map(str,cmd))}", "INFO")
+        self.progress.start_stage("render")
+        returncode, stderr = await self.orchestrator.stage("render", self.run_auto_editor(cmd, "render"))
+        if returncode != 0:
+            self.status("Erro na renderização.", 'red')
+            self.log(stderr, "ERROR")
+            raise RuntimeError("Erro na renderização.")
+        self.progress.finish_stage("render")
+
+    async def smart_render_async(self, video, output, playlist, profile=encode_profiles.DEFAULT_PROFILE, threads=0):
+        """Renderiza a playlist copiando os GOPs inteiros; False se a fonte não permitir"""
+        info = await self.probe_media_async(video)
+        stream = info["video"] or {}
+        video_args = smart_render.encoder_args(stream, encode_profiles.video_args(profile))
+        if video_args is None:
+            self.log(f"Renderização inteligente indisponível para vídeo {stream.get('codec_name')}: "
+                     "usando a renderização normal", "WARNING")
+            return False
+        info = await self.probe_media_async(video, keyframes=True)
+        self.status("Renderização inteligente (cópia de GOPs)...")
+        self.progress.start_stage("render", sum(clip['end'] - clip['start'] for clip in playlist))
+        joined = await self.orchestrator.stage("render", self._smart_render(video, output, playlist, info, video_args,
+                                                                            encode_profiles.audio_args(profile),
+                                                                            threads))
+        if not joined:
+            self.log("Junção da renderização inteligente com erros: usando a renderização normal", "WARNING")
+            self.remove_temp_file(output)
+            return False
+        self.progress.finish_stage("render")
+        self.status("Renderização concluída!", 'green')
+        return True
+
+    async def _smart_render(self, video, output, playlist, info, video_args, audio_args, threads=0):
+        """Renderiza as partes e junta com cópia; False se a saída não decodificar sem erros"""
+        parts = smart_render.plan_parts(playlist, info["keyframes"])
+        self.log_copy_ratio(parts)
+        temp_dir = tempfile.mkdtemp(prefix="smart_")
+        try:
+            part_paths = await self._render_parts(video, parts, temp_dir, video_args,
+                                                  smart_render.timescale_args(info["video"]), audio_args,
+                                                  threads=threads)
+            await self.concat_clips_async(part_paths, output, os.path.join(temp_dir, "filelist.txt"))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return await self.output_decodes(output)
+
+    def log_copy_ratio(self, parts):
+        copied = sum(part['end'] - part['start'] for part in parts if part['mode'] == "copy")
+        total = sum(part['end'] - part['start'] for part in parts) or 1.0
+        self.log(f"Renderização inteligente: {len(parts)} partes, {100 * copied / total:.0f}% copiado sem recodificar", "INFO")
+
+    async def _render_parts(self, video, parts, temp_dir, video_args, extra_args=(), audio_args=("-c:a", "aac"),
+                            maps=("-map", "0:v:0", "-map", "0:a:0?"), threads=0):
+        """Renderiza em paralelo as partes (`smart_render.plan_parts`) em `temp_dir`; devolve os caminhos
+
+        As threads do job (`threads`, ou os núcleos) são divididas entre os ffmpeg simultâneos.
+        """
+        video_args = list(video_args) + ["-threads", str(self.process_threads(threads, len(parts)))]
+        part_paths = [os.path.join(temp_dir, f"part_{i:04d}.mp4") for i in range(len(parts))]
+        rendered = [0.0] * len(parts)
+
+        def report(index, seconds):
+            rendered[index] = seconds
+            self.progress.update(done=sum(rendered), stage="render")
+
+        async def render_part(index):
+            cmd = smart_render.part_command(video, parts[index], part_paths[index], video_args, extra_args,
+                                            audio_args, maps)
+            await self.run_ffmpeg(cmd, check=True, on_seconds=lambda seconds: report(index, seconds),
+                                  error=f"Erro ao renderizar a parte {index}")
+
+        await self.orchestrator.gather(*(render_part(i) for i in range(len(parts))))
+        return part_paths
+
+    def render_reorganized(self, video, output, clips, profile=encode_profiles.DEFAULT_PROFILE):
+        """Renderiza os clipes na ordem da reorganização semântica direto da fonte"""
+        self.begin_run()
+        return self.run_stage(self.render_reorganized_async(video, output, clips, profile))
+
+    async def render_reorganized_async(self, video, output, clips, profile=encode_profiles.DEFAULT_PROFILE):
+        if not clips:
+            raise RuntimeError("Nenhum clipe na nova ordem")
+        clips = [{'start': clip['start'], 'end': clip['end']} for clip in clips]
+        self.progress.plan(["probe", "render"])
+        info = await self.probe_media_async(video)
+        self.progress.start_stage("render", sum(clip['end'] - clip['start'] for clip in clips))
+        started = time.time()
+        try:
+            await self.orchestrator.stage("render", self._render_reorganized(video, output, clips, info, profile))
+        except (asyncio.CancelledError, Cancelled):
+            self.remove_partial_output(output, started)
+            raise
+        self.progress.finish_stage("render")
+        self.log("🎉 Reorganização semântica concluída com sucesso!", "SUCCESS")
+
+    async def _render_reorganized(self, video, output, clips, info, profile):
+        video_args = smart_render.encoder_args(info["video"] or {}, encode_profiles.video_args(profile))
+        audio_args = smart_render.source_audio_args(info["audio"], encode_profiles.get_profile(profile)["audio_bitrate"])
+        maps = smart_render.source_stream_maps(info)
+        video_filter = encode_profiles.frame_filter(profile)
+        if video_args is None or audio_args is None or maps is None or video_filter:
+            if not video_filter:
+                self.log("Fonte sem H.264/AAC nos dois primeiros streams: recodificando os clipes", "WARNING")
+            await self._reencode_clips(video, output, clips, profile)
+            return
+
+        info = await self.probe_media_async(video, keyframes=True)
+        temp_dir = tempfile.mkdtemp(prefix="reorg_")
+        try:
+            # Miolos lidos direto da fonte pelo concat demuxer; só as pontas viram arquivos
+            parts = smart_render.plan_parts(clips, info["keyframes"])
+            self.log_copy_ratio(parts)
+            edges = [part for part in parts if part['mode'] == "encode"]
+            edge_paths = iter(await self._render_parts(video, edges, temp_dir, video_args,
+                                                       smart_render.timescale_args(info["video"]),
+                                                       audio_args, maps))
+            list_path = os.path.join(temp_dir, "reorganized.txt")
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write(smart_render.concat_list(
+                    video, parts, [next(edge_paths) if part['mode'] == "encode" else None for part in parts]
+                ))
+            cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+                   "-map", "0:v:0", "-map", "0:a:0", "-c", "copy", output]
+            self.log(f"Reorganização ffmpeg: {' '.join(map(str, cmd))}", "INFO")
+            await self.run_ffmpeg(cmd, "render", error="Erro ao juntar a reorganização")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        if not await self.output_decodes(output):
+            self.log("Junção da reorganização com erros: recodificando os clipes", "WARNING")
+            self.remove_temp_file(output)
+            await self._reencode_clips(video, output, clips, profile)
+
+    async def _reencode_clips(self, video, output, clips, profile):
+        """Sem cópia possível: cada clipe é recodificado (com busca na entrada) e depois juntado"""
+        video_filter = encode_profiles.frame_filter(profile)
+        temp_dir = tempfile.mkdtemp(prefix="reorg_")
+        try:
+            parts = [dict(clip, mode="encode") for clip in clips]
+            part_paths = await self._render_parts(video, parts, temp_dir, encode_profiles.video_args(profile),
+                                                  ["-vf", video_filter] if video_filter else (),
+                                                  encode_profiles.audio_args(profile))
+            await self.concat_clips_async(part_paths, output, os.path.join(temp_dir, "filelist.txt"))
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def engine_jcut(self, playlist, jcut_duration, input_video, output_video, threads=0, strategy="auto",
+                    profile=encode_profiles.DEFAULT_PROFILE):
+        """Engine modular de J-Cut: sobrepõe áudio entre clipes usando ffmpeg avançado"""
+        self.begin_run()
+        return self.run_stage(self.engine_jcut_async(playlist, jcut_duration, input_video, output_video, threads,
+                                                     strategy, profile))
+
+    async def engine_jcut_async(self, playlist, jcut_duration, input_video, output_video, threads=0, strategy="auto",
+                                profile=encode_profiles.DEFAULT_PROFILE):
+        return await self.orchestrator.stage(
+            "render", self._engine_jcut(playlist, jcut_duration, input_video, output_video, threads, strategy, profile)
+        )
+
+    async def _engine_jcut(self, playlist, jcut_duration, input_video, output_video, threads=0, strategy="auto",
+                           profile=encode_profiles.DEFAULT_PROFILE):
+        if not playlist:
+            raise RuntimeError("Playlist vazia: nada para renderizar")
+        info = await self.probe_media_async(input_video)
+        if info["audio"] is None:
+            raise RuntimeError("O vídeo não tem trilha de áudio: J-Cut indisponível")
+        # Progresso em segundos de vídeo renderizados
+        self.progress.start_stage("render", sum(clip['end'] - clip['start'] for clip in playlist))
+        try:
+            self.log(f"Iniciando engine J-Cut com {len(playlist)} clipes...", "INFO")
+            if jcut.choose_strategy(playlist, strategy) == "single":
+                await self._engine_jcut_single_pass(playlist, jcut_duration, input_video, output_video, threads, profile)
+            else:
+                await self._engine_jcut_clips(playlist, jcut_duration, input_video, output_video, threads, profile)
+            self.progress.finish_stage("render")
+            self.status("J-Cut concluído!", 'green')
+            self.log("J-Cut finalizado com sucesso!", "SUCCESS")
+        except Exception as e:
+            self.status(f"Erro no J-Cut: {e}", 'red')
+            self.log(str(e), "ERROR")
+            raise
+
+    async def _engine_jcut_single_pass(self, playlist, jcut_duration, input_video, output_video, threads=0,
+                                       profile=encode_profiles.DEFAULT_PROFILE):
+        """Um único ffmpeg: a fonte é decodificada uma vez e o resultado codificado uma vez"""
+        # Com centenas de clipes o grafo passa do limite de tamanho da linha de comando
+        fd, script_path = tempfile.mkstemp(prefix="jcut_graph_", suffix=".txt")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(jcut.filter_graph(playlist, jcut_duration, encode_profiles.frame_filter(profile)))
+        try:
+            cmd = [
+                "ffmpeg", "-y", "-i", input_video,
+                "-filter_complex_script", script_path,
+                "-map", "[v_out]", "-map", "[a_out]",
+                *encode_profiles.encode_args(profile, threads), output_video
+            ]
+            self.log(f"J-Cut ffmpeg: {' '.join(map(str,cmd))}", "INFO")
+            await self.run_ffmpeg(cmd, "render", error="Erro ao renderizar o J-Cut")
+        finally:
+            self.remove_temp_file(script_path)
+
+    async def _engine_jcut_clips(self, playlist, jcut_duration, input_video, output_video, threads=0,
+                                 profile=encode_profiles.DEFAULT_PROFILE):
+        """Clipes renderizados em paralelo, cada um buscando direto na sua janela, e concatenados na ordem
+
+        Cada ffmpeg decodifica só o próprio clipe e a antecipação do áudio. O
+        número de clipes simultâneos segue o limite de processos do orquestrador,
+        e as threads do job são divididas entre eles.
+        Com intermediários sem perdas (perfil), a junção faz a codificação final.
+        """
+        workers = min(len(playlist), self.orchestrator.max_processes)
+        clip_threads = self.process_threads(threads, len(playlist))
+        encode_args, suffix = encode_profiles.intermediate_args(profile, clip_threads)
+        video_filter = encode_profiles.frame_filter(profile)
+        final_args = None
+        program = sum(clip['end'] - clip['start'] for clip in playlist)
+        if encode_profiles.needs_final_encode(profile):
+            final_args = encode_profiles.encode_args(profile, threads)
+            # A codificação final percorre o programa de novo: conta em dobro no progresso
+            self.progress.set_total(2 * program, "render")
+        self.log(f"Renderizando {len(playlist)} clipes ({workers} em paralelo)...", "INFO")
+        temp_dir = tempfile.mkdtemp(prefix="jcut_")
+        clip_paths = [os.path.join(temp_dir, f"temp_clip_{i:04d}{suffix}") for i in range(len(playlist))]
+        # Segundos renderizados de cada clipe; o progresso da etapa é a soma
+        rendered = [0.0] * len(playlist)
+
+        def report(index, seconds):
+            rendered[index] = seconds
+            self.progress.update(done=sum(rendered), stage="render")
+
+        async def render_clip(index):
+            cmd = jcut.clip_command(playlist, index, jcut_duration, input_video, clip_paths[index], encode_args,
+                                    video_filter)
+            for attempt in range(1, JCUT_CLIP_ATTEMPTS + 1):
+                returncode, stderr = await self.run_ffmpeg(
+                    cmd, check=False, on_seconds=lambda seconds: report(index, seconds)
+                )
+                if returncode == 0:
+                    return
+                rendered[index] = 0.0
+                self.log(f"Clipe {index} falhou (tentativa {attempt}/{JCUT_CLIP_ATTEMPTS}): {stderr}", "WARNING")
+            raise RuntimeError(f"Erro ao renderizar clipe {index} ({playlist[index]['start']:.2f}s-"
+                               f"{playlist[index]['end']:.2f}s) após {JCUT_CLIP_ATTEMPTS} tentativas")
+
+        try:
+            await self.orchestrator.gather(*(render_clip(i) for i in range(len(playlist))))
+            await self.concat_clips_async(clip_paths, output_video, os.path.join(temp_dir, "filelist.txt"), final_args,
+                                          offset=program if final_args else 0.0)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def process_threads(self, threads, count):
+        """Threads de cada um de `count` ffmpeg paralelos: as do job (ou os núcleos) divididas entre eles"""
+        workers = max(1, min(count, self.orchestrator.max_processes))
+        return max(1, (threads or os.cpu_count() or 1) // workers)
+
+    async def concat_clips_async(self, clip_files, output, filelist_path, encode_args=None, offset=0.0):
+        """Junta clipes já renderizados com o concat demuxer do ffmpeg
+
+        Sem `encode_args`, os streams são copiados; com eles, a junção é a codificação final.
+        """
+        with open(filelist_path, 'w', encoding='utf-8') as f:
+            for clip_file in clip_files:
+                f.write(f"file '{clip_file}'\n")
+        codec_args = list(encode_args) if encode_args else ["-c", "copy"]
+        cmd_concat = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", filelist_path, *codec_args, output]
+        self.log(f"Concat ffmpeg: {' '.join(map(str,cmd_concat))}", "INFO")
+        await self.run_ffmpeg(cmd_concat, offset=offset, error="Erro no ffmpeg")
+
+    async def output_decodes(self, path):
+        """Decodifica a saída inteira sem gravar nada; False se o ffmpeg acusar algum erro
+
+        Juntar com `-c copy` partes recodificadas e GOPs da fonte só dá certo se
+        os parâmetros do codificador casarem com os da fonte; esta leitura pega
+        as junções quebradas antes de a saída ser entregue.
+        """
+        self.status("Verificando a junção...")
+        cmd = ["ffmpeg", "-v", "error", "-i", path, "-map", "0:v:0?", "-map", "0:a:0?", "-f", "null", "-"]
+        returncode, stderr = await self.run_ffmpeg(cmd, check=False, on_seconds=lambda seconds: None)
+        if returncode != 0 or stderr.strip():
+            self.log(f"Erros ao decodificar {path}: {stderr.strip()[-500:]}", "WARNING")
+            return False
+        return True
+
+    async def extract_audio_async(self, video, audio_format="pcm", source=None):
+        """Extrai a trilha de fala do vídeo em uma única passada do ffmpeg
+
+        `pcm`: WAV 16 kHz mono, o formato que o Whisper usa internamente (sem
+        codificação nem reamostragem depois). `opus`: Ogg/Opus 16 kHz mono a
+        24 kbps, compacto para envio à API (~11 MB por hora de áudio).
+        Com `source` (o proxy de análise), o áudio é lido dele e não do original.
+        """
+        settings = AUDIO_FORMATS[audio_format]
+        fd, audio_file = tempfile.mkstemp(prefix="temp_audio_", suffix=settings["suffix"])
+        os.close(fd)
+
+        cmd = [
+            'ffmpeg', '-y', '-i', source or video,
+            '-map', '0:a:0', '-vn', '-sn', '-dn',
+            '-ac', '1', '-ar', str(SPEECH_SAMPLE_RATE),
+            *settings["codec"], audio_file
+        ]
+
+        self.log(f"Extraindo áudio: {' '.join(cmd)}", "INFO")
+        self.progress.start_stage("audio", (await self.probe_media_async(video))["duration"])
+        try:
+            returncode, stderr = await self.orchestrator.stage("audio", self.run_ffmpeg(cmd, "audio", check=False))
+        except BaseException:
+            self.remove_temp_file(audio_file)
+            raise
+        if returncode != 0:
+            self.log(f"Erro ao extrair áudio: {stderr}", "ERROR")
+            self.remove_temp_file(audio_file)
+            raise RuntimeError("Erro ao extrair áudio")
+        self.progress.finish_stage("audio")
+
+        self.log(f"Áudio extraído: {audio_file}", "INFO")
+        return audio_file
+
+    def probe_media(self, path, persist=True, keyframes=False):
+        """Sondagem da mídia (streams, duração, fps), feita uma vez por arquivo
+
+        Com `keyframes`, inclui o índice de keyframes (`info["keyframes"]`),
+        que exige varrer os pacotes do vídeo: só a renderização inteligente e a
+        reorganização pedem. Com `persist`, o resultado fica no cache em disco
+        para as próximas execuções.
+        """
+        memo_key = self._media_info_key(path)
+        with self._media_info_lock:
+            info = self._media_info.get(memo_key)
+        if info is None and persist:
+            info = self.probe_cache.get(path)
+        changed = info is None
+        if info is None:
+            info = media_probe.probe(path)
+        if keyframes and "keyframes" not in info:
+            duration = info["duration"]
+
+            def on_progress(seconds):
+                if duration:
+                    self.progress.update(percent=100.0 * seconds / duration, stage="keyframes")
+
+            info = media_probe.with_keyframes(path, info, on_progress, self.cancel_token)
+            changed = True
+        if changed and persist:
+            try:
+                self.probe_cache.put(path, info)
+            except OSError as e:
+                self.log(f"Não foi possível salvar a sondagem no cache: {e}", "WARNING")
+        with self._media_info_lock:
+            self._media_info[memo_key] = info
+        return info
+
+    def _media_info_key(self, path):
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    async def probe_media_async(self, path, keyframes=False):
+        """`probe_media` como etapa "probe" do pipeline (com `keyframes`, mais a etapa "keyframes")"""
+        with self._media_info_lock:
+            info = self._media_info.get(self._media_info_key(path))
+        if info is None:
+            self.progress.start_stage("probe")
+            info = await self.orchestrator.stage("probe", self.orchestrator.call(self.probe_media, path))
+            self.progress.finish_stage("probe")
+        if keyframes and "keyframes" not in info:
+            self.progress.start_stage("keyframes")
+            info = await self.orchestrator.stage("keyframes", self.orchestrator.call(
+                self.probe_media, path, keyframes=True
+            ))
+            self.progress.finish_stage("keyframes")
+        return info
+
+    # ------------------------------------------------------------------
+    # Execução de ferramentas com progresso
+    # ------------------------------------------------------------------
+
+    async def run_ffmpeg(self, cmd, stage=None, offset=0.0, check=True, error="Erro no ffmpeg", on_seconds=None):
+        """Executa o ffmpeg com `-progress`; o tempo processado soma-se a `offset` na etapa `stage`
+
+        Com `on_seconds`, o tempo processado vai para o callback em vez do
+        progresso (ex.: vários ffmpeg em paralelo na mesma etapa).
+        Devolve (returncode, final do stderr).
+        """
+        parser = FfmpegProgressParser()
+
+        def on_line(line):
+            update = parser.feed(line)
+            if update and "seconds" in update:
+                if on_seconds:
+                    on_seconds(update["seconds"])
+                    return
+                self.progress.update(done=offset + update["seconds"], speed=update.get("speed"),
+                                     fps=update.get("fps"), stage=stage)
+
+        returncode, stderr = await self.orchestrator.run_process(with_ffmpeg_progress(cmd), on_stdout=on_line)
+        if check and returncode != 0:
+            raise RuntimeError(f"{error}: {stderr}")
+        return returncode, stderr
+
+    async def run_auto_editor(self, cmd, stage=None):
+        """Executa o auto-editor com `--progress machine`, repassando a porcentagem à etapa `stage`"""
+        def on_line(line):
+            update = parse_auto_editor_progress(line)
+            if update:
+                self.progress.update(percent=update["percent"], stage=stage)
+
+        return await self.orchestrator.run_process(with_auto_editor_progress(cmd), on_stdout=on_line)
+
+    def remove_temp_file(self, path):
+        """Remove um arquivo temporário, ignorando se já não existir"""
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            self.log(f"Erro ao remover arquivo temporário: {str(e)}", "WARNING")
+
+    # ------------------------------------------------------------------
+    # Transcrição
+    # ------------------------------------------------------------------
+
+    def transcribe_video(self, video, mode="local", model_name="base", use_gpu=False, workers=0, source=None,
+                         use_proxy=False, threads=0):
+        """Transcreve o vídeo, reaproveitando o cache de transcrições quando possível
+
+        O cache é indexado pelo original; o áudio é lido de `source` (proxy) se
+        informado, ou do proxy de análise gerado aqui com `use_proxy`.
+        `threads` é o orçamento de threads do job para o Whisper local (0 = núcleos).
+        """
+        self.begin_run()
+        return self.run_stage(self.transcribe_video_async(video, mode, model_name, use_gpu, workers, source,
+                                                          use_proxy, threads))
+
+    async def transcribe_video_async(self, video, mode="local", model_name="base", use_gpu=False, workers=0,
+                                     source=None, use_proxy=False, threads=0):
+        result = self.load_cached_transcription(video, mode, model_name)
+        if result is not None:
+            for stage in (("proxy",) if use_proxy else ()) + ("audio", "transcription"):
+                self.progress.start_stage(stage)
+                self.progress.finish_stage(stage)
+            return result
+        if source is None and use_proxy:
+            source = await self.analysis_proxy_async(video)
+        audio_path = await self.extract_audio_async(video, source=source)
+        try:
+            # Whisper e SDK da OpenAI são bloqueantes: rodam em uma thread do orquestrador
+            result = await self.orchestrator.stage("transcription", self.orchestrator.call(
+                self.transcribe, audio_path, mode, model_name, use_gpu, workers, threads
+            ))
+        finally:
+            self.remove_temp_file(audio_path)
+        self.store_transcription(video, mode, model_name, result)
+        return result
+
+    def load_cached_transcription(self, video, mode="local", model_name="base"):
+        """Transcrição salva para este vídeo/motor/modelo, ou None"""
+        result = self.transcription_cache.get(video, mode, "whisper-1" if mode == "api" else model_name)
+        if result is not None:
+            self.log("Transcrição encontrada no cache; extração e transcrição puladas", "SUCCESS")
+        return result
+
+    def store_transcription(self, video, mode, model_name, result):
+        """Salva a transcrição no cache (falhas de disco não interrompem o pipeline)"""
+        try:
+            self.transcription_cache.put(video, mode, "whisper-1" if mode == "api" else model_name, result)
+        except OSError as e:
+            self.log(f"Não foi possível salvar a transcrição no cache: {e}", "WARNING")
+
+    def transcribe(self, audio_file, mode="local", model_name="base", use_gpu=False, workers=0, threads=0):
+        """Transcreve o áudio com timestamps por palavra (API OpenAI ou Whisper local)"""
+        self.progress.start_stage("transcription")
+        if mode == "api":
+            self.log("Transcrevendo via API OpenAI...", "INFO")
+            result = self.transcribe_with_openai_api(audio_file, workers)
+        else:
+            if not providers.is_available("whisper"):
+                raise RuntimeError("Biblioteca whisper não instalada")
+            with self.whisper_slots or nullcontext():
+                result = self.transcribe_with_local_whisper(audio_file, model_name, use_gpu, workers, threads)
+        self.progress.finish_stage("transcription")
+        return result
+
+    def transcribe_with_local_whisper(self, audio_file, model_name="base", use_gpu=False, workers=0, budget=0):
+        """Transcreve com o Whisper local nos workers persistentes
+
+        Em CPU, áudios longos são divididos nos silêncios e os blocos são
+        transcritos em paralelo por um pool dimensionado pelos núcleos (ou pelo
+        orçamento de threads do job, `budget`) e pela RAM.
+        """
+        device = "cuda" if use_gpu else "cpu"
+        size, threads = (1, budget) if use_gpu else whisper_worker.plan_pool(model_name, workers, threads=budget)
+        chunks = [{"index": 0, "start": 0.0, "end": None}]
+        if size > 1:
+            duration = chunked_transcription.audio_duration(audio_file)
+            max_seconds = max(LOCAL_MIN_CHUNK_SECONDS, duration / size)
+            chunks = chunked_transcription.split_audio(audio_file, max_seconds, duration, self.cancel_token)
+            self.progress.set_total(duration, "transcription")
+        size = min(size, len(chunks))
+        # Um só worker usa todo o orçamento do job (sem orçamento, o torch decide)
+        pool = whisper_worker.get_pool(size, threads if size > 1 else budget)
+        self.log(f"Transcrevendo com Whisper {model_name} ({device}): {len(chunks)} bloco(s), "
+                 f"{size} worker(s) persistente(s)...", "INFO")
+        pcm = AUDIO_FORMATS["pcm"]
+
+        token = self.cancel_token
+
+        def transcribe_chunk(chunk):
+            token.raise_if_cancelled()
+            chunk_file = audio_file
+            if len(chunks) > 1:
+                chunk_file = chunked_transcription.encode_chunk(audio_file, chunk, pcm["codec"], pcm["suffix"], token)
+            try:
+                result, info = pool.transcribe(chunk_file, model_name, device, word_timestamps=True, fp16=use_gpu)
+            finally:
+                if chunk_file != audio_file:
+                    self.remove_temp_file(chunk_file)
+            if info["load_seconds"]:
+                self.log(f"Modelo {model_name} carregado em {info['load_seconds']:.1f} s", "INFO")
+            if len(chunks) > 1:
+                self.log(f"Bloco {chunk['index'] + 1}/{len(chunks)} transcrito", "INFO")
+                self.progress.advance(chunk["end"] - chunk["start"], "transcription")
+            return result
+
+        # Cancelar derruba os workers ocupados (o modelo é recarregado na próxima vez)
+        with token.on_cancel(pool.abort):
+            results = chunked_transcription.transcribe_chunks(chunks, transcribe_chunk, size)
+        if len(chunks) == 1:
+            return results[0]
+        return chunked_transcription.merge_transcriptions(chunks, results)
+
+    def transcribe_with_openai_api(self, audio_file, workers=0):
+        """Transcreve usando API da OpenAI
+
+        O áudio é dividido nos silêncios em blocos de até API_CHUNK_SECONDS,
+        codificados em Opus (bem abaixo do limite de 25 MB por envio) e enviados
+        em paralelo; as palavras são costuradas com os deslocamentos de cada bloco.
+        """
+        api_key = self.api_keys.get("openai")
+        if not api_key:
+            raise RuntimeError("API Key da OpenAI não configurada")
+
+        client = providers.load("openai").OpenAI(api_key=api_key)
+        token = self.cancel_token
+        chunks = chunked_transcription.split_audio(audio_file, API_CHUNK_SECONDS, token=token)
+        self.progress.set_total(chunks[-1]["end"], "transcription")
+        workers = workers or API_PARALLELISM
+        self.log(f"Enviando {len(chunks)} bloco(s) de áudio para a API ({min(workers, len(chunks))} em paralelo)...", "INFO")
+        opus = AUDIO_FORMATS["opus"]
+
+        def transcribe_chunk(chunk):
+            token.raise_if_cancelled()
+            chunk_file = chunked_transcription.encode_chunk(audio_file, chunk, opus["codec"], opus["suffix"], token)
+            try:
+                with open(chunk_file, "rb") as audio:
+                    transcript = client.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=audio,
+                        response_format="verbose_json",
+                        timestamp_granularities=["word", "segment"]
+                    )
+            finally:
+                self.remove_temp_file(chunk_file)
+            self.log(f"Bloco {chunk['index'] + 1}/{len(chunks)} transcrito", "INFO")
+            self.progress.advance(chunk["end"] - chunk["start"], "transcription")
+            return transcript.model_dump()
+
+        # Fechar o cliente aborta os envios em andamento
+        with token.on_cancel(client.close):
+            results = chunked_transcription.transcribe_chunks(chunks, transcribe_chunk, workers)
+        token.raise_if_cancelled()
+        return chunked_transcription.merge_transcriptions(chunks, results)
+
+    # ------------------------------------------------------------------
+    # LLM
+    # ------------------------------------------------------------------
+
+    def call_llm_api(self, provider, model, prompt, system_prompt=None):
+        """Chama a API do LLM selecionado"""
+        if provider == "openai":
+            return self.call_openai_api(model, prompt, system_prompt)
+        elif provider == "gemini":
+            return self.call_gemini_api(model, prompt, system_prompt)
+        else:
+            raise ValueError(f"Provedor não suportado: {provider}")
+
+    def call_llm(self, provider, model, prompt, system_prompt=None, stage="llm_errors"):
+        """Chamada avulsa ao LLM (GUI) com o tempo limite da etapa `stage`"""
+        self.begin_run()
+        orchestrator = self.orchestrator
+        return self.run_stage(orchestrator.stage(
+            stage, orchestrator.call(self.call_llm_api, provider, model, prompt, system_prompt)
+        ))
+
+    def call_openai_api(self, model, prompt, system_prompt=None):
+        """Chama a API da OpenAI"""
+        api_key = self.api_keys.get("openai")
+        if not api_key:
+            raise RuntimeError("API Key da OpenAI não configurada")
+
+        client = providers.load("openai").OpenAI(api_key=api_key)
+
+        # Fechar o cliente aborta a requisição em andamento
+        with self.cancel_token.on_cancel(client.close):
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system_prompt or "Você é um especialista em edição de vídeo e análise de fala. Responda apenas com JSON válido."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=4000
+            )
+
+        return response.choices[0].message.content
+
+    def call_gemini_api(self, model, prompt, system_prompt=None):
+        """Chama a API do Google Gemini"""
+        api_key = self.api_keys.get("gemini")
+        if not api_key:
+            raise RuntimeError("API Key do Google Gemini não configurada")
+
+        genai = providers.load("gemini")
+        genai.configure(api_key=api_key)
+        model_instance = genai.GenerativeModel(model)
+
+        if system_prompt:
+            prompt = system_prompt + "\n" + prompt
+        response = model_instance.generate_content(prompt)
+        return response.text
+
+    async def llm_analyze_errors_async(self, job, transcription, segments, prompt):
+        """Chama o LLM para análise de erros de fala. Retorna lista de timestamps."""
+        provider = job["llm_provider"]
+        self.progress.start_stage("llm_errors")
+        if not providers.is_available("gemini" if provider == "gemini" else "openai"):
+            self.log("Nenhum LLM disponível. Retornando lista vazia.", "WARNING")
+            self.progress.finish_stage("llm_errors")
+            return []
+        try:
+            self.log("Chamando LLM para análise de erros de fala...", "INFO")
+            # Espera-se que o LLM retorne JSON: {"errors": [{"start":..., "end":...}, ...]}
+            content = await self.orchestrator.stage("llm_errors", self.orchestrator.call(
+                self.call_llm_api, provider, job["llm_model"], transcription, system_prompt=prompt
+            ))
+            self.progress.finish_stage("llm_errors")
+            try:
+                errors = json.loads(content).get('errors', [])
+            except Exception:
+                self.log(f"Resposta do LLM não é JSON ({len(content or '')} caracteres). Retornando vazio.", "WARNING")
+                return []
+            self.log(f"Resposta LLM: {len(content)} caracteres, {len(errors)} erros", "INFO")
+            return errors
+        except (StageTimeout, Cancelled):
+            # Tempo limite e cancelamento encerram o job; só falhas da API caem no resultado padrão
+            raise
+        except Exception as e:
+            self.log(f"Erro ao chamar LLM: {e}", "ERROR")
+            return []
+
+    async def llm_analyze_narrative_async(self, job, transcription, segments, prompt):
+        """Chama o LLM para análise de narrativa. Retorna playlist e clipes a excluir."""
+        default_playlist = [{'start': seg['start'], 'end': seg['end']} for seg in segments]
+        provider = job["llm_provider"]
+        self.progress.start_stage("llm_narrative")
+        if not providers.is_available("gemini" if provider == "gemini" else "openai"):
+            self.log("Nenhum LLM disponível. Retornando playlist padrão.", "WARNING")
+            self.progress.finish_stage("llm_narrative")
+            return default_playlist, []
+        try:
+            self.log("Chamando LLM para análise de narrativa...", "INFO")
+            content = await self.orchestrator.stage("llm_narrative", self.orchestrator.call(
+                self.call_llm_api, provider, job["llm_model"], transcription, system_prompt=prompt
+            ))
+            self.progress.finish_stage("llm_narrative")
+            try:
+                parsed = json.loads(content)
+                playlist, to_exclude = parsed.get('playlist', []), parsed.get('to_exclude', [])
+            except Exception:
+                self.log(f"Resposta do LLM não é JSON ({len(content or '')} caracteres). Usando playlist padrão.", "WARNING")
+                return default_playlist, []
+            self.log(f"Resposta LLM: {len(content)} caracteres, {len(playlist)} clipes na playlist, "
+                     f"{len(to_exclude)} a excluir", "INFO")
+            return playlist, to_exclude
+        except (StageTimeout, Cancelled):
+            # Tempo limite e cancelamento encerram o job; só falhas da API caem no resultado padrão
+            raise
+        except Exception as e:
+            self.log(f"Erro ao chamar LLM: {e}", "ERROR")
+            return default_playlist, []
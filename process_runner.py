@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Execução de ferramentas externas (ffmpeg, ffprobe, auto-editor) sem travar em pipes
+
+Um processo com `stdout=PIPE` e `stderr=PIPE` para de rodar quando um dos
+pipes enche e ninguém o lê. Aqui cada stream tem sua própria thread de
+leitura: as linhas são entregues a callbacks (console, parser de progresso)
+assim que chegam e só as últimas `tail_lines` ficam guardadas para
+mensagens de erro, por mais longa que seja a saída.
+
+Cada processo inicia em um grupo próprio: parar (ou cancelar pelo token)
+encerra também os filhos que ele tenha criado (o auto-editor chama o ffmpeg).
+
+Código assíncrono (ver `orchestrator.Orchestrator.run_process`) usa o mesmo
+`RunningProcess` e aguarda o fim por `wait_async`.
+"""
+
+import asyncio
+import collections
+import os
+import signal
+import subprocess
+import threading
+
+TAIL_LINES = 200  # linhas finais de cada stream guardadas para relatórios de erro
+KILL_GRACE_SECONDS = 0.5  # espera entre SIGTERM e SIGKILL ao parar um processo
+
+
+def process_group_kwargs():
+    """Argumentos do Popen para iniciar o processo em um grupo próprio"""
+    if os.name == "posix":
+        return {"start_new_session": True}
+    return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+def signal_process_group(process, hard=False):
+    """SIGTERM (ou SIGKILL) para o grupo inteiro do processo; no Windows, terminate/kill"""
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL if hard else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+    else:
+        try:
+            process.kill() if hard else process.terminate()
+        except (ProcessLookupError, OSError):
+            pass
+
+
+class RunningProcess:
+    """Processo em execução com stdout e stderr drenados em paralelo"""
+
+    def __init__(self, cmd, on_stdout=None, on_stderr=None, tail_lines=TAIL_LINES, token=None, **popen_kwargs):
+        self.cmd = [str(part) for part in cmd]
+        self.stdout_tail = collections.deque(maxlen=tail_lines)
+        self.stderr_tail = collections.deque(maxlen=tail_lines)
+        self.token = token
+        self._callback_error = None
+        if token is not None:
+            token.raise_if_cancelled()
+        # Texto com newlines universais: o '\r' das barras de progresso também encerra a linha
+        self.process = subprocess.Popen(
+            self.cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace', bufsize=1,
+            **process_group_kwargs(), **popen_kwargs
+        )
+        self._cancel_handle = token.register(self.stop) if token is not None else None
+        self._readers = [
+            threading.Thread(target=self._drain, args=(self.process.stdout, self.stdout_tail, on_stdout),
+                             name="stdout-reader", daemon=True),
+            threading.Thread(target=self._drain, args=(self.process.stderr, self.stderr_tail, on_stderr),
+                             name="stderr-reader", daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+
+    def _drain(self, stream, tail, callback):
+        with stream:
+            for line in stream:
+                line = line.rstrip("\n")
+                if not line:
+                    continue
+                tail.append(line)
+                if callback is None or self._callback_error is not None:
+                    continue
+                try:
+                    callback(line)
+                except Exception as e:
+                    # Continua drenando (senão o processo trava); o erro sobe em wait()
+                    self._callback_error = e
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    @property
+    def stdout(self):
+        return "\n".join(self.stdout_tail)
+
+    @property
+    def stderr(self):
+        return "\n".join(self.stderr_tail)
+
+    def poll(self):
+        return self.process.poll()
+
+    def wait(self, timeout=None):
+        """Espera o processo e a leitura dos streams; devolve o código de saída"""
+        returncode = self.process.wait(timeout)
+        for reader in self._readers:
+            reader.join()
+        if self.token is not None:
+            self.token.unregister(self._cancel_handle)
+            self.token.raise_if_cancelled()
+        if self._callback_error is not None:
+            raise self._callback_error
+        return returncode
+
+    def wait_async(self):
+        """Future do loop atual com o código de saída (`wait` roda em uma thread própria)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(returncode, error):
+            if future.done():
+                return  # quem esperava foi cancelado
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(returncode)
+
+        def waiter():
+            try:
+                outcome = (self.wait(), None)
+            except BaseException as e:
+                outcome = (None, e)
+            try:
+                loop.call_soon_threadsafe(resolve, *outcome)
+            except RuntimeError:
+                pass  # loop já encerrado
+
+        threading.Thread(target=waiter, name="process-waiter", daemon=True).start()
+        return future
+
+    def terminate(self):
+        if self.process.poll() is None:
+            signal_process_group(self.process)
+
+    def kill(self):
+        if self.process.poll() is None:
+            signal_process_group(self.process, hard=True)
+
+    def stop(self, grace=KILL_GRACE_SECONDS):
+        """Encerra o grupo do processo; quem não sair em `grace` segundos recebe SIGKILL"""
+        self.terminate()
+        timer = threading.Timer(grace, self.kill)
+        timer.daemon = True
+        timer.start()
+
+
+def start(cmd, on_stdout=None, on_stderr=None, tail_lines=TAIL_LINES, token=None, **popen_kwargs):
+    """Inicia `cmd` em segundo plano; use `.wait()` para o resultado"""
+    return RunningProcess(cmd, on_stdout, on_stderr, tail_lines, token, **popen_kwargs)
+
+
+def run(cmd, on_stdout=None, on_stderr=None, tail_lines=TAIL_LINES, token=None, **popen_kwargs):
+    """Executa `cmd` até o fim; o retorno tem `returncode`, `stdout` e `stderr` (finais da saída)
+
+    Com `token`, o cancelamento encerra o processo e `Cancelled` é levantada.
+    """
+    running = start(cmd, on_stdout, on_stderr, tail_lines, token, **popen_kwargs)
+    running.wait()
+    return running
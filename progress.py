@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Progresso determinado das etapas do pipeline
+
+O ffmpeg é executado com `-progress pipe:1` (blocos `chave=valor` com o tempo
+já processado, fps e velocidade) e o auto-editor com `--progress machine`
+(`título~atual~total~...`). Os dois parsers alimentam um `ProgressTracker`,
+que conhece as etapas planejadas e seus pesos e informa, por callback,
+porcentagem, velocidade (x tempo real), fps e ETA da etapa e do pipeline.
+"""
+
+import re
+import threading
+import time
+
+FFMPEG_PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+AUTO_EDITOR_PROGRESS_ARGS = ["--progress", "machine"]
+MIN_UPDATE_INTERVAL = 0.25  # segundos entre atualizações enviadas ao callback
+
+# Nome da etapa -> (rótulo, peso no progresso total)
+STAGES = {
+    "probe": ("Análise da mídia", 1),
+    "keyframes": ("Índice de keyframes", 1),
+    "proxy": ("Proxy de análise", 2),
+    "silence": ("Análise de silêncio", 1),
+    "audio": ("Extração de áudio", 1),
+    "transcription": ("Transcrição", 4),
+    "llm_errors": ("LLM: erros de fala", 1),
+    "llm_narrative": ("LLM: narrativa", 1),
+    "render": ("Renderização", 4),
+    "concat": ("Junção dos clipes", 1),
+}
+
+_PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+
+def with_ffmpeg_progress(cmd):
+    """Comando do ffmpeg com saída de progresso legível por máquina no stdout"""
+    return [cmd[0], *FFMPEG_PROGRESS_ARGS, *cmd[1:]]
+
+
+def with_auto_editor_progress(cmd):
+    return [*cmd, *AUTO_EDITOR_PROGRESS_ARGS]
+
+
+class FfmpegProgressParser:
+    """Lê os blocos de `-progress` e devolve um dict a cada bloco completo"""
+
+    def __init__(self):
+        self._block = {}
+
+    def feed(self, line):
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        self._block[key] = value.strip()
+        if key != "progress":
+            return None
+        block, self._block = self._block, {}
+        update = {"done": value.strip() == "end"}
+        out_time = block.get("out_time_us") or block.get("out_time_ms")  # ambos em microssegundos
+        if out_time and out_time.lstrip("-").isdigit():
+            update["seconds"] = max(0, int(out_time)) / 1_000_000
+        speed = block.get("speed", "").rstrip("x")
+        try:
+            update["speed"] = float(speed)
+        except ValueError:
+            pass
+        try:
+            update["fps"] = float(block.get("fps", ""))
+        except ValueError:
+            pass
+        return update
+
+
+def parse_auto_editor_progress(line):
+    """Porcentagem de uma linha de progresso do auto-editor, ou None"""
+    parts = line.strip().split("~")
+    if len(parts) >= 3:
+        try:
+            index, total = float(parts[1]), float(parts[2])
+        except ValueError:
+            pass
+        else:
+            if total > 0:
+                return {"title": parts[0], "percent": min(100.0, 100.0 * index / total)}
+    match = _PERCENT_RE.search(line)
+    if match:
+        return {"percent": min(100.0, float(match.group(1)))}
+    return None
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def format_progress(snapshot):
+    """Linha curta para status e terminal"""
+    parts = [f"{snapshot['label']}: {snapshot['stage_percent']:.0f}%"]
+    if snapshot.get("speed"):
+        parts.append(f"{snapshot['speed']:.1f}x")
+    if snapshot.get("fps"):
+        parts.append(f"{snapshot['fps']:.0f} fps")
+    parts.append(f"ETA {format_eta(snapshot.get('stage_eta'))}")
+    return (" · ".join(parts)
+            + f" (total {snapshot['percent']:.0f}%, ETA {format_eta(snapshot.get('eta'))})")
+
+
+class ProgressTracker:
+    """Progresso ponderado das etapas planejadas de um pipeline (seguro em threads)
+
+    Etapas podem correr ao mesmo tempo (ex.: análise de silêncio e
+    transcrição); cada uma tem seu estado e as atualizações podem indicar a
+    etapa (`stage=`). Sem ela, vale a etapa iniciada por último.
+    """
+
+    def __init__(self, on_update=None, min_interval=MIN_UPDATE_INTERVAL, clock=time.monotonic):
+        self.on_update = on_update
+        self.min_interval = min_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+        self.plan([])
+
+    def plan(self, stage_names):
+        """Define as etapas do pipeline (nomes de `STAGES`) e zera o progresso"""
+        with self._lock:
+            self.stages = list(stage_names)
+            self.fractions = {name: 0.0 for name in self.stages}
+            self.states = {}
+            self.started = self.clock()
+            self.stage = None      # etapa exibida (a que informou progresso por último)
+            self.current = None    # etapa iniciada por último
+
+    def start_stage(self, name, total=None):
+        """Inicia uma etapa; `total` é a duração de mídia (segundos) que ela vai processar"""
+        with self._lock:
+            if name not in self.fractions:
+                # Etapa fora do plano (ex.: J-Cut chamado diretamente): entra no fim
+                self.stages.append(name)
+                self.fractions[name] = 0.0
+            self.states[name] = {"total": total, "done": 0.0, "started": self.clock(), "speed": None, "fps": None}
+            self.stage = self.current = name
+        self._emit(force=True)
+
+    def _state(self, stage):
+        name = stage or self.current
+        return name, self.states.get(name)
+
+    def set_total(self, total, stage=None):
+        with self._lock:
+            _, state = self._state(stage)
+            if state is not None:
+                state["total"] = total
+
+    def update(self, done=None, percent=None, speed=None, fps=None, stage=None):
+        """Atualiza uma etapa por segundos processados (`done`) ou por porcentagem"""
+        with self._lock:
+            self._update(stage, done, percent, speed, fps)
+        self._emit()
+
+    def advance(self, seconds, stage=None):
+        """Soma `seconds` de mídia concluídos à etapa (ex.: um bloco transcrito)"""
+        with self._lock:
+            _, state = self._state(stage)
+            if state is not None:
+                self._update(stage, state["done"] + seconds, None, None, None)
+        self._emit()
+
+    def _update(self, stage, done, percent, speed, fps):
+        name, state = self._state(stage)
+        if state is None:
+            return
+        if done is not None and state["total"]:
+            fraction = done / state["total"]
+            state["done"] = done
+        elif percent is not None:
+            fraction = percent / 100.0
+        else:
+            fraction = self.fractions[name]
+        self.fractions[name] = min(1.0, max(self.fractions[name], fraction))
+        if speed is not None:
+            state["speed"] = speed
+        if fps is not None:
+            state["fps"] = fps
+        self.stage = name
+
+    def finish_stage(self, stage=None):
+        with self._lock:
+            name, state = self._state(stage)
+            if state is None:
+                return
+            self.fractions[name] = 1.0
+            self.stage = name
+        self._emit(force=True)
+
+    def snapshot(self):
+        with self._lock:
+            now = self.clock()
+            stage = self.stage
+            state = self.states.get(stage) or {"total": None, "done": 0.0, "started": now, "speed": None, "fps": None}
+            fraction = self.fractions.get(stage, 0.0)
+            stage_eta = None
+            if fraction >= 1.0:
+                stage_eta = 0.0
+            elif state["speed"] and state["total"]:
+                # Mídia restante dividida pela velocidade de processamento
+                stage_eta = (state["total"] - state["done"]) / state["speed"]
+            elif fraction > 0:
+                stage_eta = (now - state["started"]) * (1 - fraction) / fraction
+
+            weights = {name: STAGES.get(name, (name, 1))[1] for name in self.stages}
+            total_weight = sum(weights.values()) or 1
+            overall = sum(weights[name] * self.fractions[name] for name in self.stages) / total_weight
+            eta = (now - self.started) * (1 - overall) / overall if overall > 0 else None
+
+            return {
+                "stage": stage,
+                "label": STAGES.get(stage, (stage or "", 1))[0],
+                "stage_percent": 100.0 * fraction,
+                "percent": 100.0 * overall,
+                "speed": state["speed"],
+                "fps": state["fps"],
+                "stage_eta": stage_eta,
+                "eta": eta,
+                "elapsed": now - self.started,
+            }
+
+    def _emit(self, force=False):
+        if not self.on_update:
+            return
+        now = self.clock()
+        if not force and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        self.on_update(self.snapshot())
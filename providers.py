@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Carregamento preguiçoso dos backends pesados (Whisper, OpenAI, Gemini)
+
+Importar `whisper` puxa o torch inteiro, e `openai` / `google.generativeai`
+também custam alguns segundos e centenas de MB. Este módulo só verifica se as
+bibliotecas estão instaladas (sem importá-las) e faz o import real na primeira
+vez que uma etapa precisa do backend.
+"""
+
+import importlib
+import importlib.util
+import threading
+
+# Nome lógico do provedor -> módulo Python correspondente
+PROVIDER_MODULES = {
+    "whisper": "whisper",
+    "openai": "openai",
+    "gemini": "google.generativeai",
+}
+
+_loaded = {}
+_available = {}
+_lock = threading.Lock()
+
+
+def is_available(name):
+    """Indica se o provedor está instalado, sem importar o módulo"""
+    if name in _loaded:
+        return True
+    if name not in _available:
+        module_name = PROVIDER_MODULES[name]
+        try:
+            _available[name] = importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            # find_spec importa os pacotes pai (ex.: `google`); se falhar, não está disponível
+            _available[name] = False
+    return _available[name]
+
+
+def is_loaded(name):
+    """Indica se o provedor já foi importado nesta sessão"""
+    return name in _loaded
+
+
+def load(name):
+    """Importa o provedor na primeira chamada e devolve o módulo (thread-safe)"""
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+
+    with _lock:
+        module = _loaded.get(name)
+        if module is None:
+            if not is_available(name):
+                raise RuntimeError(f"Biblioteca {PROVIDER_MODULES[name]} não instalada")
+            module = importlib.import_module(PROVIDER_MODULES[name])
+            _loaded[name] = module
+    return module
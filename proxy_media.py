@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Proxy de análise: cópia pequena da entrada para as etapas que só leem a mídia
+
+Análise de silêncio, análise de movimento (`cut_type` "motion") e extração de
+áudio para a transcrição não precisam do vídeo original em 4K. Em uma única
+decodificação o ffmpeg gera um proxy em Matroska com o vídeo reduzido (240p,
+`ultrafast`, mesma taxa de quadros e mesma linha do tempo) e o áudio já em
+16 kHz mono PCM, o formato da transcrição. O proxy fica no `DiskCache`,
+indexado pela impressão digital do original: as próximas execuções não leem
+o original para analisar, e só a renderização final volta a ele.
+"""
+
+import os
+import threading
+
+from media_cache import DiskCache, cache_key, file_fingerprint
+
+PROXY_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+PROXY_VERSION = 1  # muda quando os parâmetros do proxy mudam
+PROXY_SUFFIX = ".mkv"
+
+PROXY_HEIGHT = 240
+PROXY_SAMPLE_RATE = 16000
+PROXY_VIDEO_ARGS = ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "30"]
+PROXY_AUDIO_ARGS = ["-ac", "1", "-ar", str(PROXY_SAMPLE_RATE), "-c:a", "pcm_s16le"]
+
+
+def proxy_command(source, output, threads=0):
+    """Comando do ffmpeg que gera o proxy (vídeo e áudio opcionais: fontes só de áudio também servem)"""
+    thread_args = ["-threads", str(threads)] if threads else []
+    return [
+        "ffmpeg", "-y", "-i", source,
+        "-map", "0:v:0?", "-vf", f"scale=-2:'min({PROXY_HEIGHT},ih)'", *PROXY_VIDEO_ARGS, *thread_args,
+        "-map", "0:a:0?", *PROXY_AUDIO_ARGS,
+        "-sn", "-dn", "-f", "matroska", output
+    ]
+
+
+class ProxyCache:
+    """Proxies de análise indexados pela impressão digital do original"""
+
+    def __init__(self, max_bytes=PROXY_CACHE_MAX_BYTES, root=None):
+        self.cache = DiskCache("proxies", max_bytes, root)
+
+    def path_for(self, media_path):
+        key = cache_key(file_fingerprint(media_path), "proxy", PROXY_VERSION)
+        return self.cache.path_for(key, PROXY_SUFFIX)
+
+    def get(self, media_path):
+        """Caminho do proxy já gerado para a mídia, ou None"""
+        try:
+            path = self.path_for(media_path)
+        except OSError:
+            return None
+        if not os.path.exists(path):
+            return None
+        self.cache.touch(path)
+        return path
+
+    def temp_path(self, path):
+        """Arquivo temporário do proxy em geração (ignorado pela remoção por tamanho)"""
+        os.makedirs(self.cache.directory, exist_ok=True)
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def commit(self, temp_path, path):
+        """Publica o proxy gerado de forma atômica e aplica o limite de tamanho"""
+        os.replace(temp_path, path)
+        self.cache.evict()
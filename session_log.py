@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Log da sessão em arquivo, gravado de forma assíncrona
+
+O console da GUI guarda só as últimas linhas; o registro completo vai para um
+arquivo rotativo em JSON Lines, escrito por uma thread própria
+(`QueueHandler` + `QueueListener`), de modo que gravar em disco nunca bloqueia
+quem registra. Mensagens muito grandes (respostas da API, JSON do LLM) são
+salvas como artefatos separados e o console recebe apenas a referência.
+
+Registros dos loggers dos módulos (`cutvideo.*`, ex.: erros do barramento da
+interface) vão para o mesmo arquivo.
+"""
+
+import datetime
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+from media_cache import CACHE_ROOT, DiskCache
+
+LOG_DIR = os.environ.get("CUTVIDEO_LOG_DIR") or os.path.join(CACHE_ROOT, "logs")
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 5
+PAYLOAD_SPILL_CHARS = 2000    # mensagens maiores viram artefatos
+ARTIFACTS_MAX_BYTES = 200 * 1024 * 1024
+
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+LEVELS = {
+    "INFO": logging.INFO,
+    "SUCCESS": SUCCESS,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Uma linha JSON por registro"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        artifact = getattr(record, "artifact", None)
+        if artifact:
+            entry["artifact"] = artifact
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ArtifactHandler(logging.Handler):
+    """Grava o conteúdo desviado de um registro no arquivo de artefato (na thread do listener)"""
+
+    def emit(self, record):
+        payload = getattr(record, "artifact_payload", None)
+        if payload is None or not getattr(record, "artifact", None):
+            return
+        try:
+            with open(record.artifact, 'w', encoding='utf-8') as f:
+                f.write(payload)
+        except OSError:
+            self.handleError(record)
+
+
+class SessionLog:
+    """Log rotativo assíncrono com desvio de mensagens grandes para artefatos"""
+
+    def __init__(self, log_dir=None, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS,
+                 spill_chars=PAYLOAD_SPILL_CHARS):
+        self.log_dir = log_dir or LOG_DIR
+        self.artifacts_dir = os.path.join(self.log_dir, "artifacts")
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        # Artefatos de sessões antigas: os mais antigos saem quando passar do limite
+        DiskCache("artifacts", ARTIFACTS_MAX_BYTES, root=self.log_dir).evict()
+        self.path = os.path.join(self.log_dir, "session.log")
+        self.spill_chars = spill_chars
+        self._session = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._counter = itertools.count(1)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        self._queue = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, file_handler, ArtifactHandler())
+        self._listener.start()
+
+        self.logger = logging.getLogger(f"cutvideo.session.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        # Loggers dos módulos (`logging.getLogger("cutvideo.<módulo>")`) também gravam aqui
+        self._module_handler = logging.handlers.QueueHandler(self._queue)
+        logging.getLogger("cutvideo").addHandler(self._module_handler)
+
+    def record(self, message, level="INFO"):
+        """Registra a mensagem completa e devolve a versão para o console"""
+        message = str(message)
+        artifact = None
+        console_message = message
+        payload = None
+        if len(message) > self.spill_chars:
+            # O artefato é gravado pela thread do listener; aqui só se reserva o nome
+            artifact = self.artifact_path()
+            payload = message
+            first_line = message[:200].splitlines()[0] if message.strip() else ""
+            console_message = f"{first_line}… ({len(message)} caracteres salvos em {artifact})"
+            # No arquivo de log fica só a referência; o conteúdo está no artefato
+            message = console_message
+        self.logger.log(LEVELS.get(level, logging.INFO), message,
+                        extra={"artifact": artifact, "artifact_payload": payload})
+        return console_message
+
+    def artifact_path(self):
+        """Caminho do próximo artefato da sessão"""
+        return os.path.join(self.artifacts_dir, f"{self._session}_{next(self._counter):04d}.txt")
+
+    def flush(self):
+        """Garante que os registros pendentes foram gravados (reinicia a thread de escrita)"""
+        self._listener.stop()
+        self._listener.start()
+
+    def close(self):
+        logging.getLogger("cutvideo").removeHandler(self._module_handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
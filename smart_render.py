@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Renderização inteligente: copiar GOPs inteiros, recodificar só as bordas dos cortes
+
+Em gravações de "cabeça falante" os trechos mantidos costumam ser longos.
+Cada trecho é dividido pelos keyframes da fonte: o miolo, de um keyframe a
+outro, é copiado sem recodificar (`-c:v copy`); só as pontas, que começam ou
+terminam no meio de um GOP, passam pelo encoder, com os mesmos parâmetros do
+vídeo original para que as partes possam ser unidas sem recodificação (concat
+demuxer). O áudio de todas as partes é codificado em AAC (custo desprezível),
+o que mantém as partes compatíveis entre si.
+
+A reorganização semântica (clipes em outra ordem) usa o mesmo plano sem
+arquivos intermediários para os miolos: a lista do concat demuxer aponta para
+a própria fonte com `inpoint`/`outpoint` nos keyframes, e só as pontas
+recodificadas viram arquivos pequenos. Nesse caso o áudio também é copiado,
+e as pontas são codificadas com o codec, a taxa e os canais da fonte.
+
+Os parâmetros do vídeo e o índice de keyframes vêm da sondagem em cache
+(`media_probe`). Só fontes H.264 são suportadas; para as demais,
+`encoder_args` devolve None e o pipeline usa a renderização normal.
+Como do encoder só se igualam perfil e formato de pixel, a saída juntada é
+decodificada inteira antes de ser aceita (`EditingPipeline.output_decodes`);
+se o ffmpeg acusar erro, ela é refeita com recodificação completa.
+"""
+
+import bisect
+
+# Miolos copiados menores que isto não compensam o arquivo extra: o trecho é recodificado inteiro
+MIN_COPY_SECONDS = 2.0
+# Margem para o `-t` de uma cópia não incluir o keyframe seguinte por arredondamento
+COPY_EPSILON = 0.001
+
+# Perfis do ffprobe -> nomes aceitos pelo libx264
+H264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+    "High 10": "high10",
+    "High 4:2:2": "high422",
+    "High 4:4:4 Predictive": "high444",
+}
+
+
+def encoder_args(stream, base_args=("-c:v", "libx264")):
+    """Argumentos do libx264 que reproduzem o vídeo da fonte, ou None se a fonte não for H.264
+
+    `base_args` traz o encoder e a qualidade (ver `encode_profiles.video_args`).
+    """
+    if stream.get("codec_name") != "h264":
+        return None
+    args = list(base_args)
+    profile = H264_PROFILES.get(stream.get("profile"))
+    if profile:
+        args += ["-profile:v", profile]
+    if stream.get("pix_fmt"):
+        args += ["-pix_fmt", stream["pix_fmt"]]
+    return args
+
+
+def timescale_args(stream):
+    """Mesma base de tempo em todas as partes (o concat demuxer exige)"""
+    _num, _sep, den = stream.get("time_base", "").partition("/")
+    return ["-video_track_timescale", den] if den.isdigit() else []
+
+
+def plan_parts(playlist, keyframes, min_copy=MIN_COPY_SECONDS):
+    """Divide cada trecho da playlist em partes "encode" e "copy"
+
+    A parte copiada vai do primeiro keyframe dentro do trecho até o último;
+    antes e depois dela ficam as pontas recodificadas.
+    """
+    parts = []
+    for clip in playlist:
+        start, end = clip['start'], clip['end']
+        first = bisect.bisect_left(keyframes, start)
+        last = bisect.bisect_right(keyframes, end) - 1
+        copy_start = keyframes[first] if first < len(keyframes) else None
+        copy_end = keyframes[last] if last >= 0 else None
+        if copy_start is None or copy_end is None or copy_end - copy_start < min_copy:
+            parts.append({"mode": "encode", "start": start, "end": end})
+            continue
+        if copy_start > start:
+            parts.append({"mode": "encode", "start": start, "end": copy_start})
+        parts.append({"mode": "copy", "start": copy_start, "end": copy_end})
+        if end > copy_end:
+            parts.append({"mode": "encode", "start": copy_end, "end": end})
+    return parts
+
+
+def part_command(video, part, output, video_args, extra_args=(), audio_args=("-c:a", "aac"),
+                 maps=("-map", "0:v:0", "-map", "0:a:0?")):
+    """Comando do ffmpeg de uma parte (busca na entrada; cópia ou recodificação do vídeo)"""
+    duration = part['end'] - part['start']
+    if part['mode'] == "copy":
+        duration -= COPY_EPSILON
+        codec = ["-c:v", "copy"]
+    else:
+        codec = list(video_args)
+    return [
+        "ffmpeg", "-y", "-ss", f"{part['start']:.6f}", "-i", video, "-t", f"{duration:.6f}",
+        *maps, *codec, *audio_args,
+        *extra_args, "-avoid_negative_ts", "make_zero", output
+    ]
+
+
+def source_audio_args(audio, bitrate=None):
+    """Encoder que gera áudio compatível com o da fonte para juntar sem recodificar, ou None"""
+    if audio is None or audio.get("codec_name") != "aac":
+        return None
+    args = ["-c:a", "aac"]
+    if bitrate:
+        args += ["-b:a", bitrate]
+    if audio.get("sample_rate"):
+        args += ["-ar", str(audio["sample_rate"])]
+    if audio.get("channels"):
+        args += ["-ac", str(audio["channels"])]
+    return args
+
+
+def source_stream_maps(info):
+    """`-map` de vídeo e áudio na ordem da fonte, ou None se não forem os dois primeiros streams
+
+    O concat demuxer associa os streams de cada arquivo pela posição.
+    """
+    if info["video"] is None or info["audio"] is None:
+        return None
+    ordered = sorted([(info["video"].get("index"), "0:v:0"), (info["audio"].get("index"), "0:a:0")],
+                     key=lambda pair: pair[0] if pair[0] is not None else -1)
+    if [index for index, _spec in ordered] != [0, 1]:
+        return None
+    return [arg for _index, spec in ordered for arg in ("-map", spec)]
+
+
+def _concat_path(path):
+    # Aspas simples no caminho são escapadas como '\'' na sintaxe do concat demuxer
+    return "file '" + path.replace("'", "'\\''") + "'"
+
+
+def concat_list(video, parts, edge_paths):
+    """Lista do concat demuxer: miolos lidos direto da fonte (`inpoint`/`outpoint`), pontas dos arquivos"""
+    lines = []
+    for part, edge_path in zip(parts, edge_paths):
+        if part['mode'] == "copy":
+            lines += [_concat_path(video), f"inpoint {part['start']:.6f}", f"outpoint {part['end']:.6f}"]
+        else:
+            lines.append(_concat_path(edge_path))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Visualização virtualizada da transcrição
+
+Em vez de inserir a transcrição inteira em um `tk.Text`, só uma janela de
+frases (a região visível mais uma margem) fica no widget. Ao rolar perto da
+borda da janela, ela é recentrada a partir da `WordTimeline`; as marcações
+(erros, sugestões, seleções) ficam guardadas por índice de palavra e são
+reaplicadas a cada nova janela. O tempo até a interação não depende do
+tamanho da transcrição.
+
+A barra de rolagem representa o documento inteiro (em frases), não só a janela.
+"""
+
+import tkinter as tk
+from array import array
+from bisect import bisect_right
+
+WINDOW_ROWS = 300      # frases mantidas no widget
+EDGE_ROWS = 60         # recentrar quando a região visível chegar a esta distância da borda
+
+
+class TranscriptView:
+    """Janela de frases de uma WordTimeline exibida em um tk.Text (ou ScrolledText)"""
+
+    def __init__(self, text_widget, scrollbar=None, window_rows=WINDOW_ROWS, edge_rows=EDGE_ROWS):
+        self.text = text_widget
+        self.scrollbar = scrollbar or getattr(text_widget, "vbar", None)
+        self.window_rows = window_rows
+        self.edge_rows = edge_rows
+        self.timeline = None
+        self.lines = []
+        self.line_offsets = array('q', [0])   # início de cada frase no documento
+        self.row_lines = array('q', [0])      # linha lógica (a partir de 0) de cada frase no documento
+        self.first_row = 0                      # primeira frase presente no widget
+        self.last_row = 0                       # uma depois da última
+        self.marks = {}                         # tag -> lista de (primeira, última) palavra
+        self._rendering = False
+
+        self.text.configure(yscrollcommand=self._on_text_scroll)
+        if self.scrollbar is not None:
+            self.scrollbar.configure(command=self._on_scrollbar)
+
+    # ------------------------------------------------------------------
+    # Conteúdo
+    # ------------------------------------------------------------------
+
+    def set_timeline(self, timeline):
+        """Troca a transcrição exibida e mostra o início do documento"""
+        self.timeline = timeline
+        self.lines = timeline.render_document()
+        offsets = array('q', [0])
+        row_lines = array('q', [0])
+        for line in self.lines:
+            offsets.append(offsets[-1] + len(line))
+            row_lines.append(row_lines[-1] + line.count("\n"))
+        self.line_offsets = offsets
+        self.row_lines = row_lines
+        self.marks = {}
+        self._render(0, top_row=0)
+
+    def clear(self):
+        self.timeline = None
+        self.lines = []
+        self.line_offsets = array('q', [0])
+        self.row_lines = array('q', [0])
+        self.marks = {}
+        self.first_row = self.last_row = 0
+        self.text.delete("1.0", tk.END)
+
+    def full_text(self):
+        """Texto completo do documento (sem depender do que está no widget)"""
+        return ''.join(self.lines)
+
+    def doc_offset(self, index):
+        """Posição no documento de um índice do widget"""
+        counted = self.text.count("1.0", index, "chars") or (0,)
+        return self.line_offsets[self.first_row] + counted[0]
+
+    def word_range(self, start_index, end_index):
+        """Palavras (primeira, última) cobertas por um intervalo do widget, ou None"""
+        if self.timeline is None:
+            return None
+        return self.timeline.range_for_chars(self.doc_offset(start_index), self.doc_offset(end_index))
+
+    # ------------------------------------------------------------------
+    # Marcações
+    # ------------------------------------------------------------------
+
+    def add_marks(self, tag, spans):
+        """Marca intervalos de palavras; os visíveis são marcados já, os demais ao rolar"""
+        spans = list(spans)
+        self.marks.setdefault(tag, []).extend(spans)
+        self._apply_marks(tag, spans)
+
+    def remove_marks(self, tag, first, last):
+        """Remove as marcações de `tag` que tocam as palavras [first, last]"""
+        self.marks[tag] = [(a, b) for a, b in self.marks.get(tag, []) if b < first or a > last]
+        self.text.tag_remove(tag, "1.0", tk.END)
+        self._apply_marks(tag, self.marks[tag])
+
+    def clear_marks(self, *tags):
+        for tag in tags:
+            self.marks.pop(tag, None)
+            self.text.tag_remove(tag, "1.0", tk.END)
+
+    def _apply_marks(self, tag, spans):
+        """Aplica `tag` às partes dos intervalos que estão na janela atual, em lote"""
+        if self.timeline is None or self.first_row >= self.last_row:
+            return
+        window_start = self.line_offsets[self.first_row]
+        window_end = self.line_offsets[self.last_row]
+        indices = []
+        for first, last in spans:
+            start, end = self.timeline.char_range(first, last)
+            if end <= window_start or start >= window_end:
+                continue
+            start = max(start, window_start) - window_start
+            end = min(end, window_end) - window_start
+            indices.extend((f"1.0+{start}c", f"1.0+{end}c"))
+        # `tag add` aceita vários pares início/fim; lotes evitam linhas de comando enormes
+        batch = 2000
+        for i in range(0, len(indices), batch):
+            self.text.tag_add(tag, *indices[i:i + batch])
+
+    # ------------------------------------------------------------------
+    # Janela e rolagem
+    # ------------------------------------------------------------------
+
+    def row_at_offset(self, offset):
+        return max(0, bisect_right(self.line_offsets, offset) - 1)
+
+    def _row_index(self, row):
+        """Índice do widget do início de uma frase da janela atual"""
+        return f"{self.row_lines[row] - self.row_lines[self.first_row] + 1}.0"
+
+    def _row_at_line(self, line):
+        """Frase (no documento) que contém a linha lógica `line` do widget"""
+        doc_line = self.row_lines[self.first_row] + line - 1
+        return min(self.last_row - 1, max(self.first_row, bisect_right(self.row_lines, doc_line) - 1))
+
+    def _render(self, center_row, top_row):
+        """Redesenha a janela em torno de `center_row`, deixando `top_row` no topo"""
+        total = len(self.lines)
+        first = max(0, min(center_row - self.window_rows // 2, total - self.window_rows))
+        last = min(total, first + self.window_rows)
+        self._rendering = True
+        try:
+            self.text.delete("1.0", tk.END)
+            self.first_row, self.last_row = first, last
+            self.text.insert("1.0", ''.join(self.lines[first:last]))
+            for tag, spans in self.marks.items():
+                self._apply_marks(tag, spans)
+            self.text.yview(self._row_index(max(first, min(top_row, last - 1))))
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _visible_rows(self):
+        """Primeira e última frase (no documento) visíveis no widget"""
+        top_line = int(self.text.index("@0,0").split('.')[0])
+        bottom_line = int(self.text.index(f"@0,{self.text.winfo_height()}").split('.')[0])
+        return self._row_at_line(top_line), self._row_at_line(bottom_line)
+
+    def _update_scrollbar(self):
+        if self.scrollbar is None:
+            return
+        total = len(self.lines)
+        if not total:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        top, bottom = self._visible_rows()
+        self.scrollbar.set(top / total, min(1.0, (bottom + 1) / total))
+
+    def _on_text_scroll(self, first, last):
+        """yscrollcommand do widget: recentra a janela quando a rolagem chega perto da borda"""
+        if self._rendering or not self.lines:
+            if self.scrollbar is not None and not self.lines:
+                self.scrollbar.set(first, last)
+            return
+        top, bottom = self._visible_rows()
+        near_top = self.first_row > 0 and top - self.first_row < self.edge_rows
+        near_bottom = self.last_row < len(self.lines) and self.last_row - bottom < self.edge_rows
+        if near_top or near_bottom:
+            self._render(top, top_row=top)
+        else:
+            self._update_scrollbar()
+
+    def _on_scrollbar(self, action, *args):
+        """Comando da barra de rolagem, em frações do documento inteiro"""
+        if not self.lines:
+            self.text.yview(action, *args)
+            return
+        if action == tk.MOVETO:
+            row = min(len(self.lines) - 1, max(0, int(float(args[0]) * len(self.lines))))
+            if self.first_row <= row < self.last_row and (
+                    (row - self.first_row >= self.edge_rows or self.first_row == 0)
+                    and (self.last_row - row >= self.edge_rows or self.last_row == len(self.lines))):
+                self.text.yview(self._row_index(row))
+                self._update_scrollbar()
+            else:
+                self._render(row, top_row=row)
+        else:
+            # scroll N units/pages: rolagem nativa, recentrada por _on_text_scroll
+            self.text.yview(action, *args)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Barramento de atualizações da interface
+
+Threads de trabalho não devem tocar em widgets do Tk. Todo log e toda mudança
+de status entram em uma única fila, que o loop principal esvazia a uma taxa
+fixa (`fps`): eventos do mesmo tipo são entregues em lote ao seu handler e
+chamadas com a mesma chave são reduzidas à mais recente. Assim milhares de
+linhas do ffmpeg viram uma inserção por quadro e não atrasam a renderização.
+"""
+
+import collections
+import logging
+import threading
+
+# Erros de callbacks da interface (vão para o log da sessão, ver session_log.SessionLog)
+logger = logging.getLogger("cutvideo.ui_bus")
+
+DEFAULT_FPS = 20
+MAX_EVENTS_PER_FRAME = 20000  # o restante fica para o próximo quadro
+
+
+class UIBus:
+    """Fila thread-safe drenada pelo loop do Tk em lotes"""
+
+    def __init__(self, root, fps=DEFAULT_FPS):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / fps))
+        self._queue = collections.deque()  # append/popleft são atômicos
+        self._handlers = {}
+        self._main_thread = threading.get_ident()
+        self._closed = False
+        self._after_id = None
+
+    def on(self, kind, handler):
+        """Registra `handler(lista_de_payloads)` para os eventos do tipo `kind`"""
+        self._handlers[kind] = handler
+
+    def emit(self, kind, payload):
+        """Enfileira um evento (pode ser chamado de qualquer thread)"""
+        self._queue.append(("event", kind, payload))
+
+    def call(self, fn, *args, key=None, **kwargs):
+        """Executa `fn` no loop principal; com `key`, só a chamada mais recente do quadro roda"""
+        self._queue.append(("call", key, (fn, args, kwargs)))
+
+    def invoke(self, fn, *args, **kwargs):
+        """Executa `fn` no loop principal e espera o resultado (direto se já estiver nele)"""
+        if threading.get_ident() == self._main_thread:
+            return fn(*args, **kwargs)
+        done = threading.Event()
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        self._queue.append(("call", None, (run, (), {})))
+        while not done.wait(0.25):
+            if self._closed:
+                raise RuntimeError("Interface encerrada")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+    def start(self):
+        self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def close(self):
+        """Para de drenar a fila (ao fechar a janela)"""
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def flush(self):
+        """Entrega imediatamente tudo o que está na fila (no loop principal)"""
+        events = collections.OrderedDict()  # tipo -> payloads, na ordem de chegada
+        calls = []
+        latest = {}
+        count = 0
+        while self._queue and count < MAX_EVENTS_PER_FRAME:
+            item_type, key, payload = self._queue.popleft()
+            count += 1
+            if item_type == "event":
+                events.setdefault(key, []).append(payload)
+            else:
+                if key is not None:
+                    latest[key] = len(calls)
+                calls.append((key, payload))
+
+        for kind, payloads in events.items():
+            handler = self._handlers.get(kind)
+            if handler:
+                handler(payloads)
+        for position, (key, (fn, args, kwargs)) in enumerate(calls):
+            if key is not None and latest[key] != position:
+                continue
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                # Widget destruído ou erro no callback: não derrubar o loop do Tk
+                logger.exception("Erro em atualização da interface")
+
+    def _drain(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            if not self._closed:
+                self._after_id = self.root.after(self.interval_ms, self._drain)
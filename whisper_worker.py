@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Worker persistente do Whisper local
+
+Carregar um modelo do Whisper lê centenas de MB (ou GB) do disco a cada
+transcrição, e `del model; gc.collect()` não devolve a memória do torch ao
+sistema. Aqui a transcrição roda em processos separados e de vida longa, que
+mantêm os modelos usados recentemente em um LRU limitado pela RAM disponível
+(`psutil`). Sem pedidos por `idle_timeout` segundos cada processo encerra
+sozinho, e a memória realmente volta para o sistema; o próximo pedido o inicia
+de novo.
+
+Para áudios longos em CPU, um pool de workers (`WhisperPool`), dimensionado
+pelos núcleos e pela RAM, transcreve blocos do áudio em paralelo.
+"""
+
+import atexit
+import collections
+import gc
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from cancellation import Cancelled
+
+# RAM aproximada de cada modelo carregado (MB), conforme a tabela do Whisper;
+# substituída pela medição real depois do primeiro carregamento
+MODEL_RAM_MB = {
+    "tiny": 1000,
+    "base": 1000,
+    "small": 2000,
+    "medium": 5000,
+    "large": 10000,
+}
+
+DEFAULT_IDLE_TIMEOUT = 300    # segundos sem pedidos até encerrar o worker
+DEFAULT_RESERVE_MB = 1024     # RAM que sempre deve sobrar para o sistema
+MIN_THREADS_PER_WORKER = 4    # abaixo disso o torch perde eficiência por worker
+
+
+class ModelLRU:
+    """Modelos carregados, do menos para o mais recentemente usado"""
+
+    def __init__(self, max_memory_mb=None, reserve_mb=DEFAULT_RESERVE_MB):
+        self.max_memory_mb = max_memory_mb
+        self.reserve_mb = reserve_mb
+        self.models = collections.OrderedDict()   # (nome, device) -> (modelo, MB)
+        self.measured_mb = {}
+
+    def used_mb(self):
+        return sum(size for _model, size in self.models.values())
+
+    def _fits(self, need_mb):
+        import psutil
+        available_mb = psutil.virtual_memory().available / 1024 / 1024
+        if available_mb - need_mb < self.reserve_mb:
+            return False
+        return not self.max_memory_mb or self.used_mb() + need_mb <= self.max_memory_mb
+
+    def evict_oldest(self):
+        (name, device), (model, _size) = self.models.popitem(last=False)
+        del model
+        gc.collect()
+        if device == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+
+    def get(self, model_name, device):
+        """Devolve (modelo, segundos de carregamento); 0 quando já estava carregado"""
+        key = (model_name, device)
+        if key in self.models:
+            self.models.move_to_end(key)
+            return self.models[key][0], 0.0
+
+        need_mb = self.measured_mb.get(model_name, MODEL_RAM_MB.get(model_name, 2000))
+        while self.models and not self._fits(need_mb):
+            self.evict_oldest()
+
+        import psutil
+        import whisper
+        rss_before = psutil.Process().memory_info().rss
+        started = time.time()
+        model = whisper.load_model(model_name, device=device)
+        load_seconds = time.time() - started
+        if device == "cpu":
+            measured = (psutil.Process().memory_info().rss - rss_before) / 1024 / 1024
+            if measured > 0:
+                self.measured_mb[model_name] = need_mb = measured
+        self.models[key] = (model, need_mb)
+        return model, load_seconds
+
+
+def plan_pool(model_name, workers=0, cpu_count=None, available_mb=None, reserve_mb=DEFAULT_RESERVE_MB, threads=0):
+    """Número de workers e threads por worker para transcrever em CPU
+
+    Sem `workers`, usa o menor entre núcleos / MIN_THREADS_PER_WORKER e quantas
+    cópias do modelo cabem na RAM livre. Com `threads` (orçamento do job na
+    fila de lote), ele substitui os núcleos da máquina.
+    """
+    cores = threads or cpu_count or os.cpu_count() or 1
+    if not workers:
+        if available_mb is None:
+            import psutil
+            available_mb = psutil.virtual_memory().available / 1024 / 1024
+        ram_workers = int((available_mb - reserve_mb) // MODEL_RAM_MB.get(model_name, 2000))
+        workers = max(1, min(cores // MIN_THREADS_PER_WORKER, ram_workers))
+    return workers, max(1, cores // workers)
+
+
+def _worker_main(conn, idle_timeout, max_memory_mb, reserve_mb, threads=0):
+    """Laço do processo worker: atende pedidos até ficar ocioso ou receber shutdown"""
+    if threads:
+        # Antes do import do torch, que lê estas variáveis ao iniciar
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[var] = str(threads)
+    cache = ModelLRU(max_memory_mb, reserve_mb)
+    while conn.poll(idle_timeout):
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message[0] == "shutdown":
+            break
+
+        _command, audio_file, model_name, device, options = message
+        try:
+            model, load_seconds = cache.get(model_name, device)
+            result = model.transcribe(audio_file, **options)
+            conn.send(("ok", result, {"load_seconds": load_seconds, "models": [name for name, _ in cache.models]}))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}", None))
+    conn.close()
+
+
+class WhisperWorker:
+    """Cliente do processo worker; inicia o processo sob demanda"""
+
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_memory_mb=None, reserve_mb=DEFAULT_RESERVE_MB, threads=0):
+        self.idle_timeout = idle_timeout
+        self.max_memory_mb = max_memory_mb
+        self.reserve_mb = reserve_mb
+        self.threads = threads
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._aborted = False
+
+    def is_running(self):
+        return self._process is not None and self._process.is_alive()
+
+    def _start(self):
+        if self._process is not None:
+            # Processo anterior encerrado por ociosidade
+            self._stop_locked()
+        # spawn: não herdar o estado do processo pai (Tk, threads, descritores)
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.idle_timeout, self.max_memory_mb, self.reserve_mb, self.threads),
+            name="whisper-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def transcribe(self, audio_file, model_name="base", device="cpu", **options):
+        """Transcreve no worker e devolve (resultado do Whisper, informações do worker)"""
+        with self._lock:
+            self._aborted = False
+            for attempt in range(2):
+                if not self.is_running():
+                    self._start()
+                try:
+                    self._conn.send(("transcribe", audio_file, model_name, device, options))
+                    status, payload, info = self._conn.recv()
+                    break
+                except (EOFError, BrokenPipeError, ConnectionResetError):
+                    # O worker encerrou (ociosidade ou falha) durante o pedido; reinicia uma vez
+                    self._stop_locked()
+                    if self._aborted:
+                        raise Cancelled()
+                    if attempt:
+                        raise RuntimeError("Worker do Whisper encerrou inesperadamente")
+            if status != "ok":
+                raise RuntimeError(f"Erro no Whisper local: {payload}")
+            return payload, info
+
+    def _stop_locked(self):
+        if self._process is None:
+            return
+        try:
+            if self._process.is_alive():
+                self._conn.send(("shutdown",))
+                self._process.join(timeout=5)
+        except (OSError, ValueError):
+            pass
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=5)
+        self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def shutdown(self):
+        """Encerra o worker e libera toda a memória dos modelos"""
+        with self._lock:
+            self._stop_locked()
+
+    def abort(self):
+        """Interrompe o pedido em andamento matando o processo (chamado de outra thread)
+
+        Não pega o lock: quem está em `transcribe` recebe EOF e levanta `Cancelled`.
+        O modelo é carregado de novo no próximo pedido.
+        """
+        process = self._process
+        if process is None or not process.is_alive():
+            return
+        self._aborted = True
+        process.terminate()
+
+
+class WhisperPool:
+    """Conjunto de workers; cada pedido usa o primeiro worker livre"""
+
+    def __init__(self, size=1, threads=0, **worker_options):
+        self.size = size
+        self.threads = threads
+        self.workers = [WhisperWorker(threads=threads, **worker_options) for _ in range(size)]
+        self._idle = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    def transcribe(self, audio_file, model_name="base", device="cpu", **options):
+        """Transcreve no próximo worker livre (bloqueia enquanto todos estiverem ocupados)"""
+        worker = self._idle.get()
+        try:
+            return worker.transcribe(audio_file, model_name, device, **options)
+        finally:
+            self._idle.put(worker)
+
+    def abort(self):
+        """Interrompe todos os pedidos em andamento"""
+        for worker in self.workers:
+            worker.abort()
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.shutdown()
+
+
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_pool(size=1, threads=0):
+    """Pool compartilhado pelo processo atual; recriado se o tamanho pedido mudar"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is not None and (_default_pool.size, _default_pool.threads) != (size, threads):
+            _default_pool.shutdown()
+            _default_pool = None
+        if _default_pool is None:
+            _default_pool = WhisperPool(size, threads)
+        return _default_pool
+
+
+def shutdown():
+    """Encerra os workers compartilhados, se existirem"""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is not None:
+            _default_pool.shutdown()
+            _default_pool = None
+
+
+atexit.register(shutdown)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Linha do tempo indexada das palavras transcritas
+
+O resultado do Whisper/API é uma lista de dicts; cada consumidor (detecção de
+erros, clipes de fala, seleção no texto) percorria essa lista de um jeito, às
+vezes em O(n²). `WordTimeline` guarda início, fim e texto em colunas (`array`),
+responde buscas por tempo e por posição de caractere com `bisect`, e calcula
+frases e clipes uma única vez.
+"""
+
+import string
+from array import array
+from bisect import bisect_left, bisect_right
+
+SENTENCE_END = ('.', '!', '?', '…')
+CLIP_PAUSE_SECONDS = 1.0      # pausa após fim de frase que encerra um clipe
+MATCH_TOLERANCE_SECONDS = 2.0  # folga ao procurar um trecho perto do tempo informado
+MAX_ROW_WORDS = 80             # frases maiores são quebradas em várias linhas do documento
+MAX_ROW_CHARS = 600
+
+_STRIP_CHARS = string.punctuation + string.whitespace + "…“”«»"
+_CLOSING_CHARS = string.whitespace + "\"')]}”’»"
+
+
+def normalize_token(text):
+    """Forma comparável de uma palavra: minúsculas, sem pontuação nas pontas"""
+    return text.strip(_STRIP_CHARS).lower()
+
+
+def ends_sentence(text):
+    """A palavra termina uma frase? ("fim.", "certo?!", "isso.)" ou a pontuação sozinha)"""
+    return text.rstrip(_CLOSING_CHARS).endswith(SENTENCE_END)
+
+
+def words_from_result(whisper_result):
+    """Lista de palavras do resultado (API: 'words'; Whisper local: dentro dos segmentos)"""
+    if not whisper_result:
+        return []
+    words = whisper_result.get('words')
+    if words:
+        return words
+    return [word for segment in whisper_result.get('segments') or [] for word in segment.get('words') or []]
+
+
+class WordTimeline:
+    """Colunas de início/fim/texto das palavras, com buscas O(log n)"""
+
+    def __init__(self, words):
+        self.starts = array('d', (float(word['start']) for word in words))
+        self.ends = array('d', (float(word['end']) for word in words))
+        self.texts = [word['word'] for word in words]
+        self._sentences = None
+        self._clips = None
+        # Posição de cada palavra no documento exibido (preenchido por render_document)
+        self.doc_starts = array('q')
+        self.doc_ends = array('q')
+
+    @classmethod
+    def from_result(cls, whisper_result):
+        return cls(words_from_result(whisper_result))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def word(self, index):
+        """Palavra no formato original do Whisper"""
+        return {'word': self.texts[index], 'start': self.starts[index], 'end': self.ends[index]}
+
+    def find_text(self, text, start=None, end=None):
+        """Localiza um trecho (sequência de palavras) e devolve (primeira, última) ou None
+
+        Com `start`, procura a ocorrência mais próxima desse tempo (dentro da
+        folga); sem tempo, a primeira ocorrência. Se o texto não casar mas houver
+        tempos, devolve as palavras do intervalo [start, end].
+        """
+        tokens = [token for token in (normalize_token(part) for part in text.split()) if token]
+        if start is not None:
+            first = max(0, bisect_left(self.starts, start - MATCH_TOLERANCE_SECONDS))
+            last = bisect_right(self.starts, (end if end is not None else start) + MATCH_TOLERANCE_SECONDS)
+            candidates = sorted(range(first, last), key=lambda i: abs(self.starts[i] - start))
+        else:
+            candidates = range(len(self.texts))
+
+        if tokens:
+            for i in candidates:
+                match = self._match_tokens(i, tokens)
+                if match is not None:
+                    return match
+
+        if start is not None and end is not None:
+            first, stop = self.range_for_time(start, end)
+            if first < stop:
+                return first, stop - 1
+        return None
+
+    def _match_tokens(self, index, tokens):
+        """Casa `tokens` a partir da palavra `index`, ignorando palavras só de pontuação"""
+        position = index
+        for token in tokens:
+            while position < len(self.texts) and not normalize_token(self.texts[position]):
+                position += 1
+            if position >= len(self.texts) or normalize_token(self.texts[position]) != token:
+                return None
+            position += 1
+        return index, position - 1
+
+    # ------------------------------------------------------------------
+    # Buscas por tempo
+    # ------------------------------------------------------------------
+
+    def index_at_time(self, seconds):
+        """Índice da palavra que começa em ou antes de `seconds` (-1 se antes da primeira)"""
+        return bisect_right(self.starts, seconds) - 1
+
+    def range_for_time(self, start, end):
+        """Intervalo [i, j) das palavras que começam dentro de [start, end)"""
+        return bisect_left(self.starts, start), bisect_left(self.starts, end)
+
+    # ------------------------------------------------------------------
+    # Frases e clipes (calculados uma vez)
+    # ------------------------------------------------------------------
+
+    @property
+    def sentences(self):
+        """Lista de (primeira, última) palavra de cada frase
+
+        Frases longas demais (ou uma transcrição sem pontuação) são quebradas a
+        cada `MAX_ROW_WORDS` palavras ou `MAX_ROW_CHARS` caracteres, para que
+        nenhuma linha do documento exibido fique gigante.
+        """
+        if self._sentences is None:
+            sentences = []
+            first = 0
+            chars = 0
+            for i, text in enumerate(self.texts):
+                chars += len(text)
+                if (ends_sentence(text) or i + 1 - first >= MAX_ROW_WORDS
+                        or chars >= MAX_ROW_CHARS):
+                    sentences.append((first, i))
+                    first = i + 1
+                    chars = 0
+            if first < len(self.texts):
+                sentences.append((first, len(self.texts) - 1))
+            self._sentences = sentences
+        return self._sentences
+
+    @property
+    def clips(self):
+        """Clipes de fala: frases agrupadas até um fim de frase seguido de pausa longa"""
+        if self._clips is None:
+            clips = []
+            first = 0
+            last_index = len(self.texts) - 1
+            for i, text in enumerate(self.texts):
+                if (ends_sentence(text) and i < last_index
+                        and self.starts[i + 1] - self.ends[i] > CLIP_PAUSE_SECONDS):
+                    clips.append((first, i))
+                    first = i + 1
+            if first <= last_index:
+                clips.append((first, last_index))
+            self._clips = clips
+        return self._clips
+
+    def span_text(self, first, last):
+        return ''.join(self.texts[first:last + 1]).strip()
+
+    def speech_clips(self):
+        """Clipes no formato usado pela reorganização semântica"""
+        return [
+            {
+                'id': clip_id,
+                'start': self.starts[first],
+                'end': self.ends[last],
+                'text': self.span_text(first, last),
+                'duration': self.ends[last] - self.starts[first],
+            }
+            for clip_id, (first, last) in enumerate(self.clips, 1)
+        ]
+
+    # ------------------------------------------------------------------
+    # Documento exibido (uma frase por parágrafo, com timestamps)
+    # ------------------------------------------------------------------
+
+    def render_document(self):
+        """Gera as linhas do texto exibido e registra a posição de cada palavra
+
+        Cada frase vira `[início - fim] texto\\n\\n`. Devolve a lista de linhas;
+        `doc_starts`/`doc_ends` passam a conter o intervalo de caracteres de
+        cada palavra (sem espaços iniciais) no documento completo.
+        """
+        self.doc_starts = array('q', bytes(8 * len(self.texts)))
+        self.doc_ends = array('q', bytes(8 * len(self.texts)))
+        lines = []
+        offset = 0
+        for first, last in self.sentences:
+            joined = ''.join(self.texts[first:last + 1])
+            text = joined.strip()
+            lead = len(joined) - len(joined.lstrip())
+            prefix = f"[{self.starts[first]:.1f}s - {self.ends[last]:.1f}s] "
+            base = offset + len(prefix) - lead
+            position = 0
+            for i in range(first, last + 1):
+                word = self.texts[i]
+                word_lead = len(word) - len(word.lstrip())
+                self.doc_starts[i] = base + max(lead, position + word_lead)
+                self.doc_ends[i] = base + min(max(lead, position + len(word.rstrip())), lead + len(text))
+                position += len(word)
+            line = prefix + text + "\n\n"
+            lines.append(line)
+            offset += len(line)
+        return lines
+
+    def char_range(self, first, last):
+        """Intervalo de caracteres do documento que cobre as palavras [first, last]"""
+        return self.doc_starts[first], self.doc_ends[last]
+
+    def range_for_chars(self, start, end):
+        """Intervalo [i, j] das palavras que tocam os caracteres [start, end) do documento"""
+        first = bisect_right(self.doc_ends, start)
+        last = bisect_left(self.doc_starts, end) - 1
+        if first > last:
+            return None
+        return first, last